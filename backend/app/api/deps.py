@@ -5,7 +5,7 @@ from typing import Annotated
 from fastapi import Depends, HTTPException, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 
-from app.services.supabase import get_public_supabase_client
+from app.services.supabase import get_token_verifier
 
 
 security = HTTPBearer()
@@ -17,33 +17,20 @@ async def get_current_user(
     """
     Validate JWT token and return user information.
 
+    Tokens are verified locally against cached Supabase signing keys, with
+    Supabase Auth as the fallback (see `services/supabase/auth.py`).
+
     Args:
         credentials: Bearer token from Authorization header.
 
     Returns:
-        User data from Supabase auth.
+        User id and email from the token.
 
     Raises:
         HTTPException: If token is invalid or expired.
     """
-    token = credentials.credentials
-
     try:
-        client = get_public_supabase_client()
-        response = client.auth.get_user(token)
-
-        if not response or not response.user:
-            raise HTTPException(
-                status_code=status.HTTP_401_UNAUTHORIZED,
-                detail="Invalid or expired token",
-                headers={"WWW-Authenticate": "Bearer"},
-            )
-
-        return {
-            "id": str(response.user.id),
-            "email": response.user.email,
-        }
-
+        user = await get_token_verifier().verify(credentials.credentials)
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -51,5 +38,7 @@ async def get_current_user(
             headers={"WWW-Authenticate": "Bearer"},
         )
 
+    return dict(user)
+
 
 CurrentUser = Annotated[dict[str, object], Depends(get_current_user)]
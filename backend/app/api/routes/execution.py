@@ -2,6 +2,7 @@
 Workflow execution API routes.
 
 Provides endpoints for:
+- Estimating workflow cost (dry run)
 - Starting workflow execution
 - Stepping through breakpoints
 - Cancelling executions
@@ -18,9 +19,14 @@ from app.models.schemas import (
     WorkflowExecuteResponse,
     ExecutionStepResponse,
     ExecutionCancelResponse,
+    WorkflowEstimateResponse,
 )
 from app.models.enums import ExecutionStatus
-from app.services.workflow_engine import WorkflowEngine
+from app.services.workflow_engine import (
+    BudgetExceededError,
+    InvalidWorkflowError,
+    WorkflowEngine,
+)
 
 logger = logging.getLogger(__name__)
 
@@ -33,6 +39,39 @@ def get_workflow_engine() -> WorkflowEngine:
     return WorkflowEngine()
 
 
+@router.post(
+    "/workflows/{workflow_id}/estimate", response_model=WorkflowEstimateResponse
+)
+async def estimate_workflow(
+    workflow_id: str,
+    current_user: CurrentUser,
+    engine: WorkflowEngine = Depends(get_workflow_engine),
+) -> WorkflowEstimateResponse:
+    """Estimate a workflow's cost without executing it."""
+    try:
+        user_id = cast(str, current_user["id"])
+        result = await engine.estimate_workflow(workflow_id, user_id)
+        return WorkflowEstimateResponse.model_validate(result)
+    except InvalidWorkflowError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e),
+        )
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=str(e),
+        )
+    except HTTPException:
+        raise
+    except Exception:
+        logger.exception("Workflow estimate failed")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Workflow estimate failed",
+        )
+
+
 @router.post("/workflows/{workflow_id}/execute", response_model=WorkflowExecuteResponse)
 async def execute_workflow(
     workflow_id: str,
@@ -59,6 +98,16 @@ async def execute_workflow(
             execution_id=prepared["execution_id"],
             status=prepared["status"],
         )
+    except BudgetExceededError as e:
+        raise HTTPException(
+            status_code=status.HTTP_402_PAYMENT_REQUIRED,
+            detail=str(e),
+        )
+    except InvalidWorkflowError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e),
+        )
     except ValueError as e:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -1,16 +1,25 @@
 """Social media API routes."""
 
-from typing import cast
+import hashlib
+import json
+import time
+from email.utils import formatdate, parsedate_to_datetime
+from typing import Annotated, cast
 
-from fastapi import APIRouter, HTTPException, status
+from fastapi import APIRouter, HTTPException, Query, Request, Response, status
 
 from app.api.deps import CurrentUser
-from app.models.schemas import RedditRequest, RedditResponse, RedditPost
-from app.services.reddit import fetch_subreddit_posts
+from app.config import settings
+from app.models.schemas import RedditRequest, RedditResponse
+from app.services.reddit import fetch_subreddit_posts, get_trend_warmer
+from app.utils.cache import MemoryLRUCache
 
 
 router = APIRouter(prefix="/api", tags=["social"])
 
+# Serialized bodies by ETag, so polling unchanged data skips serialization
+_bodies = MemoryLRUCache(max_entries=256)
+
 
 def _safe_int(value: object, default: int = 0) -> int:
     """Safely convert a value to int."""
@@ -21,60 +30,173 @@ def _safe_int(value: object, default: int = 0) -> int:
     return default
 
 
-@router.post("/social/reddit", response_model=RedditResponse)
-async def get_reddit_data(
-    request: RedditRequest,
-    current_user: CurrentUser,
-) -> RedditResponse:
+def _reddit_etag(params: RedditRequest, result: dict[str, object]) -> str:
+    """Strong ETag from the cached listing's version and its insights."""
+    version = json.dumps(
+        [
+            params.subreddit.lower(),
+            params.sort,
+            params.limit,
+            params.compact,
+            result.get("fetched_at"),
+            result.get("keywords"),
+            result.get("top_post"),
+            result.get("fallback"),
+        ],
+        default=str,
+    )
+    return f'"{hashlib.blake2b(version.encode(), digest_size=12).hexdigest()}"'
+
+
+def _cache_headers(etag: str, fetched_at: float | None) -> dict[str, str]:
+    """ETag, Last-Modified and Cache-Control for a Reddit response."""
+    headers = {"ETag": etag, "Vary": "Authorization"}
+    if fetched_at is None:
+        # Static fallback: always revalidate so real data shows up quickly
+        headers["Cache-Control"] = "private, no-cache"
+        return headers
+    fresh_for = settings.reddit_cache_ttl_seconds - (time.time() - fetched_at)
+    headers["Cache-Control"] = f"private, max-age={max(0, int(fresh_for))}"
+    headers["Last-Modified"] = formatdate(fetched_at, usegmt=True)
+    return headers
+
+
+def _not_modified(request: Request, etag: str, fetched_at: float | None) -> bool:
+    """Whether the client's conditional headers match the current version."""
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        tags = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+        return "*" in tags or etag in tags
+    if_modified_since = request.headers.get("if-modified-since")
+    if if_modified_since and fetched_at is not None:
+        try:
+            since = parsedate_to_datetime(if_modified_since).timestamp()
+        except (TypeError, ValueError):
+            return False
+        return int(fetched_at) <= since
+    return False
+
+
+def _reddit_body(result: dict[str, object], compact: bool) -> dict[str, object]:
+    """Build the response body from insights, without per-post models."""
+    raw_keywords = result.get("keywords", [])
+    body: dict[str, object] = {
+        "keywords": (
+            [str(item) for item in raw_keywords if isinstance(item, str)]
+            if isinstance(raw_keywords, list)
+            else []
+        ),
+        "top_post": str(result.get("top_post") or ""),
+    }
+    if compact:
+        return body
+
+    raw_posts = result.get("posts", [])
+    posts_list = (
+        cast(list[dict[str, object]], raw_posts) if isinstance(raw_posts, list) else []
+    )
+    body["posts"] = [
+        {
+            "title": str(post.get("title", "")),
+            "score": _safe_int(post.get("score", 0)),
+            "url": str(post.get("url", "")),
+            "num_comments": _safe_int(post.get("num_comments", 0)),
+        }
+        for post in posts_list
+        if isinstance(post, dict)
+    ]
+    return body
+
+
+async def _reddit_response(
+    params: RedditRequest, request: Request, conditional: bool
+) -> Response:
     """
-    Fetch Reddit data from a subreddit.
+    Fetch Reddit data and answer with cache headers (or 304 if unchanged).
 
     Args:
-        request: Reddit request parameters.
-        current_user: Authenticated user from JWT.
+        params: Reddit request parameters.
+        request: Incoming request, for its conditional headers.
+        conditional: Whether If-None-Match / If-Modified-Since are honored.
 
     Returns:
-        Reddit posts and extracted keywords.
+        JSON response, or an empty 304 response.
+
+    Raises:
+        HTTPException: If fetching or building the response fails.
     """
     try:
+        await get_trend_warmer().record(params.subreddit, params.sort, params.limit)
         result = await fetch_subreddit_posts(
-            subreddit=request.subreddit,
-            sort=request.sort,
-            limit=request.limit,
+            subreddit=params.subreddit,
+            sort=params.sort,
+            limit=params.limit,
         )
 
-        raw_posts = result.get("posts", [])
-        posts_list = (
-            cast(list[dict[str, object]], raw_posts)
-            if isinstance(raw_posts, list)
-            else []
-        )
-
-        posts = [
-            RedditPost(
-                title=str(post.get("title", "")),
-                score=_safe_int(post.get("score", 0)),
-                url=str(post.get("url", "")),
-                num_comments=_safe_int(post.get("num_comments", 0)),
-            )
-            for post in posts_list
-            if isinstance(post, dict)
-        ]
-
-        raw_keywords = result.get("keywords", [])
-        keywords = (
-            [str(item) for item in raw_keywords if isinstance(item, str)]
-            if isinstance(raw_keywords, list)
-            else []
-        )
-
-        return RedditResponse(
-            posts=posts,
-            keywords=keywords,
+        raw_fetched_at = result.get("fetched_at")
+        fetched_at = (
+            float(raw_fetched_at) if isinstance(raw_fetched_at, (int, float)) else None
         )
+        etag = _reddit_etag(params, result)
+        headers = _cache_headers(etag, fetched_at)
+        if conditional and _not_modified(request, etag, fetched_at):
+            return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+
+        body = await _bodies.get(etag)
+        if not isinstance(body, bytes):
+            body = json.dumps(
+                _reddit_body(result, params.compact), separators=(",", ":")
+            ).encode()
+            await _bodies.set(etag, body)
+        return Response(content=body, media_type="application/json", headers=headers)
 
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Failed to fetch Reddit data: {str(e)}",
         )
+
+
+@router.get("/social/reddit", response_model=RedditResponse)
+async def get_reddit_data_cacheable(
+    params: Annotated[RedditRequest, Query()],
+    request: Request,
+    current_user: CurrentUser,
+) -> Response:
+    """
+    Fetch Reddit data, with conditional request support.
+
+    Responses carry an ETag and Last-Modified derived from the cached
+    listing's version, and Cache-Control for its remaining freshness.
+    A matching If-None-Match (or If-Modified-Since) returns 304.
+
+    Args:
+        params: Reddit request parameters, from the query string.
+        request: Incoming request.
+        current_user: Authenticated user from JWT.
+
+    Returns:
+        Reddit posts and extracted keywords, or 304 Not Modified.
+    """
+    return await _reddit_response(params, request, conditional=True)
+
+
+@router.post("/social/reddit", response_model=RedditResponse)
+async def get_reddit_data(
+    request: RedditRequest,
+    http_request: Request,
+    current_user: CurrentUser,
+) -> Response:
+    """
+    Fetch Reddit data from a subreddit.
+
+    Args:
+        request: Reddit request parameters.
+        http_request: Incoming request.
+        current_user: Authenticated user from JWT.
+
+    Returns:
+        Reddit posts and extracted keywords (with the same cache headers as
+        GET; conditional requests need GET).
+    """
+    return await _reddit_response(request, http_request, conditional=False)
@@ -10,8 +10,70 @@ class Settings(BaseSettings):
     supabase_url: str
     supabase_publishable_key: str
     supabase_secret_api_key: str
+    supabase_jwt_secret: str = ""  # Legacy HS256 projects; else checked remotely
+    auth_verification: str = "local"  # local (JWT + JWKS) | remote (Supabase Auth)
+    auth_jwks_refresh_seconds: float = 600.0  # Background signing key refresh
+    auth_token_cache_seconds: float = 60.0  # Verified tokens, never past exp
+    auth_jwt_leeway_seconds: float = 30.0  # Clock skew allowed on exp
     fal_key: str
+    fal_run_url: str = "https://fal.run"  # Point both at a stand-in for load tests
+    fal_queue_url: str = "https://queue.fal.run"
     apify_api_key: str = ""  # Optional, for Reddit fallback via Apify
+    apify_max_concurrency: int = 2  # Actor runs in flight per worker
+    apify_run_timeout_seconds: float = 60.0  # Then the run is aborted
+    reddit_user_agent: str = "web:virtualadgen:1.0 (ad trend research)"
+    reddit_max_connections: int = 20
+    reddit_limiter_backend: str = "memory"  # memory | disk (shared by workers)
+    reddit_limiter_path: str = ".cache/reddit_limits.sqlite3"
+    reddit_rate_limit_max_wait_seconds: float = 10.0  # Then fall back to Apify
+    reddit_max_pages: int = 10  # Listing pages of 100 posts per fetch
+    reddit_hedge_delay_seconds: float = 2.0  # Per page, before Apify, until measured
+    reddit_hedge_max_delay_seconds: float = 5.0  # Cap for the adaptive per-page delay
+    reddit_fanout_concurrency: int = 4  # Subreddits fetched at once per node
+    reddit_keywords_backend: str = "memory"  # memory | disk (shared by workers)
+    reddit_keywords_path: str = ".cache/reddit_keywords.sqlite3"
+    reddit_keywords_max_subreddits: int = 500  # TF-IDF corpus size
+    reddit_keywords_reload_seconds: float = 60.0  # Re-read other workers' documents
+    reddit_warmer_enabled: bool = True  # Keep popular subreddits cached
+    reddit_warmer_backend: str = "memory"  # memory | disk (shared by workers)
+    reddit_warmer_path: str = ".cache/reddit_warmer.sqlite3"
+    reddit_warmer_interval_seconds: float = 60.0  # Jittered ±20%
+    reddit_warmer_requests_per_hour: int = 180  # Reddit budget for warming
+    reddit_warmer_max_subreddits: int = 20  # Hottest listings kept warm
+    reddit_warmer_half_life_hours: float = 12.0  # Usage score decay
+    reddit_cache_backend: str = "memory"  # memory | disk (shared by workers) | none
+    reddit_cache_path: str = ".cache/reddit.sqlite3"
+    reddit_cache_ttl_seconds: float = 300.0  # Fresh; then served stale
+    reddit_cache_stale_seconds: float = 60.0 * 60  # Longest a stale entry is used
+    reddit_cache_negative_ttl_seconds: float = 60.0  # Failed (fallback) fetches
+    reddit_analysis_backend: str = "process"  # process | inline
+    reddit_analysis_process_min_posts: int = 200  # Smaller samples run inline
+    process_pool_workers: int = 2  # CPU-bound work (images, Reddit analysis)
+    image_input_cache_dir: str = ".cache/image_inputs"
+    image_input_max_bytes: int = 20 * 1024 * 1024
+    image_input_max_dimension: int = 2048
+    generation_cache_backend: str = "memory"  # memory | disk | none
+    generation_cache_path: str = ".cache/generations.sqlite3"
+    generation_cache_ttl_seconds: int = 60 * 60 * 24
+    fal_limiter_backend: str = "memory"  # memory | disk (shared by workers)
+    fal_limiter_path: str = ".cache/fal_limits.sqlite3"
+    fal_breaker_failure_threshold: int = 5
+    fal_breaker_cooldown_seconds: float = 30.0
+    fal_rate_limit_max_wait_seconds: float = 30.0
+    routing_latency_slo_seconds: float = 20.0  # Default SLO for model "auto"
+    fal_hedge_max_ratio: float = 0.1  # Hedges per primary call
+    fal_hedge_max_spend_per_hour: float = 5.0  # USD spent on hedges per worker
+    prompt_cache_backend: str = "disk"  # memory | disk | none
+    prompt_cache_path: str = ".cache/prompts.sqlite3"
+    prompt_cache_ttl_seconds: int = 60 * 60 * 24 * 30
+    prompt_optimizer_timeout_seconds: float = 4.0  # Then the raw prompt is used
+    prompt_optimizer_upstream_timeout_seconds: float = 30.0
+    model_registry_path: str = ""  # Optional JSON file of extra models
+    model_registry_table: str = ""  # Optional Supabase table of extra models
+    model_registry_reload_seconds: float = 60.0
+    execution_budget_usd: float = 2.0  # Max estimated cost per execution (0: off)
+    user_budget_usd: float = 20.0  # Max spend per user per window (0: off)
+    user_budget_window_hours: float = 24.0
 
     model_config = ConfigDict(env_file=".env", env_file_encoding="utf-8")
 
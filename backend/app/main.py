@@ -1,18 +1,67 @@
+import asyncio
+import contextlib
 import logging
 import os
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from app.api.deps import CurrentUser
 from app.api.routes import execution, social
+from app.config import settings
+from app.services.fal import close_fal_service
+from app.services.fal.registry import watch_registry
+from app.services.reddit.http import close_reddit_http_client, get_reddit_http_client
+from app.services.reddit.warmer import get_trend_warmer
+from app.services.supabase.auth import get_token_verifier
+from app.utils.metrics import get_metrics
+from app.utils.process_pool import shutdown_process_pool
 
 # Configure logging
 logging.basicConfig(level=logging.INFO, format="%(levelname)s: %(message)s", force=True)
 logger = logging.getLogger(__name__)
 
 
+@asynccontextmanager
+async def lifespan(app: FastAPI) -> AsyncIterator[None]:
+    """Set up shared resources on startup and release them on shutdown."""
+    get_reddit_http_client()
+    registry_watcher = None
+    if settings.model_registry_path or settings.model_registry_table:
+        registry_watcher = asyncio.create_task(
+            watch_registry(
+                settings.model_registry_path or None,
+                settings.model_registry_table or None,
+                settings.model_registry_reload_seconds,
+            )
+        )
+
+    trend_warmer = None
+    if settings.reddit_warmer_enabled:
+        trend_warmer = asyncio.create_task(get_trend_warmer().run())
+
+    key_refresher = None
+    if settings.auth_verification == "local":
+        key_refresher = asyncio.create_task(get_token_verifier().run())
+
+    yield
+
+    for task in (registry_watcher, trend_warmer, key_refresher):
+        if task:
+            task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await task
+    await close_fal_service()
+    await close_reddit_http_client()
+    shutdown_process_pool()
+
+
 app = FastAPI(
     title="VisualAdGen API",
     description="Backend API for Visual Workflow Builder for Ad Generation",
     version="1.0.0",
+    lifespan=lifespan,
 )
 
 # Get allowed origins from env, fallback to defaults
@@ -42,3 +91,20 @@ async def health_check() -> dict[str, str]:
         Status message indicating the API is running.
     """
     return {"status": "healthy"}
+
+
+@app.get("/metrics")
+async def metrics(current_user: CurrentUser) -> dict[str, float]:
+    """
+    Operational counters for this worker process.
+
+    Requires authentication, like the API routes: the counters include
+    spend and auth figures.
+
+    Args:
+        current_user: Authenticated user.
+
+    Returns:
+        Counter names mapped to their values.
+    """
+    return get_metrics().snapshot()
@@ -91,4 +91,5 @@ class Generation(TypedDict):
     image_urls: list[str]
     aspect_ratio: str
     cost: Optional[float]
+    derivatives: list[dict]
     created_at: datetime
@@ -30,12 +30,36 @@ class ExecutionCancelResponse(BaseModel):
     status: ExecutionStatus
 
 
+class NodeCostEstimateResponse(BaseModel):
+    """Estimated cost of one image model node."""
+
+    node_id: str
+    model_id: str
+    num_images: int
+    price_per_image: float
+    cost: float
+    edit: bool
+    hedge: bool = False
+
+
+class WorkflowEstimateResponse(BaseModel):
+    """Dry-run cost estimate for a workflow."""
+
+    workflow_id: str
+    total_cost: float
+    nodes: list[NodeCostEstimateResponse]
+    execution_budget: float
+    user_budget: float
+    user_spent: float
+
+
 class RedditRequest(BaseModel):
     """Request for Reddit data fetch."""
 
     subreddit: str
     sort: str = "hot"
     limit: int = 10
+    compact: bool = False  # Only keywords and top_post, no posts
 
 
 class RedditPost(BaseModel):
@@ -48,7 +72,8 @@ class RedditPost(BaseModel):
 
 
 class RedditResponse(BaseModel):
-    """Response containing Reddit data."""
+    """Response containing Reddit data (posts are omitted when compact)."""
 
-    posts: list[RedditPost]
+    posts: list[RedditPost] | None = None
     keywords: list[str]
+    top_post: str = ""
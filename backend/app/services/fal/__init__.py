@@ -1,21 +1,68 @@
 """FAL AI service module."""
 
 from .client import generate_images
+from .cache import GenerationCache, get_generation_cache, make_generation_key
+from .hedging import HedgeBudget, get_hedge_budget
+from .limits import ModelLimiter, ModelUnavailableError, get_model_limiter
+from .prompts import PromptOptimizer, get_prompt_optimizer, make_prompt_key
+from .routing import AUTO_MODEL, ModelStats, choose_model, get_model_stats
+from .service import (
+    FalService,
+    FalRequestError,
+    FalProgressEvent,
+    get_fal_service,
+    close_fal_service,
+)
+from .registry import reload_registry, watch_registry
 from .models import (
     MODELS,
+    ModelDescriptor,
+    ModelRegistry,
+    compile_registry,
+    get_registry,
+    swap_registry,
     normalize_params,
     get_all_models,
     get_model_price,
     supports_advanced_params,
     get_model_config,
+    plan_shards,
 )
 
 __all__ = [
     "generate_images",
+    "GenerationCache",
+    "get_generation_cache",
+    "make_generation_key",
+    "HedgeBudget",
+    "get_hedge_budget",
+    "ModelLimiter",
+    "ModelUnavailableError",
+    "get_model_limiter",
+    "PromptOptimizer",
+    "get_prompt_optimizer",
+    "make_prompt_key",
+    "AUTO_MODEL",
+    "ModelStats",
+    "choose_model",
+    "get_model_stats",
+    "FalService",
+    "FalRequestError",
+    "FalProgressEvent",
+    "get_fal_service",
+    "close_fal_service",
+    "reload_registry",
+    "watch_registry",
     "MODELS",
+    "ModelDescriptor",
+    "ModelRegistry",
+    "compile_registry",
+    "get_registry",
+    "swap_registry",
     "normalize_params",
     "get_all_models",
     "get_model_price",
     "supports_advanced_params",
     "get_model_config",
+    "plan_shards",
 ]
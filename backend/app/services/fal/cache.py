@@ -0,0 +1,103 @@
+"""Deterministic generation result cache.
+
+Only requests with a pinned seed on models that opt in via `cacheable`
+are cached: without a seed two identical requests are expected to
+produce different images.
+"""
+
+import copy
+import hashlib
+import json
+import logging
+
+from app.utils.cache import CacheBackend, create_cache_backend
+from .models import get_model_config
+
+logger = logging.getLogger(__name__)
+
+
+def make_request_key(model_id: str, params: dict[str, object]) -> str | None:
+    """
+    Hash a normalized generation request with a pinned seed.
+
+    Args:
+        model_id: FAL model identifier.
+        params: Normalized request parameters (including prompt and seed).
+
+    Returns:
+        Hex digest key, or None if no seed is pinned.
+    """
+    if params.get("seed") is None:
+        return None
+
+    payload = json.dumps(
+        {"model_id": model_id, "params": params}, sort_keys=True, default=str
+    )
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+def make_generation_key(model_id: str, params: dict[str, object]) -> str | None:
+    """
+    Build a cache key for a normalized generation request.
+
+    Args:
+        model_id: FAL model identifier.
+        params: Normalized request parameters (including prompt and seed).
+
+    Returns:
+        Hex digest key, or None if the request is not cacheable.
+    """
+    config = get_model_config(model_id)
+    if not config or not config.get("cacheable", False):
+        return None
+    return make_request_key(model_id, params)
+
+
+class GenerationCache:
+    """Caches generate_images outputs keyed by `make_generation_key`."""
+
+    def __init__(self, backend: CacheBackend, ttl: float) -> None:
+        self.backend = backend
+        self.ttl = ttl
+
+    async def get(self, key: str) -> dict[str, object] | None:
+        """Return a copy of the cached output, or None. Errors count as misses."""
+        try:
+            value = await self.backend.get(key)
+        except Exception:
+            logger.warning("Generation cache read failed", exc_info=True)
+            return None
+        return copy.deepcopy(value) if isinstance(value, dict) else None
+
+    async def set(self, key: str, output: dict[str, object]) -> None:
+        """Store an output. Errors are logged, not raised."""
+        try:
+            await self.backend.set(key, copy.deepcopy(output), self.ttl)
+        except Exception:
+            logger.warning("Generation cache write failed", exc_info=True)
+
+
+_cache: GenerationCache | None = None
+_cache_configured = False
+
+
+def get_generation_cache() -> GenerationCache | None:
+    """
+    Get the shared generation cache configured from settings.
+
+    Returns:
+        GenerationCache, or None when disabled.
+    """
+    global _cache, _cache_configured
+    if not _cache_configured:
+        from app.config import settings
+
+        backend = create_cache_backend(
+            settings.generation_cache_backend,
+            settings.generation_cache_path,
+            table="generations",
+        )
+        if backend is not None:
+            _cache = GenerationCache(backend, settings.generation_cache_ttl_seconds)
+        _cache_configured = True
+    return _cache
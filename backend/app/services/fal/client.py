@@ -1,20 +1,23 @@
-import os
+import asyncio
+import copy
+import logging
+import random
+import time
 
-import fal_client
+from app.utils.singleflight import SingleFlight
+from .cache import get_generation_cache, make_generation_key, make_request_key
+from .hedging import get_hedge_budget, run_hedged
+from .limits import ModelUnavailableError, get_model_limiter, is_model_failure
+from .models import adapt_params, normalize_params, get_model_price, plan_shards
+from .routing import get_model_stats
+from .service import ProgressCallback, get_fal_service
 
-from .models import normalize_params, get_model_price
+logger = logging.getLogger(__name__)
 
-_fal_initialized = False
+MAX_SEED = 2**31 - 1
 
-
-def _ensure_fal_initialized() -> None:
-    """Lazily initialize FAL API key on first use."""
-    global _fal_initialized
-    if not _fal_initialized:
-        from app.config import settings
-
-        os.environ["FAL_KEY"] = settings.fal_key
-        _fal_initialized = True
+# Coalesces concurrent identical seed-pinned generations into one FAL call
+_generation_flight: SingleFlight[dict[str, object]] = SingleFlight()
 
 
 async def generate_images(
@@ -22,6 +25,8 @@ async def generate_images(
     prompt: str,
     num_images: int = 1,
     parameters: dict[str, object] | None = None,
+    on_progress: ProgressCallback | None = None,
+    hedge: bool = False,
 ) -> dict[str, object]:
     """
     Generate images using FAL AI.
@@ -31,13 +36,28 @@ async def generate_images(
         prompt: The image generation prompt.
         num_images: Number of images to generate.
         parameters: Additional model parameters.
+        on_progress: Optional callback for queue status events.
+        hedge: Issue a duplicate request when a call is slower than the
+            model's observed p90 latency (subject to the hedge budget).
 
     Returns:
         Dictionary containing image_urls, cost, and model metadata.
+        Results served from the generation cache have zero cost and
+        'cache_hit' set to True. Callers that joined an identical in-flight
+        request have zero cost and 'coalesced' set to True. When the
+        model's circuit is open and a fallback model served the request,
+        'model_id' and 'fallback_from' are set.
+
+    Raises:
+        ModelUnavailableError: If the model (and its fallback) is unavailable.
+        RuntimeError: If the generation fails.
     """
-    _ensure_fal_initialized()
+    requested_model = model_id
+    model_id = await get_model_limiter().select_model(model_id)
 
     params = parameters.copy() if parameters else {}
+    if model_id != requested_model:
+        params = adapt_params(requested_model, model_id, params)
     params["prompt"] = prompt
     params["num_images"] = num_images
 
@@ -45,12 +65,63 @@ async def generate_images(
     # but for now we'll treat it as object
     params = normalize_params(model_id, params)
 
-    try:
-        result = await fal_client.run_async(model_id, arguments=params)
-    except Exception as e:
-        raise RuntimeError(
-            f"Failed to generate images with model {model_id}: {str(e)}"
-        ) from e
+    output = await _generate(model_id, params, on_progress, hedge)
+    if model_id != requested_model:
+        output["model_id"] = model_id
+        output["fallback_from"] = requested_model
+    return output
+
+
+async def _generate(
+    model_id: str,
+    params: dict[str, object],
+    on_progress: ProgressCallback | None,
+    hedge: bool,
+) -> dict[str, object]:
+    """Serve from cache, join an identical in-flight call or run a new one."""
+    cache = get_generation_cache()
+    cache_key = make_generation_key(model_id, params) if cache else None
+    if cache and cache_key:
+        cached = await cache.get(cache_key)
+        if cached is not None:
+            cached["cost"] = 0.0
+            cached["cache_hit"] = True
+            return cached
+
+    flight_key = make_request_key(model_id, params)
+    if flight_key is None:
+        return await _run_generation(model_id, params, cache_key, on_progress, hedge)
+
+    output, coalesced = await _generation_flight.do(
+        flight_key,
+        lambda: _run_generation(model_id, params, cache_key, on_progress, hedge),
+    )
+    # Every caller gets its own copy; only the leader pays for the call
+    output = copy.deepcopy(output)
+    if coalesced:
+        output["cost"] = 0.0
+        output["coalesced"] = True
+    return output
+
+
+async def _run_generation(
+    model_id: str,
+    params: dict[str, object],
+    cache_key: str | None,
+    on_progress: ProgressCallback | None,
+    hedge: bool,
+) -> dict[str, object]:
+    """Call FAL (sharded if large), build the output and cache it."""
+    num_images = params.get("num_images", 1)
+    shards = plan_shards(model_id, num_images if isinstance(num_images, int) else 1)
+
+    shard_meta: dict[str, object] = {}
+    if len(shards) == 1:
+        result = await _call_fal(model_id, params, on_progress, hedge)
+    else:
+        result, shard_meta = await _run_shards(
+            model_id, params, shards, on_progress, hedge
+        )
 
     # Safely extract image URLs - validate result is dict before access
     if not isinstance(result, dict):
@@ -77,7 +148,141 @@ async def generate_images(
 
     if isinstance(result, dict):
         for key, value in result.items():
-            if key not in {"images", "image_urls", "cost"}:
+            if key not in {"images", "image_urls", "cost", "cache_hit", "coalesced"}:
                 output[key] = value
+    output.update(shard_meta)
 
+    # A partial result (some shards failed) is returned but never cached
+    cache = get_generation_cache()
+    if cache and cache_key and image_urls and not shard_meta.get("failed_shards"):
+        await cache.set(cache_key, output)
+
+    output["cache_hit"] = False
     return output
+
+
+async def _call_fal(
+    model_id: str,
+    params: dict[str, object],
+    on_progress: ProgressCallback | None,
+    hedge: bool = False,
+) -> dict[str, object]:
+    """Run one FAL request (hedged if requested), wrapping failures."""
+    try:
+        if not hedge:
+            return await _subscribe(model_id, params, on_progress)
+
+        num_images = params.get("num_images", 1)
+        cost = get_model_price(model_id) * (
+            num_images if isinstance(num_images, int) else 1
+        )
+        return await run_hedged(
+            model_id,
+            lambda: _subscribe(model_id, params, on_progress),
+            cost,
+            get_hedge_budget(),
+        )
+    except ModelUnavailableError:
+        raise
+    except Exception as e:
+        raise RuntimeError(
+            f"Failed to generate images with model {model_id}: {str(e)}"
+        ) from e
+
+
+async def _subscribe(
+    model_id: str,
+    params: dict[str, object],
+    on_progress: ProgressCallback | None,
+) -> dict[str, object]:
+    """Run one rate-limited FAL queue request and record its latency."""
+    async with get_model_limiter().acquire(model_id):
+        started = time.monotonic()
+        try:
+            result = await get_fal_service().subscribe(
+                model_id, params, on_progress=on_progress
+            )
+        except Exception as e:
+            if is_model_failure(e):
+                get_model_stats().record(model_id, time.monotonic() - started, ok=False)
+            raise
+        get_model_stats().record(model_id, time.monotonic() - started, ok=True)
+        return result
+
+
+async def _run_shards(
+    model_id: str,
+    params: dict[str, object],
+    shards: list[int],
+    on_progress: ProgressCallback | None,
+    hedge: bool,
+) -> tuple[dict[str, object], dict[str, object]]:
+    """
+    Run shards in parallel with distinct seeds and merge results in order.
+
+    Failed shards are tolerated as long as at least one succeeds.
+
+    Returns:
+        Tuple of (merged FAL-style result, shard metadata).
+
+    Raises:
+        RuntimeError: If every shard fails.
+    """
+    base_seed = params.get("seed")
+    if not isinstance(base_seed, int):
+        base_seed = random.randint(0, MAX_SEED - len(shards))
+
+    shard_params = [
+        {**params, "num_images": count, "seed": base_seed + index}
+        for index, count in enumerate(shards)
+    ]
+    results = await asyncio.gather(
+        *(_call_fal(model_id, p, on_progress, hedge) for p in shard_params),
+        return_exceptions=True,
+    )
+
+    merged: dict[str, object] = {}
+    images: list[object] = []
+    seeds: list[int] = []
+    failures: list[BaseException] = []
+
+    for shard, result in zip(shard_params, results):
+        if isinstance(result, BaseException):
+            failures.append(result)
+            continue
+        if not isinstance(result, dict):
+            continue
+
+        seeds.append(int(shard["seed"]))  # type: ignore[call-overload]
+        shard_images = result.get("images")
+        if isinstance(shard_images, list):
+            images.extend(shard_images)
+
+        for key, value in result.items():
+            if key == "images":
+                continue
+            # Per-image lists (e.g. has_nsfw_concepts) are concatenated
+            if isinstance(value, list) and isinstance(merged.get(key), list):
+                merged[key] = [*merged[key], *value]  # type: ignore[misc]
+            else:
+                merged.setdefault(key, value)
+
+    if not seeds:
+        raise failures[0] if failures else RuntimeError(
+            f"Failed to generate images with model {model_id}: empty results"
+        )
+    if failures:
+        logger.warning(
+            "%d of %d shards failed for %s: %s",
+            len(failures),
+            len(shards),
+            model_id,
+            failures[0],
+        )
+
+    merged["images"] = images
+    return merged, {
+        "seeds": seeds,
+        "shards": len(shards),
+        "failed_shards": len(failures),
+    }
@@ -0,0 +1,153 @@
+"""Hedged FAL requests to cut tail latency.
+
+If a call has not finished by the model's observed p90 latency, a
+duplicate is issued; the first success wins and the other is cancelled.
+`HedgeBudget` caps how often hedges fire and how much they may cost.
+"""
+
+import asyncio
+import logging
+import time
+from collections import deque
+from typing import Awaitable, Callable, TypeVar
+
+from app.utils.metrics import get_metrics
+from .routing import MIN_SAMPLES, get_model_stats
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+# Hedge credits that may accumulate during quiet periods
+MAX_HEDGE_CREDITS = 5.0
+
+
+class HedgeBudget:
+    """
+    Limits hedges to a share of calls and an hourly spend.
+
+    Every primary call earns `max_ratio` credits; a hedge spends one.
+    """
+
+    def __init__(
+        self,
+        max_ratio: float,
+        max_spend_per_hour: float,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.max_ratio = max_ratio
+        self.max_spend_per_hour = max_spend_per_hour
+        self.clock = clock
+        self._credits = 1.0
+        self._spend: deque[tuple[float, float]] = deque()
+
+    def record_call(self) -> None:
+        """Earn credits for one primary call."""
+        self._credits = min(self._credits + self.max_ratio, MAX_HEDGE_CREDITS)
+
+    def try_acquire(self, cost: float) -> bool:
+        """
+        Reserve budget for one hedge.
+
+        Args:
+            cost: Estimated cost of the duplicate call.
+
+        Returns:
+            True if the hedge may be issued.
+        """
+        now = self.clock()
+        while self._spend and self._spend[0][0] <= now - 3600:
+            self._spend.popleft()
+
+        spent = sum(cost for _, cost in self._spend)
+        if self._credits < 1 or spent + cost > self.max_spend_per_hour:
+            return False
+
+        self._credits -= 1
+        self._spend.append((now, cost))
+        return True
+
+
+def hedge_delay(model_id: str) -> float | None:
+    """Return the model's observed p90 latency, or None without enough data."""
+    snapshot = get_model_stats().snapshot(model_id)
+    if snapshot["samples"] < MIN_SAMPLES:
+        return None
+    return snapshot["p90_latency"]
+
+
+async def run_hedged(
+    model_id: str,
+    call: Callable[[], Awaitable[T]],
+    cost: float,
+    budget: HedgeBudget,
+) -> T:
+    """
+    Run `call`, issuing a duplicate if it is slower than the model's p90.
+
+    Args:
+        model_id: FAL model identifier (for latency stats and metrics).
+        call: Zero-argument coroutine function performing one request.
+        cost: Estimated cost of one request, charged to the budget.
+        budget: Hedge budget.
+
+    Returns:
+        The first successful result.
+
+    Raises:
+        Exception: The primary's error if both requests fail.
+    """
+    budget.record_call()
+    delay = hedge_delay(model_id)
+    primary = asyncio.ensure_future(call())
+    if delay is None:
+        return await primary
+
+    tasks = [primary]
+    try:
+        done, _ = await asyncio.wait(tasks, timeout=delay)
+        if done:
+            return primary.result()
+
+        metrics = get_metrics()
+        if not budget.try_acquire(cost):
+            metrics.increment("fal.hedges_skipped_budget")
+            return await primary
+
+        metrics.increment("fal.hedges_issued")
+        metrics.increment("fal.hedge_cost_overhead_usd", cost)
+        hedge = asyncio.ensure_future(call())
+        tasks.append(hedge)
+
+        pending = set(tasks)
+        while pending:
+            done, pending = await asyncio.wait(
+                pending, return_when=asyncio.FIRST_COMPLETED
+            )
+            for task in done:
+                if task.exception() is None:
+                    if task is hedge:
+                        metrics.increment("fal.hedges_won")
+                    return task.result()
+        # Both failed: surface the primary's error
+        return primary.result()
+    finally:
+        for task in tasks:
+            if not task.done():
+                # Cancelling runs FalService's upstream cancel for the loser
+                task.cancel()
+
+
+_budget: HedgeBudget | None = None
+
+
+def get_hedge_budget() -> HedgeBudget:
+    """Get the process-wide hedge budget configured from settings."""
+    global _budget
+    if _budget is None:
+        from app.config import settings
+
+        _budget = HedgeBudget(
+            settings.fal_hedge_max_ratio, settings.fal_hedge_max_spend_per_hour
+        )
+    return _budget
@@ -0,0 +1,297 @@
+"""Per-model rate limiting, concurrency caps and circuit breakers for FAL.
+
+Limits come from the model registry (`rate_limit`, `burst`,
+`max_concurrency`, `fallback_model`). Token buckets and breaker states live
+in a `StateStore`; the SQLite store lets every worker process on a host
+share them. Concurrency caps are per process.
+"""
+
+import asyncio
+import logging
+import time
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Callable, Literal, TypedDict
+
+from app.utils.state_store import StateStore, create_state_store
+from .models import get_model_config
+from .service import FalRequestError
+
+logger = logging.getLogger(__name__)
+
+BreakerStatus = Literal["closed", "open", "half_open"]
+
+
+class BreakerState(TypedDict):
+    """Circuit breaker state for one model."""
+
+    status: BreakerStatus
+    failures: int
+    changed_at: float
+
+
+class BucketState(TypedDict):
+    """Token bucket state for one model."""
+
+    tokens: float
+    updated_at: float
+
+
+class ModelUnavailableError(RuntimeError):
+    """Raised when a model's circuit is open or its rate limit wait is too long."""
+
+    def __init__(self, model_id: str, reason: str) -> None:
+        super().__init__(f"Model {model_id} is unavailable: {reason}")
+        self.model_id = model_id
+        self.reason = reason
+
+
+def is_model_failure(exc: BaseException) -> bool:
+    """
+    Check whether an error counts against a model's circuit breaker.
+
+    Throttling (429), server errors, transport errors and timeouts count.
+    Other client errors (e.g. 422 bad arguments) do not.
+    """
+    if isinstance(exc, TimeoutError):
+        return True
+    if isinstance(exc, FalRequestError):
+        code = exc.status_code
+        return code is None or code == 429 or code >= 500
+    return False
+
+
+class ModelLimiter:
+    """Applies per-model token buckets, concurrency caps and breakers."""
+
+    def __init__(
+        self,
+        store: StateStore,
+        failure_threshold: int = 5,
+        cooldown_seconds: float = 30.0,
+        max_wait_seconds: float = 30.0,
+        clock: Callable[[], float] = time.time,
+    ) -> None:
+        """
+        Initialize the limiter.
+
+        Args:
+            store: Shared state store for buckets and breakers.
+            failure_threshold: Consecutive failures that open a breaker.
+            cooldown_seconds: Time an open breaker waits before half-opening.
+            max_wait_seconds: Longest a call may wait for a rate limit token.
+            clock: Wall clock, shared across processes via the store.
+        """
+        self.store = store
+        self.failure_threshold = failure_threshold
+        self.cooldown_seconds = cooldown_seconds
+        self.max_wait_seconds = max_wait_seconds
+        self.clock = clock
+        self._semaphores: dict[str, asyncio.Semaphore] = {}
+
+    async def is_available(self, model_id: str) -> bool:
+        """Check, without side effects, whether a call would be admitted."""
+        state = await self.store.get(f"breaker:{model_id}")
+        if not state or state["status"] == "closed":
+            return True
+        return self.clock() - state["changed_at"] >= self.cooldown_seconds
+
+    async def select_model(self, model_id: str) -> str:
+        """
+        Pick the model to call, falling back if its circuit is open.
+
+        Args:
+            model_id: Requested FAL model identifier.
+
+        Returns:
+            The requested model, or its configured `fallback_model` when the
+            requested circuit is open and the fallback's is not.
+        """
+        if await self.is_available(model_id):
+            return model_id
+
+        config = get_model_config(model_id) or {}
+        fallback = config.get("fallback_model")
+        if fallback and await self.is_available(fallback):
+            logger.warning(
+                "Circuit open for %s, falling back to %s", model_id, fallback
+            )
+            return fallback
+        return model_id
+
+    @asynccontextmanager
+    async def acquire(self, model_id: str) -> AsyncIterator[None]:
+        """
+        Hold a slot for one upstream call and record its outcome.
+
+        Args:
+            model_id: FAL model identifier.
+
+        Raises:
+            ModelUnavailableError: If the circuit is open or no rate limit
+                token is available within `max_wait_seconds`.
+        """
+        admitted = await self.store.update(f"breaker:{model_id}", self._admit)
+        if not admitted:
+            raise ModelUnavailableError(model_id, "circuit open")
+
+        config = get_model_config(model_id) or {}
+        semaphore = self._semaphore(model_id, config.get("max_concurrency"))
+        async with semaphore or _no_limit():
+            rate = config.get("rate_limit")
+            if rate:
+                await self._wait_for_token(model_id, rate, config.get("burst", 1))
+
+            try:
+                yield
+            except asyncio.CancelledError:
+                raise
+            except Exception as exc:
+                if is_model_failure(exc):
+                    await self._record(model_id, success=False)
+                else:
+                    # Says nothing about the model's health: neither resets the
+                    # failure count nor closes a half-open breaker
+                    await self.store.update(f"breaker:{model_id}", self._release)
+                if isinstance(exc, FalRequestError) and exc.status_code == 429:
+                    await self.store.update(f"bucket:{model_id}", self._drain)
+                raise
+            else:
+                await self._record(model_id, success=True)
+
+    def _semaphore(
+        self, model_id: str, max_concurrency: int | None
+    ) -> asyncio.Semaphore | None:
+        """Get the per-process semaphore for a model, if it has a cap."""
+        if not max_concurrency:
+            return None
+        semaphore = self._semaphores.get(model_id)
+        if semaphore is None:
+            semaphore = asyncio.Semaphore(max_concurrency)
+            self._semaphores[model_id] = semaphore
+        return semaphore
+
+    async def _wait_for_token(self, model_id: str, rate: float, burst: int) -> None:
+        """Take a token, sleeping while the bucket refills."""
+        deadline = time.monotonic() + self.max_wait_seconds
+        while True:
+            wait = await self.store.update(
+                f"bucket:{model_id}",
+                lambda state: self._take(state, rate, burst),
+            )
+            if not wait:
+                return
+            if time.monotonic() + wait > deadline:  # type: ignore[operator]
+                raise ModelUnavailableError(model_id, "rate limit wait too long")
+            await asyncio.sleep(wait)  # type: ignore[arg-type]
+
+    async def _record(self, model_id: str, success: bool) -> None:
+        """Record a call outcome, logging when the breaker opens."""
+        state = await self.store.update(
+            f"breaker:{model_id}",
+            lambda current: self._transition(current, success),
+        )
+        if state == "opened":
+            logger.warning("Circuit opened for %s", model_id)
+
+    def _take(self, state: dict | None, rate: float, burst: int) -> tuple[dict, float]:
+        """Refill and take a token. Returns seconds to wait (0 if taken)."""
+        now = self.clock()
+        bucket: BucketState = {"tokens": float(burst), "updated_at": now}
+        if state:
+            elapsed = max(0.0, now - state["updated_at"])
+            tokens = min(float(burst), state["tokens"] + elapsed * rate)
+            bucket = {"tokens": tokens, "updated_at": now}
+
+        if bucket["tokens"] >= 1:
+            bucket["tokens"] -= 1
+            return dict(bucket), 0.0
+        return dict(bucket), (1 - bucket["tokens"]) / rate
+
+    def _drain(self, state: dict | None) -> tuple[dict, None]:
+        """Empty the bucket after a 429 so every worker backs off."""
+        return {"tokens": 0.0, "updated_at": self.clock()}, None
+
+    def _admit(self, state: dict | None) -> tuple[dict, bool]:
+        """Admit a call, moving an open breaker to half-open after cooldown."""
+        now = self.clock()
+        if not state or state["status"] == "closed":
+            return state or _closed(now), True
+        if now - state["changed_at"] < self.cooldown_seconds:
+            return state, False
+        # One trial call per cooldown; a lost trial is retried after another
+        half_open: BreakerState = {
+            "status": "half_open",
+            "failures": state["failures"],
+            "changed_at": now,
+        }
+        return dict(half_open), True
+
+    def _release(self, state: dict | None) -> tuple[dict, None]:
+        """End a call with a neutral outcome, freeing a half-open trial slot."""
+        if state and state["status"] == "half_open":
+            # Back to open with the cooldown already spent: the next call is
+            # admitted as a new trial
+            reopened: BreakerState = {
+                "status": "open",
+                "failures": state["failures"],
+                "changed_at": self.clock() - self.cooldown_seconds,
+            }
+            return dict(reopened), None
+        return state or dict(_closed(self.clock())), None
+
+    def _transition(self, state: dict | None, success: bool) -> tuple[dict, str]:
+        """Apply a call outcome. Returns "opened" when the breaker opens."""
+        now = self.clock()
+        if success:
+            return dict(_closed(now)), "closed"
+
+        current = state or _closed(now)
+        failures = current["failures"] + 1
+        if current["status"] == "half_open" or failures >= self.failure_threshold:
+            was_open = current["status"] == "open"
+            opened: BreakerState = {
+                "status": "open",
+                "failures": failures,
+                "changed_at": current["changed_at"] if was_open else now,
+            }
+            return dict(opened), "open" if was_open else "opened"
+        return {**current, "failures": failures}, current["status"]
+
+
+def _closed(now: float) -> BreakerState:
+    """A fresh closed breaker state."""
+    return {"status": "closed", "failures": 0, "changed_at": now}
+
+
+@asynccontextmanager
+async def _no_limit() -> AsyncIterator[None]:
+    """Stand-in for a semaphore on models without a concurrency cap."""
+    yield
+
+
+_limiter: ModelLimiter | None = None
+
+
+def get_model_limiter() -> ModelLimiter:
+    """
+    Get the shared model limiter configured from settings.
+
+    Returns:
+        ModelLimiter backed by the memory or SQLite state store.
+
+    Raises:
+        ValueError: If the configured backend is unknown.
+    """
+    global _limiter
+    if _limiter is None:
+        from app.config import settings
+
+        _limiter = ModelLimiter(
+            create_state_store(
+                settings.fal_limiter_backend, settings.fal_limiter_path
+            ),
+            failure_threshold=settings.fal_breaker_failure_threshold,
+            cooldown_seconds=settings.fal_breaker_cooldown_seconds,
+            max_wait_seconds=settings.fal_rate_limit_max_wait_seconds,
+        )
+    return _limiter
@@ -1,4 +1,8 @@
-from typing import TypedDict, Literal
+"""FAL model registry: built-in configs compiled into immutable descriptors."""
+
+import copy
+from types import MappingProxyType
+from typing import Iterable, Iterator, Literal, Mapping, TypedDict
 
 
 AspectFormat = Literal["ratio", "snake_case", "dimensions"]
@@ -15,6 +19,15 @@ class ModelConfig(TypedDict, total=False):
     image_param: str
     image_as_list: bool
     unsupported_params: list[str]
+    cacheable: bool  # Deterministic for a pinned seed, results may be cached
+    max_images_per_call: int  # Upper bound FAL accepts for num_images
+    shard_size: int  # Preferred images per call when splitting large requests
+    rate_limit: float  # Requests per second shared by all workers
+    burst: int  # Token bucket capacity for rate_limit
+    max_concurrency: int  # In-flight requests per worker process
+    fallback_model: str  # Sibling used while this model's circuit is open
+    aspect_ratios: list[str]  # Exactly rendered ratios (default: from aspect_format)
+    edit_model: str  # Edit variant (extra models; built-ins use EDIT_MODEL_VARIANTS)
 
 
 MODELS: dict[str, ModelConfig] = {
@@ -27,6 +40,13 @@ MODELS: dict[str, ModelConfig] = {
         "image_param": "image_url",
         "image_as_list": False,
         "unsupported_params": [],
+        "cacheable": True,
+        "max_images_per_call": 4,
+        "shard_size": 2,
+        "rate_limit": 5,
+        "burst": 10,
+        "max_concurrency": 8,
+        "fallback_model": "fal-ai/fast-lightning-sdxl/image-to-image",
     },
     "fal-ai/flux/schnell": {
         "name": "FLUX Schnell",
@@ -35,6 +55,13 @@ MODELS: dict[str, ModelConfig] = {
         "aspect_format": "snake_case",
         "aspect_param": "image_size",
         "unsupported_params": [],
+        "cacheable": True,
+        "max_images_per_call": 4,
+        "shard_size": 2,
+        "rate_limit": 10,
+        "burst": 20,
+        "max_concurrency": 16,
+        "fallback_model": "fal-ai/fast-lightning-sdxl",
     },
     "fal-ai/fast-lightning-sdxl": {
         "name": "SDXL Lightning",
@@ -45,6 +72,13 @@ MODELS: dict[str, ModelConfig] = {
         "image_param": "image_url",
         "image_as_list": False,
         "unsupported_params": ["guidance_scale"],
+        "cacheable": True,
+        "max_images_per_call": 8,
+        "shard_size": 4,
+        "rate_limit": 10,
+        "burst": 20,
+        "max_concurrency": 16,
+        "fallback_model": "fal-ai/flux/schnell",
     },
     "fal-ai/nano-banana": {
         "name": "Nano Banana",
@@ -55,6 +89,13 @@ MODELS: dict[str, ModelConfig] = {
         "image_param": "image_url",
         "image_as_list": False,
         "unsupported_params": ["guidance_scale", "num_inference_steps"],
+        "cacheable": False,
+        "max_images_per_call": 4,
+        "shard_size": 1,
+        "rate_limit": 5,
+        "burst": 10,
+        "max_concurrency": 8,
+        "fallback_model": "fal-ai/flux/schnell",
     },
     # Edit model variants (image-to-image)
     "fal-ai/nano-banana/edit": {
@@ -66,6 +107,13 @@ MODELS: dict[str, ModelConfig] = {
         "image_param": "image_urls",
         "image_as_list": True,
         "unsupported_params": ["guidance_scale", "num_inference_steps"],
+        "cacheable": False,
+        "max_images_per_call": 4,
+        "shard_size": 1,
+        "rate_limit": 5,
+        "burst": 10,
+        "max_concurrency": 8,
+        "fallback_model": "fal-ai/fast-lightning-sdxl/image-to-image",
     },
     "fal-ai/fast-lightning-sdxl/image-to-image": {
         "name": "SDXL Lightning",
@@ -76,6 +124,13 @@ MODELS: dict[str, ModelConfig] = {
         "image_param": "image_url",
         "image_as_list": False,
         "unsupported_params": ["guidance_scale"],
+        "cacheable": True,
+        "max_images_per_call": 8,
+        "shard_size": 4,
+        "rate_limit": 10,
+        "burst": 20,
+        "max_concurrency": 16,
+        "fallback_model": "fal-ai/flux/schnell/redux",
     },
 }
 
@@ -116,71 +171,310 @@ ASPECT_CONVERSIONS: dict[AspectFormat, dict[str, str]] = {
 }
 
 
+# Ratios a format can only approximate (e.g. 4:5 becomes portrait_4_3)
+APPROXIMATED_ASPECTS: dict[AspectFormat, frozenset[str]] = {
+    "ratio": frozenset(),
+    "snake_case": frozenset({"4:5"}),
+    "dimensions": frozenset(),
+}
+
+
 def convert_aspect_ratio(aspect: str, target_format: AspectFormat) -> str:
     """Convert aspect ratio to target format."""
     conversion_map = ASPECT_CONVERSIONS.get(target_format, {})
     return conversion_map.get(aspect, aspect)
 
 
-def normalize_params(model_id: str, params: dict) -> dict:
-    """Normalize parameters for a specific model."""
-    config = MODELS.get(model_id)
-    if not config:
-        return params
+class ModelDescriptor:
+    """
+    Compiled, immutable view of one model's configuration.
 
-    result = params.copy()
+    Lookups that used to happen per call (aspect conversion table,
+    unsupported params, edit variant) are resolved once at compile time.
+    """
 
-    aspect = result.pop("aspect_ratio", None)
-    if aspect:
-        target_format = config.get("aspect_format", "ratio")
-        param_name = config.get("aspect_param", "aspect_ratio")
-        converted = convert_aspect_ratio(aspect, target_format)
-        result[param_name] = converted
+    __slots__ = (
+        "model_id",
+        "name",
+        "price",
+        "description",
+        "aspect_param",
+        "aspect_map",
+        "aspect_ratios",
+        "image_param",
+        "image_as_list",
+        "unsupported_params",
+        "cacheable",
+        "max_images_per_call",
+        "shard_size",
+        "edit_model_id",
+        "config",
+    )
+
+    model_id: str
+    name: str
+    price: float
+    description: str
+    aspect_param: str
+    aspect_map: Mapping[str, str]
+    aspect_ratios: frozenset[str]
+    image_param: str
+    image_as_list: bool
+    unsupported_params: frozenset[str]
+    cacheable: bool
+    max_images_per_call: int | None
+    shard_size: int | None
+    edit_model_id: str | None
+    config: Mapping[str, object]
 
-    for key in config.get("unsupported_params", []):
-        result.pop(key, None)
+    def __init__(
+        self, model_id: str, config: ModelConfig, edit_model_id: str | None
+    ) -> None:
+        values: dict[str, object] = {
+            "model_id": model_id,
+            "name": config.get("name", "Unknown Model"),
+            "price": float(config.get("price", 0.01)),
+            "description": config.get("description", ""),
+            "aspect_param": config.get("aspect_param", "aspect_ratio"),
+            "aspect_map": MappingProxyType(
+                ASPECT_CONVERSIONS[config.get("aspect_format", "ratio")]
+            ),
+            "aspect_ratios": frozenset(
+                config.get("aspect_ratios", [])
+                or set(ASPECT_CONVERSIONS["ratio"])
+                - APPROXIMATED_ASPECTS[config.get("aspect_format", "ratio")]
+            ),
+            "image_param": config.get("image_param", "image_url"),
+            "image_as_list": config.get("image_as_list", False),
+            "unsupported_params": frozenset(config.get("unsupported_params", [])),
+            "cacheable": config.get("cacheable", False),
+            "max_images_per_call": config.get("max_images_per_call"),
+            "shard_size": config.get("shard_size"),
+            "edit_model_id": edit_model_id,
+            "config": MappingProxyType(copy.deepcopy(dict(config))),
+        }
+        for name, value in values.items():
+            object.__setattr__(self, name, value)
 
-    return result
+    def __setattr__(self, name: str, value: object) -> None:
+        raise AttributeError(f"ModelDescriptor is immutable: cannot set {name}")
+
+    def __delattr__(self, name: str) -> None:
+        raise AttributeError(f"ModelDescriptor is immutable: cannot delete {name}")
+
+    def __repr__(self) -> str:
+        return f"ModelDescriptor({self.model_id!r})"
+
+    def normalize(self, params: dict[str, object]) -> dict[str, object]:
+        """Map aspect_ratio to the model's format and drop unsupported params."""
+        unsupported = self.unsupported_params
+        result = {k: v for k, v in params.items() if k not in unsupported}
+
+        aspect = result.pop("aspect_ratio", None)
+        if aspect:
+            result[self.aspect_param] = self.aspect_map.get(str(aspect), aspect)
+        return result
+
+
+class ModelRegistry:
+    """Immutable set of compiled models. Replaced as a whole on reload."""
+
+    __slots__ = ("_models", "base_model_ids")
+
+    def __init__(self, models: dict[str, ModelDescriptor]) -> None:
+        self._models: Mapping[str, ModelDescriptor] = MappingProxyType(models)
+        edit_targets = {m.edit_model_id for m in models.values() if m.edit_model_id}
+        # Text-to-image models, i.e. not only reachable as an edit variant
+        self.base_model_ids: tuple[str, ...] = tuple(
+            model_id for model_id in models if model_id not in edit_targets
+        )
+
+    def get(self, model_id: str) -> ModelDescriptor | None:
+        """Return a model's descriptor, or None if unknown."""
+        return self._models.get(model_id)
+
+    def __contains__(self, model_id: object) -> bool:
+        return model_id in self._models
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._models)
+
+    def __len__(self) -> int:
+        return len(self._models)
+
+    def values(self) -> Iterable[ModelDescriptor]:
+        """Return all descriptors in registration order."""
+        return self._models.values()
+
+
+def compile_registry(
+    configs: Mapping[str, ModelConfig],
+    edit_variants: Mapping[str, str] | None = None,
+) -> ModelRegistry:
+    """
+    Validate model configs and compile them into a registry.
+
+    Args:
+        configs: Model configs keyed by FAL model identifier.
+        edit_variants: Base model to edit variant links. A config's own
+            `edit_model` key takes precedence.
+
+    Returns:
+        Compiled registry.
+
+    Raises:
+        ValueError: If a config is invalid or links to an unknown model.
+    """
+    edit_variants = edit_variants or {}
+    descriptors: dict[str, ModelDescriptor] = {}
+
+    for model_id, config in configs.items():
+        if "name" not in config or "price" not in config:
+            raise ValueError(f"Model {model_id} needs a name and a price")
+        if float(config["price"]) < 0:
+            raise ValueError(f"Model {model_id} has a negative price")
+        if config.get("aspect_format", "ratio") not in ASPECT_CONVERSIONS:
+            raise ValueError(f"Model {model_id} has an unknown aspect_format")
+
+        max_per_call = config.get("max_images_per_call")
+        shard_size = config.get("shard_size")
+        if max_per_call and shard_size and shard_size > max_per_call:
+            raise ValueError(f"Model {model_id} shard_size exceeds max_images_per_call")
+
+        edit_model_id = config.get("edit_model") or edit_variants.get(model_id)
+        for linked in (edit_model_id, config.get("fallback_model")):
+            if linked and linked not in configs:
+                raise ValueError(f"Model {model_id} links to unknown model {linked}")
+
+        descriptors[model_id] = ModelDescriptor(model_id, config, edit_model_id)
+
+    return ModelRegistry(descriptors)
+
+
+_registry: ModelRegistry = compile_registry(MODELS, EDIT_MODEL_VARIANTS)
+
+
+def get_registry() -> ModelRegistry:
+    """Get the current model registry."""
+    return _registry
+
+
+def swap_registry(registry: ModelRegistry) -> ModelRegistry:
+    """
+    Atomically replace the current registry.
+
+    In-flight calls keep the descriptors they already looked up.
+
+    Returns:
+        The previous registry.
+    """
+    global _registry
+    previous, _registry = _registry, registry
+    return previous
+
+
+def normalize_params(model_id: str, params: dict) -> dict:
+    """Normalize parameters for a specific model."""
+    model = _registry.get(model_id)
+    return model.normalize(params) if model else params
+
+
+def supports_aspect_ratio(model_id: str, aspect_ratio: str) -> bool:
+    """Check if a model renders an aspect ratio exactly (not approximated)."""
+    model = _registry.get(model_id)
+    return model is not None and aspect_ratio in model.aspect_ratios
 
 
 def get_model_config(model_id: str) -> ModelConfig | None:
-    """Get configuration for a specific model."""
-    return MODELS.get(model_id)
+    """Get configuration for a specific model (read-only)."""
+    model = _registry.get(model_id)
+    return model.config if model else None  # type: ignore[return-value]
 
 
 def get_all_models() -> list[dict]:
     """Get all supported models for API response."""
     return [
         {
-            "id": model_id,
-            "name": config.get("name", "Unknown Model"),
-            "price_per_image": config.get("price", 0.0),
-            "description": config.get("description", ""),
+            "id": model.model_id,
+            "name": model.name,
+            "price_per_image": model.price,
+            "description": model.description,
         }
-        for model_id, config in MODELS.items()
+        for model in _registry.values()
     ]
 
 
 def get_model_price(model_id: str) -> float:
     """Get price for a specific model."""
-    config = MODELS.get(model_id)
-    return config.get("price", 0.01) if config else 0.01
+    model = _registry.get(model_id)
+    return model.price if model else 0.01
 
 
 def supports_advanced_params(model_id: str) -> bool:
     """Check if model supports guidance_scale and num_inference_steps."""
-    config = MODELS.get(model_id)
-    if not config:
-        return True
-    unsupported = config.get("unsupported_params", [])
-    return "guidance_scale" not in unsupported
+    model = _registry.get(model_id)
+    return model is None or "guidance_scale" not in model.unsupported_params
+
+
+def plan_shards(model_id: str, num_images: int) -> list[int]:
+    """
+    Split a num_images request into per-call image counts.
+
+    Args:
+        model_id: FAL model identifier.
+        num_images: Total images requested.
+
+    Returns:
+        Image count per call, in order. A single entry means no sharding.
+    """
+    model = _registry.get(model_id)
+    if not model or num_images <= 1:
+        return [max(num_images, 1)]
+
+    max_per_call = model.max_images_per_call or num_images
+    shard_size = min(model.shard_size or max_per_call, max_per_call)
+    if num_images <= shard_size:
+        return [num_images]
+
+    full, remainder = divmod(num_images, shard_size)
+    return [shard_size] * full + ([remainder] if remainder else [])
+
+
+def adapt_params(
+    source_model: str, target_model: str, params: dict[str, object]
+) -> dict[str, object]:
+    """
+    Move the input image parameter to the shape another model expects.
+
+    Args:
+        source_model: Model the parameters were built for.
+        target_model: Model that will receive them.
+        params: Request parameters (before normalization).
+
+    Returns:
+        Copy of the parameters for the target model.
+    """
+    source = _registry.get(source_model)
+    target = _registry.get(target_model)
+    result = params.copy()
+
+    image = result.pop(source.image_param if source else "image_url", None)
+    if image is None:
+        return result
+    if isinstance(image, list):
+        image = image[0] if image else None
+    if image is not None:
+        key = target.image_param if target else "image_url"
+        result[key] = [image] if target and target.image_as_list else image
+    return result
 
 
 def get_edit_model_id(model_id: str) -> str | None:
     """Get the edit variant of a model if available."""
-    return EDIT_MODEL_VARIANTS.get(model_id)
+    model = _registry.get(model_id)
+    return model.edit_model_id if model else None
 
 
 def supports_image_editing(model_id: str) -> bool:
     """Check if model has an image editing variant."""
-    return model_id in EDIT_MODEL_VARIANTS
+    return get_edit_model_id(model_id) is not None
@@ -0,0 +1,255 @@
+"""Cached, time-bounded prompt optimization through the FAL LLM router.
+
+Optimized prompts are cached by (raw prompt, system prompt version,
+model). Concurrent callers for the same key share one LLM call through a
+detached `SingleFlight`. Each waits at most `timeout` seconds and
+otherwise keeps the raw prompt; the call itself runs on (up to
+`upstream_timeout`) so its result warms the cache for the next run.
+"""
+
+import asyncio
+import hashlib
+import json
+import logging
+import time
+
+from app.utils.cache import CacheBackend, create_cache_backend
+from app.utils.metrics import get_metrics
+from app.utils.singleflight import SingleFlight
+
+from .service import get_fal_service
+
+logger = logging.getLogger(__name__)
+
+OPTIMIZER_APP = "openrouter/router"
+OPTIMIZER_MODEL = "anthropic/claude-haiku-4.5"
+
+# Bump when SYSTEM_PROMPT changes so cached prompts are not reused
+SYSTEM_PROMPT_VERSION = "ad-creative-v1"
+SYSTEM_PROMPT = (
+    "You are an expert Performance Marketing Creative Strategist. "
+    "Your goal is to write image prompts that generate high-CTR (Click-Through Rate) "
+    "advertising visuals for social media (Instagram/Facebook/TikTok). "
+    "Transform the input into a crisp, commercial product image description. "
+    "Rules: "
+    "1. The product/subject must be the absolute hero: clear, sharp, and center "
+    "stage. "
+    "2. Lighting: Use professional commercial lighting (softbox, rim lighting) to "
+    "make the product pop. "
+    "3. Background: Keep it complementary but not distracting. Avoid clutter. "
+    "4. Aesthetics: Bright, vibrant, and expensive-looking. Think high-end "
+    "e-commerce or Apple-style minimalism. "
+    "5. NO chatty text, NO '/imagine' commands. Return ONLY the prompt string."
+)
+
+
+def make_prompt_key(
+    prompt: str,
+    system_prompt_version: str = SYSTEM_PROMPT_VERSION,
+    model: str = OPTIMIZER_MODEL,
+) -> str:
+    """
+    Build the cache key for an optimization request.
+
+    Whitespace differences in the prompt don't change the key.
+
+    Args:
+        prompt: Raw prompt.
+        system_prompt_version: Version of the system prompt.
+        model: LLM model identifier.
+
+    Returns:
+        Hex digest key.
+    """
+    payload = json.dumps(
+        {
+            "prompt": " ".join(prompt.split()),
+            "system_prompt_version": system_prompt_version,
+            "model": model,
+        },
+        sort_keys=True,
+    )
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+class PromptOptimizer:
+    """Optimizes prompts with an LLM, with caching and a strict timeout."""
+
+    def __init__(
+        self,
+        backend: CacheBackend | None,
+        ttl: float,
+        timeout: float,
+        upstream_timeout: float,
+        model: str = OPTIMIZER_MODEL,
+    ) -> None:
+        """
+        Initialize the optimizer.
+
+        Args:
+            backend: Cache backend, or None to disable caching.
+            ttl: Cache entry lifetime in seconds.
+            timeout: Longest a caller waits before using the raw prompt.
+            upstream_timeout: Longest the (detached) LLM call may run.
+            model: LLM model identifier.
+        """
+        self.backend = backend
+        self.ttl = ttl
+        self.timeout = timeout
+        self.upstream_timeout = upstream_timeout
+        self.model = model
+        # Callers that time out stop waiting; the LLM call still fills the cache
+        self._flight: SingleFlight[dict[str, object] | None] = SingleFlight(
+            detached=True
+        )
+
+    async def optimize(self, prompt: str) -> str:
+        """
+        Optimize a prompt, falling back to the raw prompt.
+
+        Args:
+            prompt: Raw prompt.
+
+        Returns:
+            The optimized prompt, or the raw prompt on timeout or failure.
+        """
+        if not prompt.strip():
+            return prompt
+
+        metrics = get_metrics()
+        metrics.increment("prompt_optimizer.requests")
+        key = make_prompt_key(prompt, SYSTEM_PROMPT_VERSION, self.model)
+
+        entry = await self._cache_get(key)
+        if entry is not None:
+            metrics.increment("prompt_optimizer.cache_hits")
+            metrics.increment(
+                "prompt_optimizer.latency_saved_seconds",
+                float(entry.get("latency", 0.0)),  # type: ignore[arg-type]
+            )
+            self._update_hit_rate()
+            return str(entry["prompt"])
+        self._update_hit_rate()
+
+        try:
+            async with asyncio.timeout(self.timeout):
+                entry, _ = await self._flight.do(
+                    key, lambda: self._fetch(key, prompt)
+                )
+        except TimeoutError:
+            metrics.increment("prompt_optimizer.timeouts")
+            logger.info("Prompt optimization timed out, using raw prompt")
+            return prompt
+
+        return str(entry["prompt"]) if entry else prompt
+
+    async def optimize_many(
+        self, prompts: list[str], concurrency: int = 8
+    ) -> list[str]:
+        """
+        Optimize many prompts concurrently.
+
+        Duplicate prompts share one lookup. Results keep the input order.
+
+        Args:
+            prompts: Raw prompts.
+            concurrency: Maximum LLM calls in flight.
+
+        Returns:
+            Optimized (or raw, on timeout/failure) prompts in input order.
+        """
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def optimize_one(prompt: str) -> str:
+            async with semaphore:
+                return await self.optimize(prompt)
+
+        unique = list(dict.fromkeys(prompts))
+        results = await asyncio.gather(*(optimize_one(p) for p in unique))
+        optimized = dict(zip(unique, results))
+        return [optimized[p] for p in prompts]
+
+    async def _fetch(self, key: str, prompt: str) -> dict[str, object] | None:
+        """Call the LLM and cache the result. Returns None on failure."""
+        started = time.monotonic()
+        try:
+            result = await get_fal_service().run(
+                OPTIMIZER_APP,
+                {
+                    "model": self.model,
+                    "prompt": prompt,
+                    "system_prompt": SYSTEM_PROMPT,
+                },
+                timeout=self.upstream_timeout,
+            )
+        except Exception:
+            get_metrics().increment("prompt_optimizer.failures")
+            logger.warning("AI prompt optimization failed", exc_info=True)
+            return None
+
+        output = result.get("output") if isinstance(result, dict) else None
+        optimized = str(output).strip() if output else ""
+        if not optimized:
+            get_metrics().increment("prompt_optimizer.failures")
+            return None
+
+        latency = time.monotonic() - started
+        get_metrics().increment("prompt_optimizer.llm_seconds", latency)
+        entry: dict[str, object] = {"prompt": optimized, "latency": latency}
+        await self._cache_set(key, entry)
+        return entry
+
+    async def _cache_get(self, key: str) -> dict[str, object] | None:
+        """Read a cache entry. Errors count as misses."""
+        if self.backend is None:
+            return None
+        try:
+            value = await self.backend.get(key)
+        except Exception:
+            logger.warning("Prompt cache read failed", exc_info=True)
+            return None
+        return value if isinstance(value, dict) and "prompt" in value else None
+
+    async def _cache_set(self, key: str, entry: dict[str, object]) -> None:
+        """Write a cache entry. Errors are logged, not raised."""
+        if self.backend is None:
+            return
+        try:
+            await self.backend.set(key, entry, self.ttl)
+        except Exception:
+            logger.warning("Prompt cache write failed", exc_info=True)
+
+    def _update_hit_rate(self) -> None:
+        """Publish the cache hit rate as a metric."""
+        metrics = get_metrics()
+        requests = metrics.get("prompt_optimizer.requests")
+        if requests:
+            hits = metrics.get("prompt_optimizer.cache_hits")
+            metrics.set("prompt_optimizer.hit_rate", hits / requests)
+
+
+_optimizer: PromptOptimizer | None = None
+
+
+def get_prompt_optimizer() -> PromptOptimizer:
+    """
+    Get the shared prompt optimizer configured from settings.
+
+    Returns:
+        PromptOptimizer with the configured cache and timeouts.
+    """
+    global _optimizer
+    if _optimizer is None:
+        from app.config import settings
+
+        _optimizer = PromptOptimizer(
+            create_cache_backend(
+                settings.prompt_cache_backend,
+                settings.prompt_cache_path,
+                table="prompts",
+            ),
+            ttl=settings.prompt_cache_ttl_seconds,
+            timeout=settings.prompt_optimizer_timeout_seconds,
+            upstream_timeout=settings.prompt_optimizer_upstream_timeout_seconds,
+        )
+    return _optimizer
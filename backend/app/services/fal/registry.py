@@ -0,0 +1,157 @@
+"""Loading extra models from a file or DB table, with hot reload.
+
+Extra model configs are merged over the built-in `MODELS` (so a file can
+also adjust a built-in model's price or limits), compiled and swapped in
+atomically. An invalid source leaves the current registry in place.
+"""
+
+import asyncio
+import json
+import logging
+from pathlib import Path
+
+from .models import (
+    EDIT_MODEL_VARIANTS,
+    MODELS,
+    ModelConfig,
+    ModelRegistry,
+    compile_registry,
+    swap_registry,
+)
+
+logger = logging.getLogger(__name__)
+
+
+def load_model_file(path: str | Path) -> dict[str, ModelConfig]:
+    """
+    Read model configs from a JSON file.
+
+    The file holds an object keyed by model ID, optionally wrapped in
+    {"models": {...}}.
+
+    Args:
+        path: JSON file path.
+
+    Returns:
+        Model configs keyed by model ID.
+
+    Raises:
+        ValueError: If the file is not a JSON object of objects.
+    """
+    data = json.loads(Path(path).read_text())
+    if isinstance(data, dict) and isinstance(data.get("models"), dict):
+        data = data["models"]
+    if not isinstance(data, dict) or not all(
+        isinstance(config, dict) for config in data.values()
+    ):
+        raise ValueError(f"Model file {path} must map model IDs to configs")
+    return data
+
+
+async def load_model_table(table: str) -> dict[str, ModelConfig]:
+    """
+    Read enabled model configs from a Supabase table.
+
+    Args:
+        table: Table with `model_id`, `config` (jsonb) and `enabled` columns.
+
+    Returns:
+        Model configs keyed by model ID.
+    """
+    from app.services.supabase import get_supabase_client
+
+    def query() -> list[dict]:
+        result = (
+            get_supabase_client()
+            .table(table)
+            .select("model_id, config")
+            .eq("enabled", True)
+            .execute()
+        )
+        return list(result.data or [])
+
+    rows = await asyncio.to_thread(query)
+    return {
+        str(row["model_id"]): row["config"]
+        for row in rows
+        if isinstance(row.get("config"), dict)
+    }
+
+
+def build_registry(*sources: dict[str, ModelConfig]) -> ModelRegistry:
+    """
+    Merge extra configs over the built-ins and compile them.
+
+    Args:
+        sources: Extra configs, later sources overriding earlier ones.
+
+    Returns:
+        Compiled registry.
+
+    Raises:
+        ValueError: If the merged configs are invalid.
+    """
+    configs: dict[str, dict[str, object]] = {k: dict(v) for k, v in MODELS.items()}
+    for source in sources:
+        for model_id, config in source.items():
+            configs[model_id] = {**configs.get(model_id, {}), **config}
+    return compile_registry(configs, EDIT_MODEL_VARIANTS)  # type: ignore[arg-type]
+
+
+async def load_sources(
+    path: str | None = None, table: str | None = None
+) -> list[dict[str, ModelConfig]]:
+    """Read the configured extra model sources (file first, then table)."""
+    sources: list[dict[str, ModelConfig]] = []
+    if path:
+        sources.append(await asyncio.to_thread(load_model_file, path))
+    if table:
+        sources.append(await load_model_table(table))
+    return sources
+
+
+async def reload_registry(
+    path: str | None = None, table: str | None = None
+) -> ModelRegistry:
+    """
+    Rebuild the registry from the configured sources and swap it in.
+
+    Args:
+        path: Optional JSON file of extra models.
+        table: Optional Supabase table of extra models (applied last).
+
+    Returns:
+        The new registry.
+
+    Raises:
+        ValueError: If a source is invalid. The current registry is kept.
+    """
+    registry = build_registry(*await load_sources(path, table))
+    swap_registry(registry)
+    logger.info("Model registry loaded with %d models", len(registry))
+    return registry
+
+
+async def watch_registry(path: str | None, table: str | None, interval: float) -> None:
+    """
+    Reload the registry whenever its sources change, until cancelled.
+
+    Failures are logged and retried on the next check.
+
+    Args:
+        path: Optional JSON file of extra models.
+        table: Optional Supabase table of extra models.
+        interval: Seconds between checks.
+    """
+    last_sources: list[dict[str, ModelConfig]] | None = None
+    while True:
+        try:
+            sources = await load_sources(path, table)
+            if sources != last_sources:
+                registry = build_registry(*sources)
+                swap_registry(registry)
+                last_sources = sources
+                logger.info("Model registry loaded with %d models", len(registry))
+        except Exception:
+            logger.warning("Model registry reload failed", exc_info=True)
+        await asyncio.sleep(interval)
@@ -0,0 +1,185 @@
+"""Adaptive model routing by observed latency, error rate and price.
+
+`ModelStats` keeps a rolling window of real FAL call outcomes per model
+(per worker process). `choose_model` picks the cheapest model that meets
+a latency SLO for the requested aspect ratio and edit capability.
+"""
+
+import math
+from collections import deque
+from typing import TypedDict
+
+from .limits import get_model_limiter
+from .models import get_registry
+
+AUTO_MODEL = "auto"
+
+# Models with fewer samples are assumed to meet the SLO (exploration)
+MIN_SAMPLES = 5
+
+
+class ModelStatsSnapshot(TypedDict):
+    """Rolling statistics for one model."""
+
+    samples: int
+    p90_latency: float | None
+    error_rate: float
+
+
+class RoutingCandidate(TypedDict):
+    """One model considered by the router."""
+
+    model_id: str
+    price: float
+    p90_latency: float | None
+    error_rate: float
+    samples: int
+    rejected: str | None
+
+
+class RoutingDecision(TypedDict):
+    """Outcome of auto routing, recorded in generation parameters."""
+
+    model_id: str
+    reason: str
+    aspect_ratio: str
+    edit: bool
+    latency_slo_seconds: float
+    candidates: list[RoutingCandidate]
+
+
+class ModelStats:
+    """Rolling window of call latencies and outcomes per model."""
+
+    def __init__(self, window: int = 100) -> None:
+        self.window = window
+        self._calls: dict[str, deque[tuple[float, bool]]] = {}
+
+    def record(self, model_id: str, latency: float, ok: bool) -> None:
+        """
+        Record one upstream call.
+
+        Args:
+            model_id: FAL model identifier.
+            latency: Call duration in seconds.
+            ok: Whether the call succeeded.
+        """
+        calls = self._calls.get(model_id)
+        if calls is None:
+            calls = deque(maxlen=self.window)
+            self._calls[model_id] = calls
+        calls.append((latency, ok))
+
+    def snapshot(self, model_id: str) -> ModelStatsSnapshot:
+        """Return sample count, p90 latency of successes and error rate."""
+        calls = self._calls.get(model_id, ())
+        latencies = sorted(latency for latency, ok in calls if ok)
+        errors = sum(1 for _, ok in calls if not ok)
+        p90 = None
+        if latencies:
+            p90 = latencies[max(0, math.ceil(0.9 * len(latencies)) - 1)]
+        return {
+            "samples": len(calls),
+            "p90_latency": p90,
+            "error_rate": errors / len(calls) if calls else 0.0,
+        }
+
+    def clear(self) -> None:
+        """Drop all recorded calls."""
+        self._calls.clear()
+
+
+_stats = ModelStats()
+
+
+def get_model_stats() -> ModelStats:
+    """Get the process-wide model statistics."""
+    return _stats
+
+
+async def choose_model(
+    aspect_ratio: str,
+    edit: bool,
+    latency_slo_seconds: float,
+    max_error_rate: float = 0.2,
+    stats: ModelStats | None = None,
+) -> RoutingDecision:
+    """
+    Pick the cheapest model meeting the latency SLO.
+
+    Args:
+        aspect_ratio: Requested aspect ratio, e.g. "4:5".
+        edit: Whether an input image is provided (routes to edit variants).
+        latency_slo_seconds: Maximum acceptable p90 latency.
+        max_error_rate: Maximum acceptable rolling error rate.
+        stats: Statistics to use (defaults to the process-wide ones).
+
+    Returns:
+        The decision, including every candidate and why it was rejected.
+
+    Raises:
+        ValueError: If no model supports the aspect ratio.
+    """
+    stats = stats or get_model_stats()
+    limiter = get_model_limiter()
+    registry = get_registry()
+
+    candidates: list[RoutingCandidate] = []
+    for base_model_id in registry.base_model_ids:
+        base = registry.get(base_model_id)
+        model_id = base.edit_model_id if base and edit else base_model_id
+        model = registry.get(model_id) if model_id else None
+        if model is None:
+            continue  # No edit variant
+
+        snapshot = stats.snapshot(model.model_id)
+        measured = snapshot["samples"] >= MIN_SAMPLES
+        p90 = snapshot["p90_latency"]
+
+        rejected = None
+        if aspect_ratio not in model.aspect_ratios:
+            rejected = "aspect ratio not supported"
+        elif not await limiter.is_available(model.model_id):
+            rejected = "circuit open"
+        elif measured and snapshot["error_rate"] > max_error_rate:
+            rejected = f"error rate {snapshot['error_rate']:.0%}"
+        elif measured and (p90 is None or p90 > latency_slo_seconds):
+            rejected = "p90 latency above SLO"
+
+        candidates.append(
+            {
+                "model_id": model.model_id,
+                "price": model.price,
+                "p90_latency": p90,
+                "error_rate": snapshot["error_rate"],
+                "samples": snapshot["samples"],
+                "rejected": rejected,
+            }
+        )
+
+    eligible = [c for c in candidates if c["rejected"] is None]
+    if eligible:
+        chosen = min(eligible, key=lambda c: (c["price"], c["p90_latency"] or 0.0))
+        reason = "cheapest model meeting the latency SLO"
+    else:
+        # Nothing meets the SLO: take the fastest model that can do the job
+        usable = [
+            c
+            for c in candidates
+            if c["rejected"] != "aspect ratio not supported"
+        ]
+        if not usable:
+            raise ValueError(f"No model supports aspect ratio {aspect_ratio}")
+        chosen = min(
+            usable, key=lambda c: (c["p90_latency"] or math.inf, c["price"])
+        )
+        reason = "no model meets the SLO, using the fastest observed"
+
+    return {
+        "model_id": chosen["model_id"],
+        "reason": reason,
+        "aspect_ratio": aspect_ratio,
+        "edit": edit,
+        "latency_slo_seconds": latency_slo_seconds,
+        "candidates": candidates,
+    }
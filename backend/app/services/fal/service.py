@@ -0,0 +1,311 @@
+"""Shared FAL service with a pooled HTTP client and queue-based execution."""
+
+import asyncio
+import inspect
+import logging
+import time
+from typing import Awaitable, Callable, Literal, TypedDict
+
+import httpx
+
+logger = logging.getLogger(__name__)
+
+FAL_RUN_URL = "https://fal.run"
+FAL_QUEUE_URL = "https://queue.fal.run"
+
+# Status polling backs off from the first to the max interval
+POLL_INTERVAL_SECONDS = 0.25
+MAX_POLL_INTERVAL_SECONDS = 2.0
+DEFAULT_REQUEST_TIMEOUT_SECONDS = 300.0
+
+
+FalStatus = Literal["IN_QUEUE", "IN_PROGRESS", "COMPLETED"]
+
+
+class FalRequestHandle(TypedDict):
+    """Identifiers returned by a queue submission."""
+
+    request_id: str
+    status_url: str
+    response_url: str
+    cancel_url: str
+
+
+class FalProgressEvent(TypedDict, total=False):
+    """Progress event emitted while a queued request runs."""
+
+    request_id: str
+    application: str
+    status: FalStatus
+    queue_position: int | None
+    logs: list[dict[str, object]]
+    elapsed: float
+
+
+ProgressCallback = Callable[[FalProgressEvent], Awaitable[None] | None]
+
+
+class FalRequestError(RuntimeError):
+    """Raised when FAL rejects a request or a queued request fails."""
+
+    def __init__(self, message: str, status_code: int | None = None) -> None:
+        super().__init__(message)
+        self.status_code = status_code
+
+
+class FalService:
+    """
+    FAL API client built on one pooled `httpx.AsyncClient`.
+
+    Generations go through the queue API: a short submit request, then
+    short status polls over keep-alive connections, so many generations
+    can be in flight without holding a long-lived connection each.
+    """
+
+    def __init__(
+        self,
+        api_key: str,
+        run_url: str = FAL_RUN_URL,
+        queue_url: str = FAL_QUEUE_URL,
+        max_connections: int = 100,
+        transport: httpx.AsyncBaseTransport | None = None,
+    ) -> None:
+        """
+        Initialize the service.
+
+        Args:
+            api_key: FAL API key, sent explicitly as an Authorization header.
+            run_url: Base URL for synchronous runs.
+            queue_url: Base URL for the queue API.
+            max_connections: Connection pool size.
+            transport: Optional transport override (tests, local stand-ins).
+        """
+        self.run_url = run_url.rstrip("/")
+        self.queue_url = queue_url.rstrip("/")
+        self._client = httpx.AsyncClient(
+            headers={"Authorization": f"Key {api_key}"},
+            limits=httpx.Limits(
+                max_connections=max_connections,
+                max_keepalive_connections=max_connections,
+            ),
+            timeout=httpx.Timeout(30.0, connect=5.0),
+            transport=transport,
+        )
+
+    async def aclose(self) -> None:
+        """Close the pooled HTTP client."""
+        await self._client.aclose()
+
+    async def _request(
+        self,
+        method: str,
+        url: str,
+        json: dict[str, object] | None = None,
+        timeout: float | None = None,
+    ) -> dict[str, object]:
+        """Send a request and decode the JSON body, raising FalRequestError."""
+        try:
+            response = await self._client.request(
+                method,
+                url,
+                json=json,
+                timeout=timeout if timeout is not None else httpx.USE_CLIENT_DEFAULT,
+            )
+        except httpx.RequestError as e:
+            raise FalRequestError(f"FAL request to {url} failed: {e}") from e
+
+        if response.is_error:
+            raise FalRequestError(
+                f"FAL returned {response.status_code} for {url}: {response.text[:500]}",
+                status_code=response.status_code,
+            )
+
+        try:
+            data = response.json()
+        except ValueError as e:
+            raise FalRequestError(f"FAL returned invalid JSON for {url}") from e
+        return data if isinstance(data, dict) else {"data": data}
+
+    async def run(
+        self,
+        application: str,
+        arguments: dict[str, object],
+        timeout: float | None = None,
+    ) -> dict[str, object]:
+        """
+        Run an application synchronously. Use for short calls only.
+
+        Args:
+            application: FAL application ID, e.g. "openrouter/router".
+            arguments: JSON arguments.
+            timeout: Optional request timeout in seconds.
+
+        Returns:
+            Decoded application result.
+        """
+        return await self._request(
+            "POST", f"{self.run_url}/{application}", json=arguments, timeout=timeout
+        )
+
+    async def submit(
+        self, application: str, arguments: dict[str, object]
+    ) -> FalRequestHandle:
+        """
+        Submit a request to the queue.
+
+        Args:
+            application: FAL application ID.
+            arguments: JSON arguments.
+
+        Returns:
+            Handle with request ID and status/response/cancel URLs.
+        """
+        data = await self._request(
+            "POST", f"{self.queue_url}/{application}", json=arguments
+        )
+        request_id = str(data.get("request_id", ""))
+        if not request_id:
+            raise FalRequestError(f"FAL queue submit for {application} returned no id")
+
+        base_url = f"{self.queue_url}/{application}/requests/{request_id}"
+        return {
+            "request_id": request_id,
+            "status_url": str(data.get("status_url") or f"{base_url}/status"),
+            "response_url": str(data.get("response_url") or base_url),
+            "cancel_url": str(data.get("cancel_url") or f"{base_url}/cancel"),
+        }
+
+    async def status(
+        self, handle: FalRequestHandle, with_logs: bool = False
+    ) -> dict[str, object]:
+        """Fetch the current status of a queued request."""
+        url = handle["status_url"]
+        if with_logs:
+            url += "?logs=1"
+        return await self._request("GET", url)
+
+    async def result(self, handle: FalRequestHandle) -> dict[str, object]:
+        """Fetch the result of a completed request."""
+        return await self._request("GET", handle["response_url"])
+
+    async def cancel(self, handle: FalRequestHandle) -> None:
+        """Cancel a queued or running request. Failures are logged."""
+        try:
+            await self._request("PUT", handle["cancel_url"])
+        except FalRequestError as e:
+            logger.warning(
+                "Failed to cancel FAL request %s: %s", handle["request_id"], e
+            )
+
+    async def subscribe(
+        self,
+        application: str,
+        arguments: dict[str, object],
+        on_progress: ProgressCallback | None = None,
+        timeout: float = DEFAULT_REQUEST_TIMEOUT_SECONDS,
+    ) -> dict[str, object]:
+        """
+        Submit a request, poll until it completes and return the result.
+
+        If the caller is cancelled or the timeout elapses, the upstream
+        request is cancelled too so it stops consuming FAL capacity.
+
+        Args:
+            application: FAL application ID.
+            arguments: JSON arguments.
+            on_progress: Optional callback (sync or async) for status events.
+            timeout: Overall timeout in seconds.
+
+        Returns:
+            Decoded application result.
+
+        Raises:
+            FalRequestError: If submission, polling or the request fails.
+            TimeoutError: If the request does not complete in time.
+        """
+        handle = await self.submit(application, arguments)
+
+        started = time.monotonic()
+        try:
+            async with asyncio.timeout(timeout):
+                await self._wait_for_completion(
+                    application, handle, started, on_progress
+                )
+                return await self.result(handle)
+        except (asyncio.CancelledError, TimeoutError):
+            # Best-effort upstream cancel that survives our own cancellation
+            await asyncio.shield(self.cancel(handle))
+            raise
+
+    async def _wait_for_completion(
+        self,
+        application: str,
+        handle: FalRequestHandle,
+        started: float,
+        on_progress: ProgressCallback | None,
+    ) -> None:
+        """Poll status with backoff until the request completes."""
+        interval = POLL_INTERVAL_SECONDS
+        last_status: tuple[object, object] | None = None
+
+        while True:
+            data = await self.status(handle, with_logs=on_progress is not None)
+            status = data.get("status")
+
+            if on_progress and (status, data.get("queue_position")) != last_status:
+                last_status = (status, data.get("queue_position"))
+                queue_position = data.get("queue_position")
+                logs = data.get("logs")
+                event: FalProgressEvent = {
+                    "request_id": handle["request_id"],
+                    "application": application,
+                    "status": status,  # type: ignore[typeddict-item]
+                    "queue_position": (
+                        queue_position if isinstance(queue_position, int) else None
+                    ),
+                    "logs": logs if isinstance(logs, list) else [],
+                    "elapsed": time.monotonic() - started,
+                }
+                outcome = on_progress(event)
+                if inspect.isawaitable(outcome):
+                    await outcome
+
+            if status == "COMPLETED":
+                if data.get("error"):
+                    raise FalRequestError(
+                        f"FAL request {handle['request_id']} failed: {data['error']}"
+                    )
+                return
+
+            await asyncio.sleep(interval)
+            interval = min(interval * 1.5, MAX_POLL_INTERVAL_SECONDS)
+
+
+_service: FalService | None = None
+
+
+def get_fal_service() -> FalService:
+    """
+    Get the shared FAL service, creating it on first use.
+
+    Returns:
+        FalService configured with the API key and base URLs from settings.
+    """
+    global _service
+    if _service is None:
+        from app.config import settings
+
+        _service = FalService(
+            api_key=settings.fal_key,
+            run_url=settings.fal_run_url,
+            queue_url=settings.fal_queue_url,
+        )
+    return _service
+
+
+async def close_fal_service() -> None:
+    """Close the shared FAL service if it was created."""
+    global _service
+    if _service is not None:
+        await _service.aclose()
+        _service = None
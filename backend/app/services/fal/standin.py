@@ -0,0 +1,258 @@
+"""Local FAL-compatible stand-in server for offline load testing.
+
+Implements the endpoints `FalService` uses: synchronous runs
+(`POST {run_url}/{app}`) and the queue API (submit, status, result,
+cancel under `{queue_url}/{app}`). Latency, failure rates and image
+payload size are configurable and reproducible via a random seed.
+
+Point the backend at it with FAL_RUN_URL=http://host:port/run and
+FAL_QUEUE_URL=http://host:port/queue. See scripts/fal_standin.py.
+"""
+
+import asyncio
+import io
+import math
+import random
+import time
+import uuid
+from typing import Literal, TypedDict
+
+from fastapi import FastAPI, HTTPException, Request, Response
+
+LatencyDistribution = Literal["fixed", "lognormal", "exponential"]
+
+
+class StandInConfig(TypedDict, total=False):
+    """Stand-in behavior. Missing keys use `DEFAULT_CONFIG`."""
+
+    latency_distribution: LatencyDistribution
+    latency_median: float  # Seconds from submit to completion
+    latency_sigma: float  # Lognormal shape; larger means a heavier tail
+    queue_fraction: float  # Share of the latency spent IN_QUEUE
+    failure_rate: float  # Requests that complete with an error
+    throttle_rate: float  # Submissions rejected with 429
+    error_rate: float  # Submissions rejected with 500
+    image_kb: int  # Approximate size of each generated PNG
+    seed: int | None  # Random seed for reproducible runs
+
+
+DEFAULT_CONFIG: StandInConfig = {
+    "latency_distribution": "lognormal",
+    "latency_median": 2.0,
+    "latency_sigma": 0.5,
+    "queue_fraction": 0.3,
+    "failure_rate": 0.0,
+    "throttle_rate": 0.0,
+    "error_rate": 0.0,
+    "image_kb": 256,
+    "seed": None,
+}
+
+
+# Finished jobs whose results are never fetched are dropped after this
+JOB_RETENTION_SECONDS = 300.0
+
+
+class _Job(TypedDict):
+    """A queued stand-in request."""
+
+    application: str
+    arguments: dict[str, object]
+    submitted_at: float
+    started_at: float
+    completed_at: float
+    failed: bool
+    cancelled: bool
+
+
+def sample_latency(config: StandInConfig, rng: random.Random) -> float:
+    """
+    Draw a request latency in seconds.
+
+    Args:
+        config: Stand-in configuration.
+        rng: Random generator.
+
+    Returns:
+        Latency in seconds (never negative).
+    """
+    median = config["latency_median"]
+    distribution = config["latency_distribution"]
+    if distribution == "fixed":
+        return median
+    if distribution == "exponential":
+        return rng.expovariate(math.log(2) / median) if median > 0 else 0.0
+    if median <= 0:
+        return 0.0
+    return rng.lognormvariate(math.log(median), config["latency_sigma"])
+
+
+def render_png(image_kb: int, seed: int = 0) -> bytes:
+    """Render a noise PNG of roughly `image_kb` kilobytes."""
+    from PIL import Image
+
+    # Noise barely compresses, so size is about width * height * 3
+    side = max(64, int(math.sqrt(image_kb * 1024 / 3)))
+    noise = random.Random(seed).randbytes(side * side * 3)
+    buffer = io.BytesIO()
+    Image.frombytes("RGB", (side, side), noise).save(buffer, format="PNG")
+    return buffer.getvalue()
+
+
+def create_standin_app(config: StandInConfig | None = None) -> FastAPI:
+    """
+    Build the stand-in FastAPI app.
+
+    Args:
+        config: Overrides for `DEFAULT_CONFIG`.
+
+    Returns:
+        FastAPI app serving /run, /queue and /images routes.
+    """
+    settings: StandInConfig = {**DEFAULT_CONFIG, **(config or {})}  # type: ignore
+    rng = random.Random(settings["seed"])
+    jobs: dict[str, _Job] = {}
+    image_cache: dict[int, bytes] = {}
+
+    app = FastAPI(title="FAL stand-in")
+
+    def reject_submission() -> None:
+        """Raise a 429 or 500 for a share of submissions."""
+        roll = rng.random()
+        if roll < settings["throttle_rate"]:
+            raise HTTPException(429, "Rate limited by stand-in")
+        if roll < settings["throttle_rate"] + settings["error_rate"]:
+            raise HTTPException(500, "Injected stand-in error")
+
+    def build_result(
+        request: Request, application: str, arguments: dict[str, object]
+    ) -> dict[str, object]:
+        """Build an application result: LLM output or generated images."""
+        if application.startswith("openrouter/"):
+            return {"output": f"Optimized: {arguments.get('prompt', '')}"}
+
+        num_images = arguments.get("num_images", 1)
+        count = num_images if isinstance(num_images, int) and num_images > 0 else 1
+        base_url = str(request.base_url).rstrip("/")
+        return {
+            "images": [
+                {
+                    "url": f"{base_url}/images/{uuid.uuid4().hex}.png",
+                    "content_type": "image/png",
+                }
+                for _ in range(count)
+            ],
+            "seed": arguments.get("seed", rng.randint(0, 2**31 - 1)),
+            "has_nsfw_concepts": [False] * count,
+            "prompt": arguments.get("prompt", ""),
+        }
+
+    def prune_jobs(now: float) -> None:
+        """Forget jobs whose results were never fetched (failed, abandoned)."""
+        expired = [
+            request_id
+            for request_id, job in jobs.items()
+            if now - job["completed_at"] > JOB_RETENTION_SECONDS
+        ]
+        for request_id in expired:
+            del jobs[request_id]
+
+    def get_job(request_id: str) -> _Job:
+        job = jobs.get(request_id)
+        if job is None:
+            raise HTTPException(404, f"Unknown request {request_id}")
+        return job
+
+    @app.post("/run/{application:path}")
+    async def run(application: str, request: Request) -> dict[str, object]:
+        reject_submission()
+        arguments = await request.json()
+        await asyncio.sleep(sample_latency(settings, rng))
+        if rng.random() < settings["failure_rate"]:
+            raise HTTPException(500, "Injected stand-in failure")
+        return build_result(request, application, arguments)
+
+    @app.post("/queue/{application:path}")
+    async def submit(application: str, request: Request) -> dict[str, object]:
+        reject_submission()
+        arguments = await request.json()
+        now = time.monotonic()
+        prune_jobs(now)
+        latency = sample_latency(settings, rng)
+        request_id = uuid.uuid4().hex
+        jobs[request_id] = {
+            "application": application,
+            "arguments": arguments,
+            "submitted_at": now,
+            "started_at": now + latency * settings["queue_fraction"],
+            "completed_at": now + latency,
+            "failed": rng.random() < settings["failure_rate"],
+            "cancelled": False,
+        }
+        base_url = f"{str(request.base_url).rstrip('/')}/queue/{application}"
+        return {
+            "request_id": request_id,
+            "status_url": f"{base_url}/requests/{request_id}/status",
+            "response_url": f"{base_url}/requests/{request_id}",
+            "cancel_url": f"{base_url}/requests/{request_id}/cancel",
+        }
+
+    @app.get("/queue/{application:path}/requests/{request_id}/status")
+    async def status(application: str, request_id: str) -> dict[str, object]:
+        job = get_job(request_id)
+        now = time.monotonic()
+        if job["cancelled"]:
+            return {"status": "COMPLETED", "error": "Request was cancelled"}
+        if now >= job["completed_at"]:
+            payload: dict[str, object] = {"status": "COMPLETED", "logs": []}
+            if job["failed"]:
+                payload["error"] = "Injected stand-in failure"
+            return payload
+        if now < job["started_at"]:
+            ahead = sum(
+                1
+                for other in jobs.values()
+                if other["submitted_at"] < job["submitted_at"]
+                and other["started_at"] > now
+                and not other["cancelled"]
+            )
+            return {"status": "IN_QUEUE", "queue_position": ahead}
+        return {"status": "IN_PROGRESS", "logs": [{"message": "Generating"}]}
+
+    @app.get("/queue/{application:path}/requests/{request_id}")
+    async def result(
+        application: str, request_id: str, request: Request
+    ) -> dict[str, object]:
+        job = get_job(request_id)
+        if job["failed"] or job["cancelled"]:
+            raise HTTPException(422, "Request did not complete successfully")
+        if time.monotonic() < job["completed_at"]:
+            raise HTTPException(400, "Request is still in progress")
+        jobs.pop(request_id, None)
+        return build_result(request, job["application"], job["arguments"])
+
+    @app.put("/queue/{application:path}/requests/{request_id}/cancel")
+    async def cancel(application: str, request_id: str) -> dict[str, object]:
+        job = get_job(request_id)
+        if time.monotonic() >= job["completed_at"]:
+            return {"status": "ALREADY_COMPLETED"}
+        job["cancelled"] = True
+        return {"status": "CANCELLATION_REQUESTED"}
+
+    @app.get("/images/{name}")
+    async def image(name: str) -> Response:
+        image_kb = settings["image_kb"]
+        if image_kb not in image_cache:
+            image_cache[image_kb] = render_png(image_kb)
+        return Response(image_cache[image_kb], media_type="image/png")
+
+    @app.get("/stats")
+    async def stats() -> dict[str, object]:
+        now = time.monotonic()
+        return {
+            "jobs": len(jobs),
+            "in_flight": sum(1 for j in jobs.values() if now < j["completed_at"]),
+            "config": settings,
+        }
+
+    return app
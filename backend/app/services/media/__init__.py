@@ -0,0 +1,20 @@
+"""Media processing service for image derivatives and input images."""
+
+from .derivatives import (
+    DERIVATIVE_SPECS,
+    DERIVATIVE_CONTENT_TYPE,
+    render_derivatives,
+    resolve_duplicate_derivatives,
+)
+from .validation import normalize_input_image
+from .inputs import ImageInputCache, prepare_image_input
+
+__all__ = [
+    "DERIVATIVE_SPECS",
+    "DERIVATIVE_CONTENT_TYPE",
+    "render_derivatives",
+    "resolve_duplicate_derivatives",
+    "normalize_input_image",
+    "ImageInputCache",
+    "prepare_image_input",
+]
@@ -0,0 +1,87 @@
+"""WebP derivative rendering for generated images.
+
+The render functions are CPU-bound and run in the shared process pool,
+so they must stay module-level and only take picklable arguments.
+"""
+
+import io
+
+from PIL import Image
+
+DERIVATIVE_FORMAT = "webp"
+DERIVATIVE_CONTENT_TYPE = "image/webp"
+
+# name -> (max_width, max_height, webp_quality); images are fit inside the box
+DERIVATIVE_SPECS: dict[str, tuple[int, int, int]] = {
+    "thumbnail": (320, 320, 70),
+    "feed": (1080, 1350, 82),
+    "story": (1080, 1920, 82),
+}
+
+
+def render_derivatives(
+    image_bytes: bytes,
+    specs: dict[str, tuple[int, int, int]] | None = None,
+) -> dict[str, bytes]:
+    """
+    Render downscaled WebP derivatives of an image.
+
+    The source is decoded once and each spec is fit inside its box
+    without upscaling. Specs that resolve to the same pixel size as an
+    earlier spec are skipped, so callers should fall back to the
+    earlier derivative (see `resolve_duplicate_derivatives`).
+
+    Args:
+        image_bytes: Encoded source image.
+        specs: Derivative specs, defaults to DERIVATIVE_SPECS.
+
+    Returns:
+        Mapping of derivative name to encoded WebP bytes.
+    """
+    specs = specs or DERIVATIVE_SPECS
+
+    with Image.open(io.BytesIO(image_bytes)) as source:
+        source.load()
+        mode = "RGBA" if source.mode in ("RGBA", "LA", "P") else "RGB"
+        image = source.convert(mode)
+
+    rendered: dict[str, bytes] = {}
+    seen_sizes: set[tuple[int, int]] = set()
+
+    for name, (max_width, max_height, quality) in specs.items():
+        derivative = image.copy()
+        derivative.thumbnail((max_width, max_height), Image.Resampling.LANCZOS)
+        if derivative.size in seen_sizes:
+            continue
+        seen_sizes.add(derivative.size)
+
+        buffer = io.BytesIO()
+        derivative.save(buffer, format=DERIVATIVE_FORMAT, quality=quality, method=4)
+        rendered[name] = buffer.getvalue()
+
+    return rendered
+
+
+def resolve_duplicate_derivatives(
+    urls: dict[str, str],
+    specs: dict[str, tuple[int, int, int]] | None = None,
+) -> dict[str, str]:
+    """
+    Fill in derivatives skipped as duplicates with the preceding one.
+
+    Args:
+        urls: Uploaded derivative URLs keyed by name.
+        specs: Derivative specs used for rendering.
+
+    Returns:
+        URLs for every spec name that could be resolved.
+    """
+    specs = specs or DERIVATIVE_SPECS
+    resolved: dict[str, str] = {}
+    last_url: str | None = None
+    for name in specs:
+        if name in urls:
+            last_url = urls[name]
+        if last_url:
+            resolved[name] = last_url
+    return resolved
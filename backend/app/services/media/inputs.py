@@ -0,0 +1,254 @@
+"""IMAGE_INPUT prefetch: fetch once, validate, downscale, cache and re-host."""
+
+import asyncio
+import hashlib
+import ipaddress
+import json
+import logging
+import socket
+import time
+from pathlib import Path
+
+import httpx
+
+from app.config import settings
+from app.utils.process_pool import run_in_process
+from .validation import normalize_input_image
+
+logger = logging.getLogger(__name__)
+
+# Re-hosted URLs are signed for 14 days; refresh them a day before expiry
+INPUT_CACHE_TTL_SECONDS = 60 * 60 * 24 * 13
+
+# Redirects followed when fetching an input image, each re-checked
+MAX_REDIRECTS = 5
+
+EXTENSIONS: dict[str, str] = {
+    "image/jpeg": "jpg",
+    "image/png": "png",
+    "image/webp": "webp",
+}
+
+
+class ImageInputCache:
+    """
+    Local disk cache of validated input images.
+
+    Each entry is a `{key}.json` metadata file next to the normalized
+    image bytes, so an expired re-hosted URL can be re-signed without
+    fetching the source again.
+    """
+
+    def __init__(self, directory: str | Path) -> None:
+        self.directory = Path(directory)
+
+    def _meta_path(self, key: str) -> Path:
+        return self.directory / f"{key}.json"
+
+    def _data_path(self, key: str) -> Path:
+        return self.directory / f"{key}.bin"
+
+    def get(self, key: str) -> dict[str, object] | None:
+        """Return cached metadata, or None if missing or unreadable."""
+        try:
+            return json.loads(self._meta_path(key).read_text())
+        except (OSError, ValueError):
+            return None
+
+    def get_bytes(self, key: str) -> bytes | None:
+        """Return cached normalized image bytes, if present."""
+        try:
+            return self._data_path(key).read_bytes()
+        except OSError:
+            return None
+
+    def put(self, key: str, data: bytes, meta: dict[str, object]) -> None:
+        """Store image bytes and metadata. Failures are logged, not raised."""
+        try:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            self._data_path(key).write_bytes(data)
+            # Write metadata last so readers never see it without data
+            tmp_path = self._meta_path(key).with_suffix(".tmp")
+            tmp_path.write_text(json.dumps(meta))
+            tmp_path.replace(self._meta_path(key))
+        except OSError:
+            logger.warning("Failed to write image input cache entry %s", key)
+
+
+_cache: ImageInputCache | None = None
+
+
+def get_image_input_cache() -> ImageInputCache:
+    """Get the shared image input cache."""
+    global _cache
+    if _cache is None:
+        _cache = ImageInputCache(settings.image_input_cache_dir)
+    return _cache
+
+
+async def prepare_image_input(
+    image_url: str, user_id: str | None = None
+) -> dict[str, object]:
+    """
+    Fetch, validate and re-host an input image, using the local cache.
+
+    Args:
+        image_url: Source image URL from the node configuration.
+        user_id: Owner of the execution. Without it the image is validated
+            but not re-hosted.
+
+    Returns:
+        Dictionary with 'image_url' (re-hosted when possible),
+        'source_image_url', 'width', 'height', 'content_type' and
+        'cache_hit'.
+
+    Raises:
+        ValueError: If the image cannot be fetched or fails validation.
+    """
+    cache = get_image_input_cache()
+    key = hashlib.sha256(f"{user_id or ''}:{image_url}".encode()).hexdigest()
+
+    meta = cache.get(key)
+    if meta and float(meta.get("expires_at", 0)) > time.time():  # type: ignore
+        return {**meta, "cache_hit": True}
+
+    data = cache.get_bytes(key) if meta else None
+    if data is not None and meta is not None:
+        content_type = str(meta["content_type"])
+        width, height = int(meta["width"]), int(meta["height"])  # type: ignore
+    else:
+        raw = await _fetch_image(image_url, settings.image_input_max_bytes)
+        data, content_type, width, height = await run_in_process(
+            normalize_input_image, raw, settings.image_input_max_dimension
+        )
+
+    hosted_url = image_url
+    if user_id:
+        hosted_url = await _rehost(user_id, data, content_type)
+
+    meta = {
+        "image_url": hosted_url,
+        "source_image_url": image_url,
+        "width": width,
+        "height": height,
+        "content_type": content_type,
+        "expires_at": time.time() + INPUT_CACHE_TTL_SECONDS,
+    }
+    cache.put(key, data, meta)
+    return {**meta, "cache_hit": False}
+
+
+async def _fetch_image(image_url: str, max_bytes: int) -> bytes:
+    """Probe and download an image with a size cap, from public hosts only."""
+    if not image_url.startswith(("http://", "https://")):
+        raise ValueError("Image URL must be an http(s) URL")
+
+    timeout = httpx.Timeout(15.0, connect=5.0)
+    try:
+        async with httpx.AsyncClient(timeout=timeout) as http:
+            # Cheap probe first; servers that reject HEAD are checked on GET
+            head = await _send(http, "HEAD", image_url)
+            await head.aclose()
+            if head.is_success:
+                _check_headers(head.headers, max_bytes)
+
+            response = await _send(http, "GET", image_url)
+            try:
+                response.raise_for_status()
+                _check_headers(response.headers, max_bytes)
+
+                chunks: list[bytes] = []
+                total = 0
+                async for chunk in response.aiter_bytes():
+                    total += len(chunk)
+                    if total > max_bytes:
+                        raise ValueError(
+                            f"Input image exceeds {max_bytes // (1024 * 1024)}MB limit"
+                        )
+                    chunks.append(chunk)
+                return b"".join(chunks)
+            finally:
+                await response.aclose()
+
+    except httpx.HTTPStatusError as e:
+        raise ValueError(
+            f"Input image URL returned {e.response.status_code}: {image_url}"
+        ) from e
+    except httpx.RequestError as e:
+        raise ValueError(f"Input image URL unreachable: {image_url} ({e})") from e
+
+
+async def _send(http: httpx.AsyncClient, method: str, url: str) -> httpx.Response:
+    """
+    Send a streamed request, following redirects by hand.
+
+    Every hop's host is checked first, so a public URL can't redirect the
+    fetch to an internal address.
+
+    Raises:
+        ValueError: If a hop targets a non-public host, or too many redirects.
+    """
+    for _ in range(MAX_REDIRECTS + 1):
+        await _check_public_host(httpx.URL(url))
+        response = await http.send(http.build_request(method, url), stream=True)
+        if not response.is_redirect or response.next_request is None:
+            return response
+        await response.aclose()
+        url = str(response.next_request.url)
+        if not url.startswith(("http://", "https://")):
+            raise ValueError("Input image URL redirected to a non-http(s) URL")
+    raise ValueError("Input image URL redirected too many times")
+
+
+async def _check_public_host(url: httpx.URL) -> None:
+    """
+    Reject hosts resolving to loopback, private, link-local or other
+    non-global addresses (e.g. the cloud metadata endpoint).
+
+    Raises:
+        ValueError: If the host is not public or can't be resolved.
+    """
+    host = url.host
+    try:
+        addresses = [ipaddress.ip_address(host)]
+    except ValueError:
+        try:
+            addresses = [
+                ipaddress.ip_address(address) for address in await _resolve(host)
+            ]
+        except OSError as e:
+            raise ValueError(f"Input image host can't be resolved: {host}") from e
+    if not addresses or not all(address.is_global for address in addresses):
+        raise ValueError(f"Input image host is not a public address: {host}")
+
+
+async def _resolve(host: str) -> list[str]:
+    """All addresses a host name resolves to."""
+    infos = await asyncio.get_running_loop().getaddrinfo(
+        host, None, type=socket.SOCK_STREAM
+    )
+    return [str(info[4][0]) for info in infos]
+
+
+def _check_headers(headers: httpx.Headers, max_bytes: int) -> None:
+    """Reject non-image or oversize responses from their headers."""
+    content_type = headers.get("content-type", "")
+    # Some CDNs serve images as octet-stream; Pillow validates those later
+    if content_type and not content_type.startswith(
+        ("image/", "application/octet-stream")
+    ):
+        raise ValueError(f"Input URL is not an image (content-type {content_type})")
+
+    content_length = headers.get("content-length")
+    if content_length and content_length.isdigit() and int(content_length) > max_bytes:
+        raise ValueError(f"Input image exceeds {max_bytes // (1024 * 1024)}MB limit")
+
+
+async def _rehost(user_id: str, data: bytes, content_type: str) -> str:
+    """Upload normalized bytes to storage under a content-addressed path."""
+    from app.services.supabase import upload_image_bytes
+
+    digest = hashlib.sha256(data).hexdigest()[:32]
+    ext = EXTENSIONS.get(content_type, "png")
+    file_path = f"{user_id}/inputs/{digest}.{ext}"
+    return await upload_image_bytes(file_path, data, content_type)
@@ -0,0 +1,85 @@
+"""Input image validation and downscaling.
+
+`normalize_input_image` is CPU-bound and runs in the shared process pool,
+so it must stay module-level and only take picklable arguments.
+"""
+
+import io
+import warnings
+
+from PIL import Image, UnidentifiedImageError
+
+# Pillow format -> content type accepted by FAL edit models
+SUPPORTED_FORMATS: dict[str, str] = {
+    "JPEG": "image/jpeg",
+    "PNG": "image/png",
+    "WEBP": "image/webp",
+}
+
+MIN_DIMENSION = 64
+
+
+def normalize_input_image(
+    image_bytes: bytes, max_dimension: int
+) -> tuple[bytes, str, int, int]:
+    """
+    Validate an input image and downscale it if oversize.
+
+    Args:
+        image_bytes: Encoded source image.
+        max_dimension: Maximum allowed width or height in pixels.
+
+    Returns:
+        Tuple of (image bytes, content type, width, height). The original
+        bytes are returned unchanged when no downscale is needed.
+
+    Raises:
+        ValueError: If the image is unreadable, unsupported, too small or a
+            decompression bomb.
+    """
+    try:
+        with warnings.catch_warnings():
+            # Pillow only warns between MAX_IMAGE_PIXELS and twice that
+            warnings.simplefilter("error", Image.DecompressionBombWarning)
+            return _normalize(image_bytes, max_dimension)
+    except (Image.DecompressionBombError, Image.DecompressionBombWarning) as e:
+        raise ValueError(f"Input image has too many pixels: {e}") from e
+
+
+def _normalize(image_bytes: bytes, max_dimension: int) -> tuple[bytes, str, int, int]:
+    """`normalize_input_image` without the decompression bomb handling."""
+    try:
+        with Image.open(io.BytesIO(image_bytes)) as image:
+            image_format = image.format or ""
+            if image_format not in SUPPORTED_FORMATS:
+                raise ValueError(
+                    f"Unsupported image format: {image_format or 'unknown'}"
+                )
+
+            width, height = image.size
+            if min(width, height) < MIN_DIMENSION:
+                raise ValueError(
+                    f"Image too small: {width}x{height} "
+                    f"(minimum {MIN_DIMENSION}px per side)"
+                )
+
+            if max(width, height) <= max_dimension:
+                return image_bytes, SUPPORTED_FORMATS[image_format], width, height
+
+            image.load()
+            has_alpha = image.mode in ("RGBA", "LA", "P")
+            resized = image.convert("RGBA" if has_alpha else "RGB")
+    except UnidentifiedImageError as e:
+        raise ValueError("Input is not a readable image") from e
+
+    resized.thumbnail((max_dimension, max_dimension), Image.Resampling.LANCZOS)
+
+    buffer = io.BytesIO()
+    if has_alpha:
+        resized.save(buffer, format="PNG", optimize=True)
+        content_type = "image/png"
+    else:
+        resized.save(buffer, format="JPEG", quality=90)
+        content_type = "image/jpeg"
+
+    return buffer.getvalue(), content_type, resized.size[0], resized.size[1]
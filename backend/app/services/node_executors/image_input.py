@@ -1,13 +1,16 @@
 """Image input node executor."""
 
 from .base import BaseNodeExecutor
+from app.services.media import prepare_image_input
 
 
 class ImageInputExecutor(BaseNodeExecutor):
     """
     Executor for IMAGE_INPUT nodes.
 
-    Outputs an image URL from the node configuration.
+    Outputs an image URL from the node configuration. With 'validate'
+    enabled, the image is fetched once, validated, downscaled if oversize
+    and re-hosted in storage so edit models fetch it from a stable location.
     """
 
     async def execute(
@@ -21,14 +24,22 @@ class ImageInputExecutor(BaseNodeExecutor):
 
         Args:
             inputs: Not used for this node type.
-            config: Must contain 'image_url' key.
-            context: Optional execution context.
+            config: Must contain 'image_url' key. Optional 'validate' flag.
+            context: Optional execution context with 'user_id' for re-hosting.
 
         Returns:
-            Dictionary with 'image_url' key.
+            Dictionary with 'image_url' key, plus image metadata when
+            validated.
+
+        Raises:
+            ValueError: If validation is enabled and the image is invalid.
         """
         image_url = str(config.get("image_url", ""))
-        return {"image_url": image_url}
+        if not config.get("validate") or not image_url:
+            return {"image_url": image_url}
+
+        user_id = (context or {}).get("user_id")
+        return await prepare_image_input(image_url, str(user_id) if user_id else None)
 
     def validate_config(self, config: dict[str, object]) -> bool:
         """
@@ -1,5 +1,7 @@
 from .base import BaseNodeExecutor
+from app.config import settings
 from app.services.fal import generate_images
+from app.services.fal.routing import AUTO_MODEL, choose_model
 from app.services.fal.models import (
     get_edit_model_id,
     get_model_config,
@@ -13,6 +15,7 @@ class ImageModelExecutor(BaseNodeExecutor):
 
         Calls FAL AI to generate images and records the generation.
         Automatically routes to edit models when image input is provided.
+        With model "auto", picks the cheapest model meeting the latency SLO.
     """
 
     async def execute(
@@ -27,7 +30,9 @@ class ImageModelExecutor(BaseNodeExecutor):
         Args:
             inputs: Must contain 'prompt' from connected prompt node.
                     May contain 'image_url' for image-to-image generation.
-            config: Must contain 'model' and optionally 'parameters'.
+            config: Must contain 'model' (a model ID or "auto") and optionally
+                    'parameters' ('latency_slo_seconds' applies to "auto",
+                    'hedge' opts into hedged FAL requests).
             context: Must contain 'execution_id' for recording generation.
 
         Returns:
@@ -59,13 +64,31 @@ class ImageModelExecutor(BaseNodeExecutor):
         parameters["num_images"] = num_images
         parameters["aspect_ratio"] = aspect_ratio
 
+        hedge = bool(parameters.pop("hedge", False))
+        # Routing input only; never part of the FAL payload or cache key
+        slo = parameters.pop("latency_slo_seconds", None)
+
         # Check for image input and route to edit model if available
         image_url = merged.get("image_url")
-        if image_url:
+        routing: dict[str, object] | None = None
+        if model_id == AUTO_MODEL:
+            decision = await choose_model(
+                aspect_ratio=str(aspect_ratio),
+                edit=bool(image_url),
+                latency_slo_seconds=(
+                    float(slo)
+                    if isinstance(slo, (int, float))
+                    else settings.routing_latency_slo_seconds
+                ),
+            )
+            model_id = decision["model_id"]
+            routing = dict(decision)
+        elif image_url:
             edit_model_id = get_edit_model_id(model_id)
             if edit_model_id:
                 model_id = edit_model_id
 
+        if image_url:
             # Dynamically set image parameter based on model config
             model_config = get_model_config(model_id)
             if model_config:
@@ -78,6 +101,7 @@ class ImageModelExecutor(BaseNodeExecutor):
             else:
                 # Fallback to standard
                 parameters["image_url"] = str(image_url)
+
         # We assume generate_images handles these types correctly and returns dict[str, object]
         result = await generate_images(
             model_id=model_id,
@@ -86,18 +110,35 @@ class ImageModelExecutor(BaseNodeExecutor):
                 int(num_images) if not isinstance(num_images, int) else num_images
             ),
             parameters=parameters,
+            hedge=hedge,
         )
 
-        # Upload FAL images to Supabase Storage for persistence
+        # Upload FAL images (plus WebP derivatives) to Supabase Storage
         fal_image_urls = list(result.get("image_urls", []))  # type: ignore
         storage_image_urls = fal_image_urls  # fallback
+        derivatives: list[dict[str, object]] = []
 
         if context and "user_id" in context:
-            from app.services.supabase import upload_images_from_urls
+            from app.services.supabase import upload_generated_images
 
             user_id = str(context["user_id"])
-            storage_image_urls = await upload_images_from_urls(user_id, fal_image_urls)
+            uploaded = await upload_generated_images(user_id, fal_image_urls)
+            storage_image_urls = [str(item["url"]) for item in uploaded]
+            derivatives = [dict(item["derivatives"]) for item in uploaded]  # type: ignore
             result["image_urls"] = storage_image_urls
+            result["derivatives"] = derivatives
+
+        for flag in ("cache_hit", "coalesced"):
+            if result.get(flag):
+                parameters[flag] = True
+        # Recorded with the generation, never sent to FAL
+        if routing:
+            parameters["routing"] = routing
+        if hedge:
+            parameters["hedge"] = True
+        if result.get("fallback_from"):
+            parameters["fallback_from"] = str(result["fallback_from"])
+            model_id = str(result.get("model_id", model_id))
 
         if context and "execution_id" in context:
             execution_id = str(context["execution_id"])
@@ -111,6 +152,7 @@ class ImageModelExecutor(BaseNodeExecutor):
                 image_urls=storage_image_urls,
                 aspect_ratio=str(aspect_ratio),
                 cost=float(result.get("cost", 0.0)),  # type: ignore
+                derivatives=derivatives,
             )
 
         # Return all FAL metadata for inspector visibility
@@ -1,12 +1,10 @@
 """Prompt template node executor."""
 
-import logging
 import re
 
+from app.services.fal.prompts import get_prompt_optimizer
 from .base import BaseNodeExecutor
 
-logger = logging.getLogger(__name__)
-
 
 class PromptExecutor(BaseNodeExecutor):
     """
@@ -40,9 +38,7 @@ class PromptExecutor(BaseNodeExecutor):
 
         # AI Optimization
         if config.get("ai_optimize"):
-            optimized_prompt = await self._optimize_with_ai(prompt)
-            if optimized_prompt:
-                prompt = optimized_prompt
+            prompt = await get_prompt_optimizer().optimize(prompt)
 
         # Build output, pass through image_url if present for image-to-image
         output: dict[str, object] = {"prompt": prompt}
@@ -51,43 +47,6 @@ class PromptExecutor(BaseNodeExecutor):
 
         return output
 
-    async def _optimize_with_ai(self, raw_prompt: str) -> str | None:
-        """Use FAL AI LLM to optimize the prompt for image generation."""
-        import fal_client
-        from app.services.fal.client import _ensure_fal_initialized
-
-        _ensure_fal_initialized()
-
-        system_prompt = (
-            "You are an expert Performance Marketing Creative Strategist. "
-            "Your goal is to write image prompts that generate high-CTR (Click-Through Rate) advertising visuals for social media (Instagram/Facebook/TikTok). "
-            "Transform the input into a crisp, commercial product image description. "
-            "Rules: "
-            "1. The product/subject must be the absolute hero: clear, sharp, and center stage. "
-            "2. Lighting: Use professional commercial lighting (softbox, rim lighting) to make the product pop. "
-            "3. Background: Keep it complementary but not distracting. Avoid clutter. "
-            "4. Aesthetics: Bright, vibrant, and expensive-looking. Think high-end e-commerce or Apple-style minimalism. "
-            "5. NO chatty text, NO '/imagine' commands. Return ONLY the prompt string."
-        )
-
-        try:
-            result = await fal_client.run_async(
-                "openrouter/router",
-                arguments={
-                    "model": "anthropic/claude-haiku-4.5",
-                    "prompt": raw_prompt,
-                    "system_prompt": system_prompt,
-                },
-            )
-
-            if isinstance(result, dict) and "output" in result:
-                return str(result["output"]).strip()
-        except Exception:
-            logger.warning("AI prompt optimization failed", exc_info=True)
-            return None
-
-        return None
-
     def _process_template(self, template: str, variables: dict[str, object]) -> str:
         """
         Replace template variables with actual values.
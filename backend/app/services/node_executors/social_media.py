@@ -1,7 +1,12 @@
 """Social media node executor."""
 
 from .base import BaseNodeExecutor
-from app.services.reddit import fetch_subreddit_posts
+from app.config import settings
+from app.services.reddit import (
+    fetch_multiple_subreddits,
+    fetch_subreddit_posts,
+    get_trend_warmer,
+)
 
 
 class SocialMediaExecutor(BaseNodeExecutor):
@@ -44,10 +49,12 @@ class SocialMediaExecutor(BaseNodeExecutor):
         Fetch data from Reddit.
 
         Args:
-            config: Configuration with subreddit, sort, and limit.
+            config: Configuration with subreddit (or a 'subreddits' list and
+                    optional 'subreddit_weights'), sort, and limit.
 
         Returns:
-            Reddit posts and extracted insights.
+            Reddit posts and extracted insights. With several subreddits,
+            merged insights plus per-subreddit ones under 'by_subreddit'.
         """
         subreddit = str(config.get("subreddit", "all"))
         sort = str(config.get("sort", "hot"))
@@ -56,6 +63,30 @@ class SocialMediaExecutor(BaseNodeExecutor):
         if not isinstance(limit, int):
             limit = 10
 
+        subreddits = config.get("subreddits")
+        if isinstance(subreddits, list) and len(subreddits) > 1:
+            raw_weights = config.get("subreddit_weights")
+            weights = {
+                str(name): float(weight)
+                for name, weight in (
+                    raw_weights.items() if isinstance(raw_weights, dict) else ()
+                )
+                if isinstance(weight, (int, float))
+            }
+            names = [str(name) for name in subreddits]
+            for name in names:
+                await get_trend_warmer().record(name, sort, limit)
+            return await fetch_multiple_subreddits(
+                names,
+                sort,
+                limit,
+                weights=weights,
+                concurrency=settings.reddit_fanout_concurrency,
+            )
+        if isinstance(subreddits, list) and subreddits:
+            subreddit = str(subreddits[0])
+
+        await get_trend_warmer().record(subreddit, sort, limit)
         # We assume fetch_subreddit_posts returns dict[str, object]
         return await fetch_subreddit_posts(subreddit, sort, limit)
 
@@ -71,5 +102,5 @@ class SocialMediaExecutor(BaseNodeExecutor):
         """
         platform = config.get("platform", "reddit")
         if platform == "reddit":
-            return "subreddit" in config
+            return "subreddit" in config or bool(config.get("subreddits"))
         return False
@@ -4,10 +4,25 @@ from .client import fetch_subreddit_posts
 from .analyzer import extract_insights
 from .validator import validate_subreddit
 from .constants import FALLBACK_DATA
+from .cache import RedditCache, get_reddit_cache
+from .fanout import fetch_multiple_subreddits
+from .keywords import KeywordCorpus, get_keyword_corpus
+from .warmer import TrendWarmer, get_trend_warmer
+from .http import RedditRateLimiter, close_reddit_http_client, get_reddit_limiter
 
 __all__ = [
     "fetch_subreddit_posts",
+    "fetch_multiple_subreddits",
     "extract_insights",
     "validate_subreddit",
     "FALLBACK_DATA",
+    "RedditCache",
+    "get_reddit_cache",
+    "KeywordCorpus",
+    "get_keyword_corpus",
+    "TrendWarmer",
+    "get_trend_warmer",
+    "RedditRateLimiter",
+    "get_reddit_limiter",
+    "close_reddit_http_client",
 ]
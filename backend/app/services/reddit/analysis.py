@@ -0,0 +1,72 @@
+"""Where Reddit insight analysis runs.
+
+Tokenizing and scoring titles is CPU-bound. Small samples (a page or a
+default 10-post listing) are analyzed inline. Bigger ones, such as a
+cached 1000-post listing or a multi-subreddit merge, are analyzed in the
+shared process pool so other requests keep a responsive event loop.
+Workers only receive the fields the analyzer reads and send back the
+accumulated scores (not the posts). Keyword ranking against the TF-IDF
+corpus stays in this process, where the corpus lives.
+"""
+
+import logging
+
+from app.utils.metrics import get_metrics
+from app.utils.process_pool import run_in_process
+
+from .analyzer import InsightAccumulator
+
+logger = logging.getLogger(__name__)
+
+# Post fields the analyzer reads
+ANALYSIS_FIELDS = ("title", "score", "num_comments")
+
+
+async def accumulate_posts(
+    posts: list[dict[str, object]], max_posts: int | None = None
+) -> InsightAccumulator:
+    """
+    Analyze posts inline or in the process pool, depending on their count.
+
+    Args:
+        posts: Posts in listing order.
+        max_posts: Posts beyond this many are ignored (None for no cap).
+
+    Returns:
+        Accumulator holding the posts, ready for `insights()`.
+    """
+    from app.config import settings
+
+    sample = posts if max_posts is None else posts[: max(0, max_posts)]
+    if (
+        settings.reddit_analysis_backend != "process"
+        or len(sample) < settings.reddit_analysis_process_min_posts
+    ):
+        accumulator = InsightAccumulator(max_posts)
+        accumulator.add(sample)
+        return accumulator
+
+    slim = [{field: post.get(field) for field in ANALYSIS_FIELDS} for post in sample]
+    try:
+        accumulator = await run_in_process(_accumulate, slim)
+    except Exception:
+        logger.warning("Process pool analysis failed, analyzing inline", exc_info=True)
+        get_metrics().increment("reddit_analysis.inline_fallback")
+        accumulator = InsightAccumulator(max_posts)
+        accumulator.add(sample)
+        return accumulator
+
+    get_metrics().increment("reddit_analysis.process")
+    accumulator.max_posts = max_posts
+    accumulator.posts = list(sample)
+    return accumulator
+
+
+def _accumulate(posts: list[dict[str, object]]) -> InsightAccumulator:
+    """Worker entry point: accumulate posts and drop what isn't sent back."""
+    accumulator = InsightAccumulator()
+    accumulator.add(posts)
+    # The caller already has the posts; the token cache is rebuilt on demand
+    accumulator.posts = []
+    accumulator._vocabulary = {}
+    return accumulator
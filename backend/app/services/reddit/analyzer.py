@@ -1,12 +1,38 @@
-"""Reddit post analysis and insight extraction."""
+"""Reddit post analysis and insight extraction.
+
+Built for large (paginated, multi-subreddit) samples: noise patterns are
+one precompiled alternation, titles are tokenized by a single regex pass,
+keyword weights accumulate in a Counter and only the top keywords are
+selected (heap-based `most_common`), never a full sort. With a
+`KeywordCorpus`, words and bigrams are ranked by TF-IDF across subreddits
+instead of raw weighted frequency.
+"""
 
 import re
+from collections import Counter
 
 from .constants import FALLBACK_DATA, NOISE_PATTERNS, STOP_WORDS, VIBE_MAPPINGS
+from .keywords import KeywordCorpus
+
+# Any noise pattern, in one search
+NOISE_RE = re.compile("|".join(f"(?:{pattern})" for pattern in NOISE_PATTERNS), re.I)
+
+# Leading [tags], e.g. "[Discussion] ..."
+TAG_RE = re.compile(r"^\[.*?\]\s*")
+
+# Words (hyphens allowed inside, not at the ends)
+WORD_RE = re.compile(r"\w(?:[\w-]*\w)?")
+
+WHITESPACE_RE = re.compile(r"\s+")
+
+# Bigrams seen fewer times than this in a sample are not keywords
+MIN_BIGRAM_COUNT = 2
 
 
 def extract_insights(
-    posts: list[dict[str, object]], subreddit: str
+    posts: list[dict[str, object]],
+    subreddit: str,
+    corpus: KeywordCorpus | None = None,
 ) -> dict[str, object]:
     """
     Extract meaningful insights from Reddit posts.
@@ -14,107 +40,171 @@ def extract_insights(
     Args:
         posts: List of post dictionaries.
         subreddit: Subreddit name for context.
+        corpus: Cross-subreddit statistics for TF-IDF keywords, if any.
 
     Returns:
         Rich insights dictionary.
     """
-    if not posts:
-        return dict(FALLBACK_DATA)
-
-    # Filter out noise posts (mod threads, daily questions, etc.)
-    quality_posts = _filter_quality_posts(posts)
-
-    # Get top post by engagement (score + comments)
-    top_post = _get_top_post(quality_posts or posts)
-
-    # Extract meaningful keywords
-    keywords = _extract_keywords(quality_posts or posts)
-
-    # Generate community vibe description
-    community_vibe = _analyze_community_vibe(keywords, subreddit)
+    accumulator = InsightAccumulator()
+    accumulator.add(posts)
+    return accumulator.insights(subreddit, corpus)
 
-    return {
-        "posts": posts,
-        "top_post": top_post,
-        "keywords": keywords,
-        "community_vibe": community_vibe,
-        "fallback": False,
-    }
 
+class InsightAccumulator:
+    """
+    Builds insights page by page, as posts arrive.
 
-def _filter_quality_posts(posts: list[dict[str, object]]) -> list[dict[str, object]]:
-    """Filter out mod threads, daily questions, and other noise."""
-    quality = []
-    for post in posts:
-        title = str(post.get("title", "")).lower()
-        is_noise = any(re.search(pattern, title, re.I) for pattern in NOISE_PATTERNS)
-        score = post.get("score", 0)
-        if not is_noise and isinstance(score, (int, float)) and score > 0:
-            quality.append(post)
-    return quality
-
-
-def _safe_float(value: object, default: float = 0.0) -> float:
-    """Safely convert a value to float."""
-    if isinstance(value, (int, float)):
-        return float(value)
-    return default
-
-
-def _get_top_post(posts: list[dict[str, object]]) -> str:
-    """Get the most engaging post title, preferring positive content."""
-    if not posts:
-        return str(FALLBACK_DATA["top_post"])
-
-    def quality_score(p: dict[str, object]) -> float:
-        score = _safe_float(p.get("score", 0))
-        comments = _safe_float(p.get("num_comments", 0))
-        # Penalize posts with low score but high comments (controversial)
-        if score < 50 and comments > 50:
-            return score * 0.5
-        return score + (comments * 0.3)
-
-    sorted_posts = sorted(posts, key=quality_score, reverse=True)
-    top_title = str(sorted_posts[0].get("title", ""))
-
-    # Clean up the title
-    cleaned = re.sub(r"^\[.*?\]\s*", "", top_title)  # Remove [tags]
-    cleaned = re.sub(r"\s+", " ", cleaned).strip()
+    Keeps running keyword scores and the best top-post candidate instead of
+    re-scanning every post at the end. Results match `extract_insights` on
+    the same posts in the same order.
+    """
 
+    def __init__(self, max_posts: int | None = None, max_keywords: int = 8) -> None:
+        """
+        Initialize an empty accumulator.
+
+        Args:
+            max_posts: Posts beyond this many are ignored (None for no cap).
+            max_keywords: Number of keywords in the insights.
+        """
+        self.max_posts = max_posts
+        self.max_keywords = max_keywords
+        self.posts: list[dict[str, object]] = []
+        # Quality posts drive insights; noise is only used if nothing passes
+        self._top: dict[bool, tuple[float, str]] = {}
+        self._word_scores: dict[bool, Counter[str]] = {
+            True: Counter(),
+            False: Counter(),
+        }
+        # Adjacent keyword pairs, e.g. "latte art": weights and occurrences
+        self._bigram_scores: dict[bool, Counter[str]] = {
+            True: Counter(),
+            False: Counter(),
+        }
+        self._bigram_counts: dict[bool, Counter[str]] = {
+            True: Counter(),
+            False: Counter(),
+        }
+        # Raw token -> keyword ("" if rejected); titles repeat a small vocabulary
+        self._vocabulary: dict[str, str] = {}
+
+    def add(self, posts: list[dict[str, object]]) -> None:
+        """
+        Fold a page of posts into the running insights.
+
+        Args:
+            posts: Posts in listing order.
+        """
+        if self.max_posts is not None:
+            posts = posts[: max(0, self.max_posts - len(self.posts))]
+        self.posts.extend(posts)
+
+        top = self._top
+        word_scores = self._word_scores
+        bigram_scores = self._bigram_scores
+        bigram_counts = self._bigram_counts
+        vocabulary = self._vocabulary
+        for post in posts:
+            title = str(post.get("title", ""))
+            raw_score = post.get("score")
+            numeric = isinstance(raw_score, (int, float))
+            score = float(raw_score) if numeric else 0.0  # type: ignore[arg-type]
+            quality = numeric and score > 0 and NOISE_RE.search(title) is None
+            if not quality and True in top:
+                continue  # Noise no longer matters once a quality post exists
+
+            comments = post.get("num_comments", 0)
+            comments = float(comments) if isinstance(comments, (int, float)) else 0.0
+            # Penalize posts with low score but high comments (controversial)
+            if score < 50 and comments > 50:
+                engagement = score * 0.5
+            else:
+                engagement = score + comments * 0.3
+            # Strictly greater keeps the first of equally engaging posts
+            if quality not in top or engagement > top[quality][0]:
+                top[quality] = (engagement, title)
+
+            weight = 1 + (score if numeric else 1.0) * 0.1
+            scores = word_scores[quality]
+            pair_scores = bigram_scores[quality]
+            pair_counts = bigram_counts[quality]
+            if title[:1] == "[":
+                title = TAG_RE.sub("", title, count=1)
+            previous = ""
+            for token in WORD_RE.findall(title):
+                word = vocabulary.get(token)
+                if word is None:
+                    word = vocabulary[token] = _keyword(token)
+                if word:
+                    scores[word] += weight
+                    if previous:
+                        pair = f"{previous} {word}"
+                        pair_scores[pair] += weight
+                        pair_counts[pair] += 1
+                previous = word
+
+    def term_weights(self) -> Counter[str]:
+        """
+        Weighted frequencies of the sample's keywords and repeated bigrams.
+
+        Returns:
+            Term weights from quality posts (all posts if none passed).
+        """
+        group = True in self._top
+        weights = Counter(self._word_scores[group])
+        pair_scores = self._bigram_scores[group]
+        for pair, count in self._bigram_counts[group].items():
+            if count >= MIN_BIGRAM_COUNT:
+                weights[pair] = pair_scores[pair]
+        return weights
+
+    def insights(
+        self, subreddit: str, corpus: KeywordCorpus | None = None
+    ) -> dict[str, object]:
+        """
+        Build the insights for the posts added so far.
+
+        Args:
+            subreddit: Subreddit name for context.
+            corpus: Cross-subreddit statistics for TF-IDF keywords, if any.
+
+        Returns:
+            Rich insights dictionary (static fallback if no posts were added).
+        """
+        if not self.posts:
+            return dict(FALLBACK_DATA)
+
+        group = True in self._top
+        top_post = _clean_title(self._top[group][1])
+        if corpus is not None:
+            keywords = corpus.rank(self.term_weights(), self.max_keywords)
+        else:
+            keywords = [
+                word
+                for word, _ in self._word_scores[group].most_common(self.max_keywords)
+            ]
+
+        return {
+            "posts": self.posts,
+            "top_post": top_post,
+            "keywords": keywords,
+            "community_vibe": _analyze_community_vibe(keywords, subreddit),
+            "fallback": False,
+        }
+
+
+def _clean_title(title: str) -> str:
+    """Strip [tags] and extra whitespace from the top post title."""
+    cleaned = WHITESPACE_RE.sub(" ", TAG_RE.sub("", title, count=1)).strip()
     return cleaned if cleaned else str(FALLBACK_DATA["top_post"])
 
 
-def _extract_keywords(
-    posts: list[dict[str, object]], max_keywords: int = 8
-) -> list[str]:
-    """Extract meaningful keywords from post titles."""
-    word_scores: dict[str, float] = {}
-
-    for post in posts:
-        title = str(post.get("title", ""))
-        raw_score = post.get("score", 1)
-        score = _safe_float(raw_score, 1.0)
-
-        # Clean title
-        title = re.sub(r"^\[.*?\]\s*", "", title)  # Remove [tags]
-        title = re.sub(r"[^\w\s-]", " ", title)  # Keep words and hyphens
-
-        words = title.lower().split()
-
-        for word in words:
-            cleaned = word.strip("-")
-            if (
-                cleaned
-                and len(cleaned) > 2
-                and cleaned not in STOP_WORDS
-                and not cleaned.isdigit()
-            ):
-                # Weight by post score
-                word_scores[cleaned] = word_scores.get(cleaned, 0) + (1 + score * 0.1)
-
-    # Sort by score and return top keywords
-    sorted_words = sorted(word_scores.items(), key=lambda x: x[1], reverse=True)
-    return [word for word, _ in sorted_words[:max_keywords]]
+def _keyword(token: str) -> str:
+    """Lowercased keyword for a title token, or "" if it carries no meaning."""
+    word = token.lower()
+    if len(word) > 2 and word not in STOP_WORDS and not word.isdigit():
+        return word
+    return ""
 
 
 def _analyze_community_vibe(keywords: list[str], subreddit: str) -> str:
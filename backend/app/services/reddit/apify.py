@@ -0,0 +1,152 @@
+"""Async Apify Reddit Scraper integration.
+
+Starts the actor with `ApifyClientAsync`, waits for the run with a
+timeout and streams dataset items, stopping once `limit` posts are read.
+Runs are bounded by a dedicated semaphore rather than the default thread
+pool. A run that times out or whose fetch is cancelled (e.g. a hedge
+that lost to Reddit) is aborted so it stops costing money.
+"""
+
+import asyncio
+import logging
+
+from apify_client import ApifyClientAsync
+
+from app.utils.metrics import get_metrics
+
+logger = logging.getLogger(__name__)
+
+# Apify Reddit Scraper Actor ID (use ID instead of slug for reliability)
+APIFY_ACTOR_ID = "TwqHBuZZPHJxiQrTU"
+
+APIFY_SORTS = ("relevance", "hot", "top", "new", "comments", "rising")
+
+_client: ApifyClientAsync | None = None
+_semaphore: asyncio.Semaphore | None = None
+_aborts: set[asyncio.Task[None]] = set()
+
+
+def _field(run: object, key: str, attribute: str) -> object:
+    """Read a run field from a dict (older clients) or a model (newer)."""
+    if isinstance(run, dict):
+        return run.get(key)
+    return getattr(run, attribute, None)
+
+
+def get_apify_client() -> ApifyClientAsync:
+    """
+    Get the shared async Apify client, creating it on first use.
+
+    Returns:
+        ApifyClientAsync authenticated with the configured API key.
+    """
+    global _client
+    if _client is None:
+        from app.config import settings
+
+        _client = ApifyClientAsync(settings.apify_api_key)
+    return _client
+
+
+def _get_semaphore() -> asyncio.Semaphore:
+    """Get the semaphore bounding concurrent actor runs in this process."""
+    global _semaphore
+    if _semaphore is None:
+        from app.config import settings
+
+        _semaphore = asyncio.Semaphore(settings.apify_max_concurrency)
+    return _semaphore
+
+
+def _abort_in_background(client: ApifyClientAsync, run_id: str) -> None:
+    """Abort a run without making the (possibly cancelled) caller wait."""
+
+    async def abort() -> None:
+        try:
+            await client.run(run_id).abort()
+            get_metrics().increment("apify.aborted")
+        except Exception:
+            logger.warning("Failed to abort Apify run %s", run_id, exc_info=True)
+
+    task = asyncio.ensure_future(abort())
+    _aborts.add(task)
+    task.add_done_callback(_aborts.discard)
+
+
+async def fetch_from_apify(
+    subreddit: str, sort: str, limit: int
+) -> list[dict[str, object]]:
+    """
+    Fetch posts with the Apify Reddit Scraper.
+
+    Args:
+        subreddit: Validated subreddit name.
+        sort: Sort order (mapped to Apify's subredditSort).
+        limit: Number of posts wanted.
+
+    Returns:
+        Up to `limit` posts, or [] if the run failed or timed out.
+
+    Raises:
+        asyncio.CancelledError: If cancelled; the run is aborted.
+    """
+    from app.config import settings
+
+    metrics = get_metrics()
+    run_input = {
+        "subredditName": subreddit,
+        "subredditSort": sort if sort in APIFY_SORTS else "hot",
+        "subredditTimeframe": "week",
+        "maxPosts": max(limit, 10),  # Apify requires minimum 10
+        "scrapeComments": False,
+        "includeNsfw": False,
+    }
+
+    async with _get_semaphore():
+        client = get_apify_client()
+        run_id: str | None = None
+        try:
+            run = await client.actor(APIFY_ACTOR_ID).start(run_input=run_input)
+            run_id = str(_field(run, "id", "id"))
+            metrics.increment("apify.runs")
+
+            async with asyncio.timeout(settings.apify_run_timeout_seconds):
+                run = await client.run(run_id).wait_for_finish()
+
+            status = _field(run, "status", "status")
+            dataset_id = _field(run, "defaultDatasetId", "default_dataset_id")
+            if status != "SUCCEEDED" or not dataset_id:
+                metrics.increment("apify.failures")
+                logger.warning("Apify run %s for r/%s: %s", run_id, subreddit, status)
+                return []
+
+            posts: list[dict[str, object]] = []
+            # Items arrive in pages; stop reading once we have enough posts
+            async for item in client.dataset(str(dataset_id)).iterate_items():
+                if isinstance(item, dict) and item.get("kind") == "post":
+                    posts.append(
+                        {
+                            "title": item.get("title", ""),
+                            "score": item.get("score", 0),
+                            "url": item.get("url", ""),
+                            "num_comments": item.get("num_comments", 0),
+                        }
+                    )
+                    if len(posts) >= limit:
+                        break
+            return posts
+
+        except asyncio.CancelledError:
+            if run_id:
+                _abort_in_background(client, run_id)
+            raise
+        except TimeoutError:
+            metrics.increment("apify.timeouts")
+            logger.warning("Apify run %s for r/%s timed out", run_id, subreddit)
+            if run_id:
+                _abort_in_background(client, run_id)
+            return []
+        except Exception as exc:
+            metrics.increment("apify.failures")
+            logger.warning("Apify fetch failed for r/%s: %s", subreddit, exc)
+            return []
@@ -0,0 +1,281 @@
+"""Stale-while-revalidate cache for subreddit posts.
+
+Raw posts are cached per (subreddit, sort, limit bucket) so nearby limits
+share one fetch; insights are computed per request from the first `limit`
+posts. Stale entries are served immediately while one background refresh
+per key runs. Empty (fallback) results are cached briefly and never
+replace real posts that are still within their stale window.
+"""
+
+import asyncio
+import logging
+import time
+from typing import Awaitable, Callable, TypedDict
+
+from app.utils.cache import CacheBackend, create_cache_backend
+from app.utils.metrics import get_metrics
+from app.utils.singleflight import SingleFlight
+
+logger = logging.getLogger(__name__)
+
+# Requests are rounded up to one of these limits (above 100 means paginating)
+LIMIT_BUCKETS = (10, 25, 50, 100, 250, 500, 1000)
+
+Posts = list[dict[str, object]]
+PostFetcher = Callable[[str, str, int], Awaitable[Posts]]
+
+
+class CachedPosts(TypedDict):
+    """A cache entry: raw posts and when they were fetched (epoch seconds)."""
+
+    posts: Posts
+    fetched_at: float
+
+
+def _head(entry: CachedPosts, limit: int) -> CachedPosts:
+    """An entry trimmed to its first `limit` posts."""
+    return {"posts": entry["posts"][:limit], "fetched_at": entry["fetched_at"]}
+
+
+def limit_bucket(limit: int) -> int:
+    """Round a post limit up to its cache bucket."""
+    for bucket in LIMIT_BUCKETS:
+        if limit <= bucket:
+            return bucket
+    return LIMIT_BUCKETS[-1]
+
+
+def make_posts_key(subreddit: str, sort: str, limit: int) -> str:
+    """Build the cache key for a (subreddit, sort, limit bucket) listing."""
+    return f"reddit:{subreddit.lower()}:{sort}:{limit_bucket(limit)}"
+
+
+class RedditCache:
+    """TTL cache for subreddit posts with stale-while-revalidate."""
+
+    def __init__(
+        self,
+        backend: CacheBackend | None,
+        ttl: float,
+        stale_ttl: float,
+        negative_ttl: float,
+        clock: Callable[[], float] = time.time,
+    ) -> None:
+        """
+        Initialize the cache.
+
+        Args:
+            backend: Cache backend, or None to disable caching.
+            ttl: Seconds an entry is fresh.
+            stale_ttl: Seconds after fetching that an entry may still be
+                served (while refreshing). Also the backend expiry.
+            negative_ttl: Seconds an empty (fallback) result is cached.
+            clock: Wall clock; entries may be shared between processes.
+        """
+        self.backend = backend
+        self.ttl = ttl
+        self.stale_ttl = max(stale_ttl, ttl)
+        self.negative_ttl = negative_ttl
+        self.clock = clock
+        self._flight: SingleFlight[CachedPosts] = SingleFlight()
+        self._refreshes: set[asyncio.Task[None]] = set()
+
+    async def get_posts(
+        self, subreddit: str, sort: str, limit: int, fetch: PostFetcher
+    ) -> Posts:
+        """
+        Return up to `limit` posts, from cache when possible.
+
+        Args:
+            subreddit: Validated subreddit name.
+            sort: Sort order.
+            limit: Number of posts wanted.
+            fetch: Upstream fetcher called with (subreddit, sort, bucket).
+
+        Returns:
+            Posts (empty if every source failed).
+        """
+        return (await self.get_listing(subreddit, sort, limit, fetch))["posts"]
+
+    async def get_listing(
+        self,
+        subreddit: str,
+        sort: str,
+        limit: int,
+        fetch: PostFetcher,
+        refresh_fetch: PostFetcher | None = None,
+    ) -> CachedPosts:
+        """
+        Like `get_posts`, but also return when the posts were fetched.
+
+        Args:
+            subreddit: Validated subreddit name.
+            sort: Sort order.
+            limit: Number of posts wanted.
+            fetch: Upstream fetcher called with (subreddit, sort, bucket).
+            refresh_fetch: Fetcher for background refreshes after a stale
+                hit, which no caller waits for (defaults to `fetch`).
+
+        Returns:
+            Up to `limit` posts and their fetch time (the version of the data).
+        """
+        if self.backend is None:
+            posts = await fetch(subreddit, sort, limit)
+            return {"posts": posts, "fetched_at": self.clock()}
+
+        metrics = get_metrics()
+        key = make_posts_key(subreddit, sort, limit)
+        entry = await self._cache_get(key)
+
+        if entry is not None:
+            age = self.clock() - entry["fetched_at"]
+            ttl = self.ttl if entry["posts"] else self.negative_ttl
+            if age < ttl:
+                metrics.increment("reddit_cache.hits")
+                return _head(entry, limit)
+            if entry["posts"] and age < self.stale_ttl:
+                metrics.increment("reddit_cache.stale_hits")
+                self._refresh_in_background(
+                    key, subreddit, sort, limit, refresh_fetch or fetch
+                )
+                return _head(entry, limit)
+
+        metrics.increment("reddit_cache.misses")
+        entry, _ = await self._flight.do(
+            key, lambda: self._refresh(key, subreddit, sort, limit, fetch)
+        )
+        return _head(entry, limit)
+
+    async def expires_within(
+        self, subreddit: str, sort: str, limit: int, seconds: float
+    ) -> bool:
+        """
+        Whether a listing is uncached or stops being fresh within `seconds`.
+
+        Args:
+            subreddit: Validated subreddit name.
+            sort: Sort order.
+            limit: Number of posts wanted.
+            seconds: Horizon to look ahead.
+
+        Returns:
+            True if the listing should be refreshed (False if caching is off).
+        """
+        if self.backend is None:
+            return False
+        entry = await self._cache_get(make_posts_key(subreddit, sort, limit))
+        if entry is None:
+            return True
+        ttl = self.ttl if entry["posts"] else self.negative_ttl
+        return self.clock() - entry["fetched_at"] + seconds >= ttl
+
+    async def refresh(
+        self, subreddit: str, sort: str, limit: int, fetch: PostFetcher
+    ) -> Posts:
+        """
+        Fetch a listing into the cache now, sharing any refresh in flight.
+
+        Args:
+            subreddit: Validated subreddit name.
+            sort: Sort order.
+            limit: Number of posts wanted (the whole bucket is fetched).
+            fetch: Upstream fetcher called with (subreddit, sort, bucket).
+
+        Returns:
+            The cached posts (empty if the fetch failed and none were kept).
+        """
+        key = make_posts_key(subreddit, sort, limit)
+        entry, _ = await self._flight.do(
+            key, lambda: self._refresh(key, subreddit, sort, limit, fetch)
+        )
+        return entry["posts"]
+
+    def _refresh_in_background(
+        self, key: str, subreddit: str, sort: str, limit: int, fetch: PostFetcher
+    ) -> None:
+        """Start a refresh that callers don't wait for."""
+
+        async def run() -> None:
+            try:
+                await self._flight.do(
+                    key, lambda: self._refresh(key, subreddit, sort, limit, fetch)
+                )
+            except Exception:
+                get_metrics().increment("reddit_cache.refresh_failures")
+                logger.warning("Reddit cache refresh failed for %s", key, exc_info=True)
+
+        task = asyncio.ensure_future(run())
+        # Keep a reference so the task isn't garbage collected mid-flight
+        self._refreshes.add(task)
+        task.add_done_callback(self._refreshes.discard)
+
+    async def _refresh(
+        self, key: str, subreddit: str, sort: str, limit: int, fetch: PostFetcher
+    ) -> CachedPosts:
+        """Fetch a full bucket and store it, keeping real posts over fallbacks."""
+        get_metrics().increment("reddit_cache.refreshes")
+        posts = await fetch(subreddit, sort, limit_bucket(limit))
+        now = self.clock()
+
+        if not posts:
+            previous = await self._cache_get(key)
+            if previous and previous["posts"]:
+                if now - previous["fetched_at"] < self.stale_ttl:
+                    # Upstream is failing: keep serving the real (stale) posts
+                    return previous
+            empty: CachedPosts = {"posts": [], "fetched_at": now}
+            await self._cache_set(key, empty, self.negative_ttl)
+            return empty
+
+        entry: CachedPosts = {"posts": posts, "fetched_at": now}
+        await self._cache_set(key, entry, self.stale_ttl)
+        return entry
+
+    async def _cache_get(self, key: str) -> CachedPosts | None:
+        """Read a cache entry. Errors count as misses."""
+        try:
+            value = await self.backend.get(key)  # type: ignore[union-attr]
+        except Exception:
+            logger.warning("Reddit cache read failed", exc_info=True)
+            return None
+        if (
+            isinstance(value, dict)
+            and isinstance(value.get("posts"), list)
+            and isinstance(value.get("fetched_at"), (int, float))
+        ):
+            return value  # type: ignore[return-value]
+        return None
+
+    async def _cache_set(self, key: str, entry: CachedPosts, ttl: float) -> None:
+        """Write a cache entry. Errors are logged, not raised."""
+        try:
+            await self.backend.set(key, entry, ttl)  # type: ignore[union-attr]
+        except Exception:
+            logger.warning("Reddit cache write failed", exc_info=True)
+
+
+_cache: RedditCache | None = None
+
+
+def get_reddit_cache() -> RedditCache:
+    """
+    Get the shared Reddit cache configured from settings.
+
+    Returns:
+        RedditCache with the configured backend and TTLs.
+    """
+    global _cache
+    if _cache is None:
+        from app.config import settings
+
+        _cache = RedditCache(
+            create_cache_backend(
+                settings.reddit_cache_backend,
+                settings.reddit_cache_path,
+                table="reddit_posts",
+            ),
+            ttl=settings.reddit_cache_ttl_seconds,
+            stale_ttl=settings.reddit_cache_stale_seconds,
+            negative_ttl=settings.reddit_cache_negative_ttl_seconds,
+        )
+    return _cache
@@ -1,47 +1,38 @@
 """Reddit HTTP client for fetching subreddit posts."""
 
+import asyncio
 import logging
-import random
+import math
+from typing import Callable
 from urllib.parse import quote
 
 import httpx
 
 from app.config import settings
+from .analysis import accumulate_posts
+from .analyzer import InsightAccumulator
+from .apify import fetch_from_apify
+from .cache import get_reddit_cache
 from .constants import FALLBACK_DATA
+from .hedging import fetch_hedged, get_source_stats, hedge_delay
+from .http import (
+    RedditRateLimitedError,
+    get_reddit_http_client,
+    get_reddit_limiter,
+)
+from .keywords import get_keyword_corpus
 from .validator import validate_subreddit
-from .analyzer import extract_insights
 
 logger = logging.getLogger(__name__)
 
 # Using standard reddit.com for primary API access
 REDDIT_BASE_URL = "https://www.reddit.com"
 
-# Apify Reddit Scraper Actor ID (use ID instead of slug for reliability)
-APIFY_ACTOR_ID = "TwqHBuZZPHJxiQrTU"
-
-# Rotate user agents to avoid fingerprinting
-USER_AGENTS = [
-    "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36",
-    "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36",
-    "Mozilla/5.0 (Windows NT 10.0; Win64; x64; rv:121.0) Gecko/20100101 Firefox/121.0",
-]
-
-
-def _get_headers() -> dict[str, str]:
-    """Get randomized headers to avoid fingerprinting."""
-    return {
-        "User-Agent": random.choice(USER_AGENTS),
-        "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,image/avif,image/webp,*/*;q=0.8",
-        "Accept-Language": "en-US,en;q=0.5",
-        "Accept-Encoding": "gzip, deflate, br",
-        "DNT": "1",
-        "Connection": "keep-alive",
-        "Upgrade-Insecure-Requests": "1",
-        "Sec-Fetch-Dest": "document",
-        "Sec-Fetch-Mode": "navigate",
-        "Sec-Fetch-Site": "none",
-        "Sec-Fetch-User": "?1",
-    }
+# Most posts Reddit returns per listing request
+REDDIT_PAGE_SIZE = 100
+
+Posts = list[dict[str, object]]
+PageCallback = Callable[[Posts], None]
 
 
 async def fetch_subreddit_posts(
@@ -52,7 +43,11 @@ async def fetch_subreddit_posts(
     """
     Fetch posts from a subreddit and extract meaningful insights.
 
-    Tries Reddit API first, falls back to Apify, then static data.
+    Tries Reddit API first, hedged with Apify if Reddit is slow or fails,
+    then falls back to static data. Posts are served from the Reddit cache
+    when fresh (or stale while a refresh runs). Limits above one Reddit
+    page are paginated, with insights built as pages arrive. Keywords are
+    ranked by TF-IDF against every subreddit fetched so far.
 
     Args:
         subreddit: Name of the subreddit.
@@ -60,7 +55,8 @@ async def fetch_subreddit_posts(
         limit: Number of posts to fetch.
 
     Returns:
-        Dictionary with posts, keywords, top_post, and community insights.
+        Dictionary with posts, keywords, top_post, and community insights,
+        plus 'fetched_at' (epoch seconds) unless it is the static fallback.
     """
     # Validate and sanitize subreddit name
     try:
@@ -68,38 +64,117 @@ async def fetch_subreddit_posts(
     except ValueError:
         return dict(FALLBACK_DATA)
 
-    # Try Reddit direct API first
-    posts = await _fetch_from_reddit(validated_subreddit, sort, limit)
+    accumulator = InsightAccumulator(max_posts=limit)
+
+    async def fetch(name: str, sort_order: str, count: int) -> Posts:
+        return await _fetch_posts(name, sort_order, count, on_page=accumulator.add)
 
-    # Fallback to Apify if Reddit fails
-    if not posts and settings.apify_api_key:
-        posts = await _fetch_from_apify(validated_subreddit, sort, limit)
+    # Background refreshes outlive this request, so they skip its analysis
+    listing = await get_reddit_cache().get_listing(
+        validated_subreddit, sort, limit, fetch, refresh_fetch=_fetch_posts
+    )
+    posts = listing["posts"]
 
     # Return insights or static fallback
-    if posts:
-        return extract_insights(posts, validated_subreddit)
-    return dict(FALLBACK_DATA)
+    if not posts:
+        return dict(FALLBACK_DATA)
+    if posts != accumulator.posts:
+        # Analyzed while paginating unless served from cache or by Apify
+        accumulator = await accumulate_posts(posts)
 
+    corpus = get_keyword_corpus()
+    await corpus.load()
+    await corpus.add_document(validated_subreddit, accumulator.term_weights())
+    insights = accumulator.insights(validated_subreddit, corpus)
+    insights["fetched_at"] = listing["fetched_at"]
+    return insights
 
-async def _fetch_from_reddit(
-    subreddit: str, sort: str, limit: int
-) -> list[dict[str, object]]:
-    """Fetch posts directly from Reddit's JSON API."""
-    encoded_subreddit = quote(subreddit, safe="")
+
+async def _fetch_posts(
+    subreddit: str, sort: str, limit: int, on_page: PageCallback | None = None
+) -> Posts:
+    """
+    Fetch posts from Reddit, hedged with Apify. Empty if both fail.
+
+    The hedge delay is per Reddit page, so paginated fetches get time for
+    every page they need before Apify is started.
+    """
+    backup = None
+    if settings.apify_api_key:
+        backup = ("apify", lambda: fetch_from_apify(subreddit, sort, limit))
+
+    pages = reddit_pages(limit)
+    return await fetch_hedged(
+        ("reddit", lambda: fetch_from_reddit(subreddit, sort, limit, on_page)),
+        backup,
+        delay=hedge_delay(
+            get_source_stats(),
+            "reddit",
+            default=settings.reddit_hedge_delay_seconds,
+            max_delay=settings.reddit_hedge_max_delay_seconds,
+            pages=pages,
+        ),
+        primary_pages=pages,
+    )
+
+
+def reddit_pages(limit: int) -> int:
+    """
+    Number of Reddit requests a fetch of `limit` posts makes.
+
+    Args:
+        limit: Number of posts wanted.
+
+    Returns:
+        Pages needed, at least 1 and at most `reddit_max_pages`.
+    """
+    return max(1, min(math.ceil(limit / REDDIT_PAGE_SIZE), settings.reddit_max_pages))
+
+
+async def fetch_from_reddit(
+    subreddit: str, sort: str, limit: int, on_page: PageCallback | None = None
+) -> Posts:
+    """
+    Fetch up to `limit` posts from Reddit's JSON API only, following `after`.
+
+    The next page is requested as soon as a page's cursor is known, so it
+    is in flight while `on_page` analyzes the current one. Stops at
+    `limit`, at the end of the listing or after `reddit_max_pages` pages.
+    A failed later page keeps the posts already read.
+    """
+    posts: Posts = []
+    pages = 0
+    request: asyncio.Future[tuple[Posts, str | None]] | None = None
 
     try:
-        async with httpx.AsyncClient(timeout=10.0, follow_redirects=True) as client:
-            response = await client.get(
-                f"{REDDIT_BASE_URL}/r/{encoded_subreddit}/{sort}.json",
-                headers=_get_headers(),
-                params={"limit": limit, "raw_json": 1},
-            )
-            response.raise_for_status()
-            data = response.json()
-
-        if isinstance(data, dict):
-            return _parse_reddit_posts(data)
-        return []
+        request = asyncio.ensure_future(
+            _fetch_reddit_page(subreddit, sort, min(limit, REDDIT_PAGE_SIZE), None, 0)
+        )
+        while request is not None:
+            page, after = await request
+            request = None
+            pages += 1
+            page = page[: limit - len(posts)]
+            posts.extend(page)
+
+            if (
+                after
+                and page
+                and len(posts) < limit
+                and pages < settings.reddit_max_pages
+            ):
+                request = asyncio.ensure_future(
+                    _fetch_reddit_page(
+                        subreddit,
+                        sort,
+                        min(limit - len(posts), REDDIT_PAGE_SIZE),
+                        after,
+                        len(posts),
+                    )
+                )
+            if on_page is not None:
+                on_page(page)
+        return posts
 
     except httpx.HTTPStatusError as exc:
         status = exc.response.status_code
@@ -108,71 +183,57 @@ async def _fetch_from_reddit(
             logger.warning("Reddit API client error %d for %s: %s", status, url, exc)
         else:
             logger.error("Reddit API server error %d for %s: %s", status, url, exc)
-        return []
+        return posts
+    except RedditRateLimitedError as exc:
+        logger.warning("Skipping Reddit API for r/%s: %s", subreddit, exc)
+        return posts
     except httpx.RequestError as exc:
         url = str(exc.request.url) if exc.request else "unknown"
         logger.error("Reddit API network error for %s: %s", url, exc)
-        return []
+        return posts
     except ValueError as exc:
         logger.warning("Reddit API JSON parse error for r/%s: %s", subreddit, exc)
-        return []
-
-
-async def _fetch_from_apify(
-    subreddit: str, sort: str, limit: int
-) -> list[dict[str, object]]:
-    """Fetch posts from Apify Reddit Scraper as fallback."""
-    try:
-        import asyncio
-
-        # Define blocking operation to run in thread
-        def _run_apify_sync() -> list[dict[str, object]]:
-            from apify_client import ApifyClient
-
-            client = ApifyClient(settings.apify_api_key)
-
-            # Map sort to Apify's subredditSort parameter
-            valid_sorts = ["relevance", "hot", "top", "new", "comments", "rising"]
-            apify_sort = sort if sort in valid_sorts else "hot"
+        return posts
+    finally:
+        if request is not None and not request.done():
+            request.cancel()
 
-            run_input = {
-                "subredditName": subreddit,
-                "subredditSort": apify_sort,
-                "subredditTimeframe": "week",
-                "maxPosts": max(limit, 10),  # Apify requires minimum 10
-                "scrapeComments": False,
-                "includeNsfw": False,
-            }
 
-            # Run the actor (blocking)
-            run = client.actor(APIFY_ACTOR_ID).call(run_input=run_input)
-
-            # Fetch results from the dataset (blocking iteration)
-            posts = []
-            if isinstance(run, dict) and "defaultDatasetId" in run:
-                for item in client.dataset(run["defaultDatasetId"]).iterate_items():
-                    if isinstance(item, dict) and item.get("kind") == "post":
-                        posts.append(
-                            {
-                                "title": item.get("title", ""),
-                                "score": item.get("score", 0),
-                                "url": item.get("url", ""),
-                                "num_comments": item.get("num_comments", 0),
-                            }
-                        )
-                    if len(posts) >= limit:
-                        break
-
-            return posts
-
-        # Offload blocking I/O to thread pool
-        posts = await asyncio.to_thread(_run_apify_sync)
+async def _fetch_reddit_page(
+    subreddit: str, sort: str, limit: int, after: str | None, count: int
+) -> tuple[Posts, str | None]:
+    """
+    Fetch one listing page.
 
-        return posts
+    Args:
+        subreddit: Validated subreddit name.
+        sort: Sort order.
+        limit: Posts wanted from this page (at most REDDIT_PAGE_SIZE).
+        after: Cursor from the previous page, None for the first.
+        count: Posts already read (Reddit uses it to number the listing).
 
-    except Exception as exc:
-        logger.warning("Apify fetch failed for r/%s: %s", subreddit, exc)
-        return []
+    Returns:
+        Tuple of (posts, cursor for the next page or None at the end).
+    """
+    encoded_subreddit = quote(subreddit, safe="")
+    params: dict[str, object] = {"limit": limit, "raw_json": 1}
+    if after:
+        params.update(after=after, count=count)
+
+    limiter = get_reddit_limiter()
+    await limiter.acquire()
+    response = await get_reddit_http_client().get(
+        f"{REDDIT_BASE_URL}/r/{encoded_subreddit}/{sort}.json", params=params
+    )
+    await limiter.record(response.headers, response.status_code)
+    response.raise_for_status()
+    data = response.json()
+
+    if not isinstance(data, dict):
+        return [], None
+    data_obj = data.get("data")
+    after = data_obj.get("after") if isinstance(data_obj, dict) else None
+    return _parse_reddit_posts(data), after if isinstance(after, str) else None
 
 
 def _parse_reddit_posts(data: dict[str, object]) -> list[dict[str, object]]:
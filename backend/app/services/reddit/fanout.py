@@ -0,0 +1,130 @@
+"""Concurrent multi-subreddit fetching with merged, weighted insights.
+
+Each subreddit is fetched through `fetch_subreddit_posts` (so caching and
+hedging apply) under a concurrency limit. Posts are merged and deduped by
+URL, and scores are normalized per subreddit before the analyzer
+runs on the combined set, so a large community's vote counts don't drown
+out niche ones. Optional per-subreddit weights scale each source further.
+"""
+
+import asyncio
+
+from .analysis import accumulate_posts
+from .client import fetch_subreddit_posts
+from .constants import FALLBACK_DATA
+from .keywords import get_keyword_corpus
+
+MAX_SUBREDDITS = 20
+
+# Normalized score of each subreddit's top post (before weighting)
+NORMALIZED_TOP_SCORE = 100.0
+
+
+def _safe_score(post: dict[str, object]) -> float:
+    """Read a post's score as a float (0 if missing or invalid)."""
+    score = post.get("score", 0)
+    return float(score) if isinstance(score, (int, float)) else 0.0
+
+
+def merge_posts(
+    results: dict[str, list[dict[str, object]]], weights: dict[str, float]
+) -> tuple[list[dict[str, object]], list[dict[str, object]]]:
+    """
+    Merge per-subreddit posts, deduping by URL (or title).
+
+    Args:
+        results: Posts keyed by subreddit.
+        weights: Weight per lowercased subreddit (missing means 1.0).
+
+    Returns:
+        Tuple of (merged posts tagged with their subreddit, analysis copies
+        with normalized and weighted scores), both sorted by weighted score.
+    """
+    best: dict[str, tuple[float, dict[str, object]]] = {}
+    for subreddit, posts in results.items():
+        top = max((_safe_score(post) for post in posts), default=0.0)
+        scale = NORMALIZED_TOP_SCORE / top if top > 0 else 0.0
+        weight = weights.get(subreddit.lower(), 1.0)
+        for post in posts:
+            weighted = _safe_score(post) * scale * weight
+            key = str(post.get("url") or post.get("title", "")).strip().lower()
+            if key in best and best[key][0] >= weighted:
+                continue
+            best[key] = (weighted, {**post, "subreddit": subreddit})
+
+    ranked = sorted(best.values(), key=lambda item: item[0], reverse=True)
+    merged = [post for _, post in ranked]
+    analysis = [{**post, "score": weighted} for weighted, post in ranked]
+    return merged, analysis
+
+
+async def fetch_multiple_subreddits(
+    subreddits: list[str],
+    sort: str = "hot",
+    limit: int = 10,
+    weights: dict[str, float] | None = None,
+    concurrency: int = 4,
+) -> dict[str, object]:
+    """
+    Fetch several subreddits concurrently and merge their insights.
+
+    Args:
+        subreddits: Subreddit names (case-insensitive duplicates are ignored).
+        sort: Sort order for every subreddit.
+        limit: Posts per subreddit.
+        weights: Optional weight per subreddit (default 1.0).
+        concurrency: Maximum subreddits fetched at once.
+
+    Returns:
+        Merged insights (posts, top_post, keywords, community_vibe,
+        fallback) plus 'by_subreddit' with each subreddit's insights.
+
+    Raises:
+        ValueError: If no subreddits or more than MAX_SUBREDDITS are given.
+    """
+    names: list[str] = []
+    for name in (name.strip() for name in subreddits):
+        if name and name.lower() not in {n.lower() for n in names}:
+            names.append(name)
+    if not names:
+        raise ValueError("At least one subreddit is required")
+    if len(names) > MAX_SUBREDDITS:
+        raise ValueError(f"At most {MAX_SUBREDDITS} subreddits are supported")
+
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def fetch_one(name: str) -> dict[str, object]:
+        async with semaphore:
+            return await fetch_subreddit_posts(name, sort, limit)
+
+    fetched = await asyncio.gather(*(fetch_one(name) for name in names))
+    insights = dict(zip(names, fetched))
+
+    results: dict[str, list[dict[str, object]]] = {}
+    for name, result in insights.items():
+        posts = result.get("posts")
+        if not result.get("fallback") and isinstance(posts, list) and posts:
+            results[name] = posts
+
+    by_subreddit = {
+        name: {
+            "top_post": result.get("top_post"),
+            "keywords": result.get("keywords", []),
+            "community_vibe": result.get("community_vibe"),
+            "post_count": len(results.get(name, [])),
+            "fallback": bool(result.get("fallback")),
+        }
+        for name, result in insights.items()
+    }
+
+    if not results:
+        return {**FALLBACK_DATA, "by_subreddit": by_subreddit}
+
+    weights = {name.lower(): weight for name, weight in (weights or {}).items()}
+    merged, analysis = merge_posts(results, weights)
+    # Each subreddit already updated the corpus; the merge only reads it
+    accumulator = await accumulate_posts(analysis)
+    combined = accumulator.insights("+".join(results), get_keyword_corpus())
+    combined["posts"] = merged
+    combined["by_subreddit"] = by_subreddit
+    return combined
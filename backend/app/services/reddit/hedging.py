@@ -0,0 +1,191 @@
+"""Hedged fetching across Reddit and Apify.
+
+Reddit is asked first. Apify starts once Reddit has been slower than its
+observed p90 latency, or as soon as Reddit comes back empty (blocked,
+erroring). The first non-empty result wins and the other fetch is
+cancelled. Per-source latency and success rates drive the delay, so a
+source that keeps failing is hedged immediately. Latency is tracked per
+page, and the delay scales with the pages a fetch needs, so a healthy
+1000-post pagination isn't hedged as if it were one slow request.
+"""
+
+import asyncio
+import math
+import time
+from collections import deque
+from typing import Awaitable, Callable, TypedDict
+
+from app.utils.metrics import get_metrics
+
+Posts = list[dict[str, object]]
+SourceFetch = Callable[[], Awaitable[Posts]]
+
+# Sources with fewer samples use the configured default delay
+MIN_SAMPLES = 5
+
+# Below this success rate the primary is not waited for at all
+MIN_SUCCESS_RATE = 0.5
+
+MIN_HEDGE_DELAY_SECONDS = 0.25
+
+
+class SourceStatsSnapshot(TypedDict):
+    """Rolling statistics for one source."""
+
+    samples: int
+    p90_latency: float | None
+    success_rate: float
+
+
+class SourceStats:
+    """Rolling window of fetch latencies and outcomes per source."""
+
+    def __init__(self, window: int = 50) -> None:
+        self.window = window
+        self._fetches: dict[str, deque[tuple[float, bool]]] = {}
+
+    def record(self, source: str, latency: float, ok: bool) -> None:
+        """
+        Record one fetch.
+
+        Args:
+            source: Source name, e.g. "reddit".
+            latency: Fetch duration in seconds.
+            ok: Whether the fetch returned posts.
+        """
+        fetches = self._fetches.get(source)
+        if fetches is None:
+            fetches = deque(maxlen=self.window)
+            self._fetches[source] = fetches
+        fetches.append((latency, ok))
+
+    def snapshot(self, source: str) -> SourceStatsSnapshot:
+        """Return sample count, p90 latency of successes and success rate."""
+        fetches = self._fetches.get(source, ())
+        latencies = sorted(latency for latency, ok in fetches if ok)
+        p90 = None
+        if latencies:
+            p90 = latencies[max(0, math.ceil(0.9 * len(latencies)) - 1)]
+        return {
+            "samples": len(fetches),
+            "p90_latency": p90,
+            "success_rate": len(latencies) / len(fetches) if fetches else 1.0,
+        }
+
+    def clear(self) -> None:
+        """Drop all recorded fetches."""
+        self._fetches.clear()
+
+
+_stats = SourceStats()
+
+
+def get_source_stats() -> SourceStats:
+    """Get the process-wide source statistics."""
+    return _stats
+
+
+def hedge_delay(
+    stats: SourceStats,
+    source: str,
+    default: float,
+    max_delay: float,
+    pages: int = 1,
+) -> float:
+    """
+    How long to wait for a source before starting the backup.
+
+    Args:
+        stats: Source statistics (per-page latencies).
+        source: Primary source name.
+        default: Per-page delay while the source has too few samples.
+        max_delay: Upper bound for the adaptive per-page delay.
+        pages: Pages the fetch needs; the delay scales with them.
+
+    Returns:
+        Delay in seconds (0 when the source is mostly failing).
+    """
+    snapshot = stats.snapshot(source)
+    if snapshot["samples"] < MIN_SAMPLES:
+        return default * pages
+    if snapshot["success_rate"] < MIN_SUCCESS_RATE or snapshot["p90_latency"] is None:
+        return 0.0
+    per_page = min(max(snapshot["p90_latency"], MIN_HEDGE_DELAY_SECONDS), max_delay)
+    return per_page * pages
+
+
+async def _timed(
+    stats: SourceStats, source: str, fetch: SourceFetch, pages: int = 1
+) -> Posts:
+    """Run a fetch and record its per-page latency and outcome (not if cancelled)."""
+    started = time.monotonic()
+    try:
+        posts = await fetch()
+    except asyncio.CancelledError:
+        raise
+    except Exception:
+        stats.record(source, (time.monotonic() - started) / pages, ok=False)
+        raise
+    stats.record(source, (time.monotonic() - started) / pages, ok=bool(posts))
+    return posts
+
+
+async def fetch_hedged(
+    primary: tuple[str, SourceFetch],
+    backup: tuple[str, SourceFetch] | None,
+    delay: float,
+    stats: SourceStats | None = None,
+    primary_pages: int = 1,
+) -> Posts:
+    """
+    Fetch from `primary`, starting `backup` after `delay` or an early miss.
+
+    Args:
+        primary: (source name, fetch) tried first.
+        backup: (source name, fetch) hedged in, or None for no backup.
+        delay: Seconds to wait for the primary before starting the backup.
+        stats: Statistics to record into (defaults to the process-wide ones).
+        primary_pages: Pages the primary fetch requests, so its latency is
+            recorded per page.
+
+    Returns:
+        The first non-empty result, or [] if every source came back empty.
+    """
+    stats = stats or get_source_stats()
+    primary_name, primary_fetch = primary
+    primary_task = asyncio.ensure_future(
+        _timed(stats, primary_name, primary_fetch, primary_pages)
+    )
+    if backup is None:
+        return await primary_task
+
+    metrics = get_metrics()
+    backup_name, backup_fetch = backup
+    tasks = [primary_task]
+    try:
+        done, _ = await asyncio.wait(tasks, timeout=delay)
+        if done:
+            if primary_task.exception() is None and primary_task.result():
+                return primary_task.result()
+            metrics.increment("reddit.backup_after_failure")
+        else:
+            metrics.increment("reddit.hedges_issued")
+
+        backup_task = asyncio.ensure_future(_timed(stats, backup_name, backup_fetch))
+        tasks.append(backup_task)
+
+        pending = {task for task in tasks if not task.done()}
+        while pending:
+            done, pending = await asyncio.wait(
+                pending, return_when=asyncio.FIRST_COMPLETED
+            )
+            for task in done:
+                if task.exception() is None and task.result():
+                    if task is backup_task:
+                        metrics.increment(f"reddit.wins.{backup_name}")
+                    return task.result()
+        return []
+    finally:
+        for task in tasks:
+            if not task.done():
+                task.cancel()
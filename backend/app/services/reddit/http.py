@@ -0,0 +1,213 @@
+"""Pooled HTTP/2 client and rate limiter for Reddit's JSON API.
+
+One `httpx.AsyncClient` is shared by every Reddit request so connections
+(DNS, TLS, HTTP/2 streams) are reused. `RedditRateLimiter` follows the
+`x-ratelimit-remaining` / `x-ratelimit-reset` headers Reddit sends with
+every response: when the window's budget is spent, callers wait for the
+reset instead of provoking 429s and blocks.
+"""
+
+import asyncio
+import logging
+import time
+from typing import Callable, Mapping, TypedDict
+
+import httpx
+
+from app.utils.metrics import get_metrics
+from app.utils.state_store import StateStore, create_state_store
+
+logger = logging.getLogger(__name__)
+
+# Used when a 429 arrives without reset information
+DEFAULT_RETRY_AFTER_SECONDS = 60.0
+
+# Responses whose windows end this close together describe the same window
+SAME_WINDOW_SECONDS = 5.0
+
+
+class RateLimitState(TypedDict):
+    """Requests left in Reddit's current window and when it resets (epoch)."""
+
+    remaining: float
+    reset_at: float
+
+
+class RedditRateLimitedError(RuntimeError):
+    """Raised when Reddit's rate limit window resets too far in the future."""
+
+    def __init__(self, wait_seconds: float) -> None:
+        super().__init__(f"Reddit rate limit resets in {wait_seconds:.0f}s")
+        self.wait_seconds = wait_seconds
+
+
+def parse_rate_limit(
+    headers: Mapping[str, str], status_code: int, now: float
+) -> RateLimitState | None:
+    """
+    Read Reddit's rate limit headers from a response.
+
+    Args:
+        headers: Response headers.
+        status_code: Response status.
+        now: Current wall-clock time.
+
+    Returns:
+        The window state, or None if the response carries no limit info.
+    """
+
+    def header(name: str) -> float | None:
+        try:
+            return float(headers[name])
+        except (KeyError, TypeError, ValueError):
+            return None
+
+    remaining = header("x-ratelimit-remaining")
+    reset = header("x-ratelimit-reset")
+    if status_code == 429:
+        wait = reset or header("retry-after") or DEFAULT_RETRY_AFTER_SECONDS
+        return {"remaining": 0.0, "reset_at": now + wait}
+    if remaining is None or reset is None:
+        return None
+    return {"remaining": remaining, "reset_at": now + reset}
+
+
+class RedditRateLimiter:
+    """Shared budget for Reddit requests, driven by response headers."""
+
+    def __init__(
+        self,
+        store: StateStore,
+        max_wait_seconds: float = 10.0,
+        reserve: int = 1,
+        clock: Callable[[], float] = time.time,
+        key: str = "reddit:ratelimit",
+    ) -> None:
+        """
+        Initialize the limiter.
+
+        Args:
+            store: State store (SQLite shares the budget between workers).
+            max_wait_seconds: Longest a caller waits for the window to reset.
+            reserve: Requests left unused at the end of each window.
+            clock: Wall clock; states may be shared between processes.
+            key: State key.
+        """
+        self.store = store
+        self.max_wait_seconds = max_wait_seconds
+        self.reserve = reserve
+        self.clock = clock
+        self.key = key
+
+    async def acquire(self) -> None:
+        """
+        Reserve one request from the current window, waiting for a reset.
+
+        Raises:
+            RedditRateLimitedError: If the wait would exceed `max_wait_seconds`.
+        """
+        while True:
+            now = self.clock()
+            wait = await self.store.update(self.key, lambda s: self._take(s, now))
+            if not wait:
+                return
+            if wait > self.max_wait_seconds:  # type: ignore[operator]
+                get_metrics().increment("reddit.rate_limited")
+                raise RedditRateLimitedError(wait)  # type: ignore[arg-type]
+            get_metrics().increment("reddit.rate_limit_waits")
+            await asyncio.sleep(wait)  # type: ignore[arg-type]
+
+    async def record(self, headers: Mapping[str, str], status_code: int) -> None:
+        """
+        Update the window from a response's rate limit headers.
+
+        Args:
+            headers: Response headers.
+            status_code: Response status.
+        """
+        now = self.clock()
+        observed = parse_rate_limit(headers, status_code, now)
+        if observed is not None:
+            await self.store.update(self.key, lambda s: self._merge(s, observed))
+
+    def _take(self, state: dict | None, now: float) -> tuple[dict, float]:
+        """Spend one request, or return how long until the window resets."""
+        if state is None or now >= state["reset_at"]:
+            # Unknown or expired window: let the request through to learn it
+            return state or {"remaining": 0.0, "reset_at": now}, 0.0
+        if state["remaining"] > self.reserve:
+            return {**state, "remaining": state["remaining"] - 1}, 0.0
+        return state, state["reset_at"] - now
+
+    def _merge(
+        self, state: dict | None, observed: RateLimitState
+    ) -> tuple[dict, None]:
+        """Adopt a response's view, keeping the lower count within a window."""
+        merged = dict(observed)
+        if (
+            state is not None
+            and abs(state["reset_at"] - observed["reset_at"]) < SAME_WINDOW_SECONDS
+        ):
+            # Out-of-order responses from one window: trust the lowest count
+            merged["remaining"] = min(state["remaining"], observed["remaining"])
+        return merged, None
+
+
+_client: httpx.AsyncClient | None = None
+_limiter: RedditRateLimiter | None = None
+
+
+def get_reddit_http_client() -> httpx.AsyncClient:
+    """
+    Get the shared Reddit HTTP client, creating it on first use.
+
+    Returns:
+        AsyncClient with HTTP/2, keep-alive pooling and explicit timeouts.
+    """
+    global _client
+    if _client is None:
+        from app.config import settings
+
+        _client = httpx.AsyncClient(
+            http2=True,
+            headers={
+                "User-Agent": settings.reddit_user_agent,
+                "Accept": "application/json",
+            },
+            limits=httpx.Limits(
+                max_connections=settings.reddit_max_connections,
+                max_keepalive_connections=settings.reddit_max_connections,
+                keepalive_expiry=30.0,
+            ),
+            timeout=httpx.Timeout(10.0, connect=3.0, pool=5.0),
+            follow_redirects=True,
+        )
+    return _client
+
+
+async def close_reddit_http_client() -> None:
+    """Close the shared Reddit HTTP client if it was created."""
+    global _client
+    if _client is not None:
+        await _client.aclose()
+        _client = None
+
+
+def get_reddit_limiter() -> RedditRateLimiter:
+    """
+    Get the shared Reddit rate limiter configured from settings.
+
+    Returns:
+        RedditRateLimiter backed by the memory or SQLite state store.
+    """
+    global _limiter
+    if _limiter is None:
+        from app.config import settings
+
+        _limiter = RedditRateLimiter(
+            create_state_store(
+                settings.reddit_limiter_backend, settings.reddit_limiter_path
+            ),
+            max_wait_seconds=settings.reddit_rate_limit_max_wait_seconds,
+        )
+    return _limiter
@@ -0,0 +1,208 @@
+"""Cross-subreddit TF-IDF keyword model.
+
+Each fetched subreddit is one document, summarized by its top terms
+(words and bigrams). Document frequencies across every subreddit seen so
+far are kept incrementally: re-fetching a subreddit swaps its old terms
+for the new ones, so no historical posts are re-scanned. Ranking a
+sample's term weights by TF-IDF pushes words every community uses
+("new", "best", "first") below the ones distinctive to this subreddit.
+
+Only each subreddit's term list is persisted (in a state store, shared by
+workers when on disk), and at most `max_documents` subreddits are kept.
+The persisted documents are re-read every `reload_seconds`, so each
+worker picks up the subreddits other workers have added.
+"""
+
+import heapq
+import logging
+import math
+import time
+from collections import Counter
+from operator import itemgetter
+from typing import Callable, Mapping
+
+from app.utils.state_store import StateStore, create_state_store
+
+logger = logging.getLogger(__name__)
+
+# Terms kept per subreddit document (its highest-weighted ones)
+MAX_DOCUMENT_TERMS = 200
+
+# A bigram replaces its ranked words when it scores at least this share
+PHRASE_SHARE = 0.5
+
+
+class KeywordCorpus:
+    """Document frequencies of terms across fetched subreddits."""
+
+    def __init__(
+        self,
+        store: StateStore | None,
+        max_documents: int = 500,
+        key: str = "reddit:keyword_corpus",
+        reload_seconds: float = 60.0,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        """
+        Initialize an empty corpus.
+
+        Args:
+            store: State store to persist documents in, or None for memory only.
+            max_documents: Subreddits kept; the least recently updated go first.
+            key: State key.
+            reload_seconds: Seconds before `load` re-reads the store.
+            clock: Monotonic clock for the reload interval.
+        """
+        self.store = store
+        self.max_documents = max_documents
+        self.key = key
+        self.reload_seconds = reload_seconds
+        self.clock = clock
+        self._documents: dict[str, frozenset[str]] = {}
+        self._df: Counter[str] = Counter()
+        self._loaded_at: float | None = None
+
+    @property
+    def document_count(self) -> int:
+        """Number of subreddits in the corpus."""
+        return len(self._documents)
+
+    async def load(self) -> None:
+        """
+        Read persisted documents, at most once per `reload_seconds`.
+
+        A reload replaces the in-memory documents with the store's, which
+        include those added by other workers. Errors keep the current ones.
+        """
+        if self.store is None:
+            return
+        now = self.clock()
+        if self._loaded_at is not None and now - self._loaded_at < self.reload_seconds:
+            return
+        self._loaded_at = now
+        try:
+            state = await self.store.get(self.key)
+        except Exception:
+            logger.warning("Keyword corpus read failed", exc_info=True)
+            return
+        documents = (state or {}).get("documents", {})
+        self._documents = {}
+        self._df = Counter()
+        for name, terms in documents.items():
+            self._set_document(name, frozenset(terms))
+
+    async def add_document(self, name: str, weights: Mapping[str, float]) -> None:
+        """
+        Replace a subreddit's document with its current top terms.
+
+        Args:
+            name: Subreddit name (case-insensitive).
+            weights: Term weights from the subreddit's latest sample.
+        """
+        name = name.lower()
+        top = heapq.nlargest(MAX_DOCUMENT_TERMS, weights.items(), key=itemgetter(1))
+        terms = frozenset(term for term, _ in top)
+        if self._documents.get(name) == terms:
+            return  # Unchanged (e.g. served from cache): nothing to update
+
+        self._set_document(name, terms)
+        if self.store is None:
+            return
+
+        def merge(state: dict | None) -> tuple[dict, None]:
+            documents = dict((state or {}).get("documents", {}))
+            documents.pop(name, None)
+            documents[name] = sorted(terms)
+            while len(documents) > self.max_documents:
+                documents.pop(next(iter(documents)))
+            return {"documents": documents}, None
+
+        try:
+            await self.store.update(self.key, merge)
+        except Exception:
+            logger.warning("Keyword corpus write failed", exc_info=True)
+
+    def idf(self, term: str) -> float:
+        """Smoothed inverse document frequency (unseen terms score highest)."""
+        return math.log((1 + len(self._documents)) / (1 + self._df[term])) + 1
+
+    def rank(self, weights: Mapping[str, float], limit: int) -> list[str]:
+        """
+        Rank a sample's terms by TF-IDF.
+
+        A bigram replaces already ranked words it contains when it scores at
+        least `PHRASE_SHARE` of each (the words are mostly used together),
+        and words covered by a ranked bigram are not repeated on their own.
+
+        Args:
+            weights: Term weights (engagement-weighted frequencies).
+            limit: Number of keywords.
+
+        Returns:
+            Top terms.
+        """
+        scored = ((term, weight * self.idf(term)) for term, weight in weights.items())
+        keywords: list[str] = []
+        word_scores: dict[str, float] = {}
+        covered: set[str] = set()
+        # Extra candidates make up for the redundant terms skipped
+        for term, score in heapq.nlargest(limit * 3, scored, key=itemgetter(1)):
+            words = term.split()
+            absorbed = [word for word in words if word in word_scores]
+            if len(words) > 1 and absorbed:
+                if any(score < PHRASE_SHARE * word_scores[word] for word in absorbed):
+                    continue
+                keywords[keywords.index(absorbed[0])] = term
+                for word in absorbed:
+                    del word_scores[word]
+                    if word != absorbed[0]:
+                        keywords.remove(word)
+            elif covered.issuperset(words):
+                continue
+            else:
+                keywords.append(term)
+                if len(words) == 1:
+                    word_scores[term] = score
+            covered.update(words)
+            if len(keywords) == limit:
+                break
+        return keywords
+
+    def _set_document(self, name: str, terms: frozenset[str]) -> None:
+        """Swap a document's terms in the frequencies, evicting the oldest."""
+        self._discard(self._documents.pop(name, frozenset()))
+        self._df.update(terms)
+        self._documents[name] = terms
+        while len(self._documents) > self.max_documents:
+            self._discard(self._documents.pop(next(iter(self._documents))))
+
+    def _discard(self, terms: frozenset[str]) -> None:
+        """Remove one document's terms from the frequencies."""
+        for term in terms:
+            self._df[term] -= 1
+            if self._df[term] <= 0:
+                del self._df[term]
+
+
+_corpus: KeywordCorpus | None = None
+
+
+def get_keyword_corpus() -> KeywordCorpus:
+    """
+    Get the shared keyword corpus configured from settings.
+
+    Returns:
+        KeywordCorpus backed by the memory or SQLite state store.
+    """
+    global _corpus
+    if _corpus is None:
+        from app.config import settings
+
+        _corpus = KeywordCorpus(
+            create_state_store(
+                settings.reddit_keywords_backend, settings.reddit_keywords_path
+            ),
+            max_documents=settings.reddit_keywords_max_subreddits,
+            reload_seconds=settings.reddit_keywords_reload_seconds,
+        )
+    return _corpus
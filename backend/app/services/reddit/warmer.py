@@ -0,0 +1,247 @@
+"""Background warmer that keeps popular subreddits in the Reddit cache.
+
+SOCIAL_MEDIA nodes and `/api/social/reddit` record each listing they use.
+Usage is an exponentially decayed score per (subreddit, sort, limit
+bucket), so yesterday's subreddits are still warm this morning but fade
+out when nobody uses them. On a jittered schedule, the warmer refreshes
+the hottest listings that would go stale before its next cycle, within a
+Reddit request budget. Warming only asks Reddit (never Apify), and holds
+back when Reddit's rate limit window is nearly spent. With a shared
+(disk) store, one worker per cycle does the warming.
+"""
+
+import asyncio
+import logging
+import math
+import random
+import time
+from typing import Callable, TypedDict
+
+from app.utils.metrics import get_metrics
+from app.utils.state_store import StateStore, create_state_store
+
+from .cache import PostFetcher, RedditCache, get_reddit_cache, limit_bucket
+from .client import fetch_from_reddit, reddit_pages
+from .http import RedditRateLimiter, get_reddit_limiter
+from .validator import validate_subreddit
+
+logger = logging.getLogger(__name__)
+
+# Listings whose decayed score falls below this are no longer warmed
+MIN_SCORE = 0.25
+
+# Most listings tracked; the least used are dropped
+MAX_TRACKED = 200
+
+# Cycles run every interval ± this fraction
+JITTER = 0.2
+
+# Warming pauses while Reddit's current window has fewer requests left
+LIMITER_RESERVE = 10
+
+
+class WarmTarget(TypedDict):
+    """A tracked listing and its decayed usage score."""
+
+    subreddit: str
+    sort: str
+    limit: int
+    score: float
+    updated_at: float
+
+
+class TrendWarmer:
+    """Tracks listing usage and refreshes the hottest ones ahead of time."""
+
+    def __init__(
+        self,
+        cache: RedditCache,
+        store: StateStore,
+        fetch: PostFetcher,
+        interval: float = 60.0,
+        requests_per_hour: int = 180,
+        max_targets: int = 20,
+        half_life: float = 12 * 3600,
+        limiter: RedditRateLimiter | None = None,
+        clock: Callable[[], float] = time.time,
+        key: str = "reddit:warmer",
+    ) -> None:
+        """
+        Initialize the warmer.
+
+        Args:
+            cache: Reddit cache to warm.
+            store: State store for usage scores and the cycle lease.
+            fetch: Upstream fetcher used for refreshes.
+            interval: Seconds between cycles (before jitter).
+            requests_per_hour: Reddit request budget for warming.
+            max_targets: Hottest listings considered per cycle.
+            half_life: Seconds for a usage score to halve.
+            limiter: Reddit rate limiter to yield to, if any.
+            clock: Wall clock; states may be shared between processes.
+            key: State key prefix.
+        """
+        self.cache = cache
+        self.store = store
+        self.fetch = fetch
+        self.interval = interval
+        self.requests_per_hour = requests_per_hour
+        self.max_targets = max_targets
+        self.half_life = half_life
+        self.limiter = limiter
+        self.clock = clock
+        self.key = key
+
+    def _decayed(self, target: WarmTarget, now: float) -> float:
+        """A target's score decayed to `now`."""
+        elapsed = max(0.0, now - target["updated_at"])
+        return target["score"] * 0.5 ** (elapsed / self.half_life)
+
+    async def record(self, subreddit: str, sort: str, limit: int) -> None:
+        """
+        Count one use of a listing. Never raises.
+
+        Args:
+            subreddit: Subreddit name (invalid names are ignored).
+            sort: Sort order.
+            limit: Number of posts requested.
+        """
+        try:
+            name = validate_subreddit(subreddit).lower()
+        except ValueError:
+            return
+        bucket = limit_bucket(limit)
+        entry_key = f"{name}:{sort}:{bucket}"
+        now = self.clock()
+
+        def bump(state: dict | None) -> tuple[dict, None]:
+            targets = dict((state or {}).get("targets", {}))
+            previous = targets.get(entry_key)
+            score = self._decayed(previous, now) if previous else 0.0
+            targets[entry_key] = {
+                "subreddit": name,
+                "sort": sort,
+                "limit": bucket,
+                "score": score + 1,
+                "updated_at": now,
+            }
+            if len(targets) > MAX_TRACKED:
+                coldest = min(targets, key=lambda k: self._decayed(targets[k], now))
+                del targets[coldest]
+            return {"targets": targets}, None
+
+        try:
+            await self.store.update(f"{self.key}:usage", bump)
+        except Exception:
+            logger.warning("Failed to record Reddit usage", exc_info=True)
+
+    async def hottest(self) -> list[WarmTarget]:
+        """
+        Return the most used listings, hottest first.
+
+        Returns:
+            Up to `max_targets` listings with their decayed scores.
+        """
+        now = self.clock()
+        state = await self.store.get(f"{self.key}:usage")
+        targets: list[WarmTarget] = []
+        for target in (state or {}).get("targets", {}).values():
+            target = {**target, "score": self._decayed(target, now)}
+            targets.append(target)  # type: ignore[arg-type]
+        targets = [target for target in targets if target["score"] >= MIN_SCORE]
+        targets.sort(key=lambda target: target["score"], reverse=True)
+        return targets[: self.max_targets]
+
+    async def warm_once(self) -> int:
+        """
+        Run one warming cycle.
+
+        Returns:
+            Reddit requests spent (0 if another worker has this cycle).
+        """
+        if not await self._claim_cycle() or not await self._limiter_has_room():
+            return 0
+
+        metrics = get_metrics()
+        budget = max(1, math.floor(self.requests_per_hour * self.interval / 3600))
+        # Refresh anything that would otherwise go stale before the next cycle
+        horizon = self.interval * (1 + JITTER)
+        spent = 0
+        for target in await self.hottest():
+            listing = (target["subreddit"], target["sort"], target["limit"])
+            if not await self.cache.expires_within(*listing, horizon):
+                continue
+            # Buckets above one page take several Reddit requests
+            cost = reddit_pages(target["limit"])
+            if spent + cost > budget:
+                metrics.increment("reddit_warmer.over_budget")
+                continue
+            spent += cost
+            posts = await self.cache.refresh(*listing, self.fetch)
+            metrics.increment("reddit_warmer.refreshes")
+            if not posts:
+                metrics.increment("reddit_warmer.empty")
+        return spent
+
+    async def run(self) -> None:
+        """Warm on a jittered schedule until cancelled. Failures are logged."""
+        while True:
+            await asyncio.sleep(self.interval * random.uniform(1 - JITTER, 1 + JITTER))
+            try:
+                await self.warm_once()
+            except Exception:
+                logger.warning("Reddit cache warming failed", exc_info=True)
+
+    async def _claim_cycle(self) -> bool:
+        """Take this cycle's lease, unless another worker holds it."""
+        now = self.clock()
+        # Slightly shorter than the interval so jitter can't skip a cycle
+        until = now + self.interval * (1 - JITTER)
+
+        def claim(state: dict | None) -> tuple[dict, bool]:
+            if state is not None and state["until"] > now:
+                return state, False
+            return {"until": until}, True
+
+        return bool(await self.store.update(f"{self.key}:lease", claim))
+
+    async def _limiter_has_room(self) -> bool:
+        """Whether Reddit's current window leaves room beyond user traffic."""
+        if self.limiter is None:
+            return True
+        state = await self.limiter.store.get(self.limiter.key)
+        if state is None or self.limiter.clock() >= state["reset_at"]:
+            return True
+        if state["remaining"] < LIMITER_RESERVE:
+            get_metrics().increment("reddit_warmer.yielded")
+            return False
+        return True
+
+
+_warmer: TrendWarmer | None = None
+
+
+def get_trend_warmer() -> TrendWarmer:
+    """
+    Get the shared trend warmer configured from settings.
+
+    Returns:
+        TrendWarmer over the shared Reddit cache, fetching from Reddit only.
+    """
+    global _warmer
+    if _warmer is None:
+        from app.config import settings
+
+        _warmer = TrendWarmer(
+            get_reddit_cache(),
+            create_state_store(
+                settings.reddit_warmer_backend, settings.reddit_warmer_path
+            ),
+            fetch=fetch_from_reddit,
+            interval=settings.reddit_warmer_interval_seconds,
+            requests_per_hour=settings.reddit_warmer_requests_per_hour,
+            max_targets=settings.reddit_warmer_max_subreddits,
+            half_life=settings.reddit_warmer_half_life_hours * 3600,
+            limiter=get_reddit_limiter(),
+        )
+    return _warmer
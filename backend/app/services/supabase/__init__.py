@@ -3,6 +3,9 @@
 # Client
 from .client import get_supabase_client, get_public_supabase_client
 
+# Auth
+from .auth import TokenVerifier, get_token_verifier
+
 # Workflows
 from .workflows import get_workflow_with_nodes_and_edges
 
@@ -12,6 +15,7 @@ from .executions import (
     update_execution_status,
     get_execution,
     get_execution_for_user,
+    get_user_spend,
 )
 
 # Node executions
@@ -25,12 +29,21 @@ from .node_executions import (
 from .generations import create_generation
 
 # Storage
-from .storage import upload_image_from_url, upload_images_from_urls
+from .storage import (
+    upload_image_bytes,
+    upload_image_from_url,
+    upload_images_from_urls,
+    upload_image_with_derivatives,
+    upload_generated_images,
+)
 
 __all__ = [
     # Client
     "get_supabase_client",
     "get_public_supabase_client",
+    # Auth
+    "TokenVerifier",
+    "get_token_verifier",
     # Workflows
     "get_workflow_with_nodes_and_edges",
     # Executions
@@ -38,6 +51,7 @@ __all__ = [
     "update_execution_status",
     "get_execution",
     "get_execution_for_user",
+    "get_user_spend",
     # Node executions
     "create_node_executions",
     "update_node_execution",
@@ -45,6 +59,9 @@ __all__ = [
     # Generations
     "create_generation",
     # Storage
+    "upload_image_bytes",
     "upload_image_from_url",
     "upload_images_from_urls",
+    "upload_image_with_derivatives",
+    "upload_generated_images",
 ]
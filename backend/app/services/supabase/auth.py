@@ -0,0 +1,268 @@
+"""Local verification of Supabase access tokens.
+
+Access tokens are JWTs, so their signature, expiry and audience can be
+checked in-process instead of asking Supabase Auth on every request.
+Asymmetric tokens (ES256/RS256) are verified against the project's JWKS,
+which is cached and refreshed in the background; an unknown key id
+triggers one early refresh, since it usually means the keys rotated.
+Legacy HS256 tokens are verified with `SUPABASE_JWT_SECRET` when it is
+set. Tokens that can't be checked locally (HS256 without the secret, or
+no keys fetched yet) fall back to Supabase Auth.
+
+Verified tokens are cached briefly, never past their expiry.
+"""
+
+import asyncio
+import hashlib
+import logging
+import time
+from typing import Awaitable, Callable, TypedDict
+
+import httpx
+import jwt
+
+from app.utils.cache import MemoryLRUCache
+from app.utils.metrics import get_metrics
+
+logger = logging.getLogger(__name__)
+
+# Signature algorithms Supabase uses for asymmetric signing keys
+ASYMMETRIC_ALGORITHMS = ("ES256", "RS256", "EdDSA")
+
+# An unknown key id refreshes the JWKS at most this often
+MIN_REFRESH_INTERVAL = 30.0
+
+JWKS_TIMEOUT = 5.0
+
+
+class AuthUser(TypedDict):
+    """The authenticated user."""
+
+    id: str
+    email: str | None
+
+
+RemoteVerifier = Callable[[str], Awaitable[AuthUser]]
+
+
+class TokenVerifier:
+    """Verifies Supabase access tokens with cached keys."""
+
+    def __init__(
+        self,
+        supabase_url: str,
+        remote_verify: RemoteVerifier,
+        jwt_secret: str = "",
+        audience: str = "authenticated",
+        local: bool = True,
+        jwks_refresh_seconds: float = 600.0,
+        token_cache_seconds: float = 60.0,
+        leeway: float = 30.0,
+        clock: Callable[[], float] = time.time,
+    ) -> None:
+        """
+        Initialize the verifier.
+
+        Args:
+            supabase_url: Project URL; the issuer and JWKS URL derive from it.
+            remote_verify: Supabase Auth check for tokens not verifiable here.
+            jwt_secret: Legacy HS256 secret, or "" to verify HS256 remotely.
+            audience: Required `aud` claim.
+            local: Verify locally; False sends every token to Supabase Auth.
+            jwks_refresh_seconds: Seconds between background key refreshes.
+            token_cache_seconds: How long a verified token is remembered.
+            leeway: Clock skew allowed on `exp`, in seconds.
+            clock: Wall clock, for expiry and refresh intervals.
+        """
+        self.issuer = f"{supabase_url.rstrip('/')}/auth/v1"
+        self.jwks_url = f"{self.issuer}/.well-known/jwks.json"
+        self.remote_verify = remote_verify
+        self.jwt_secret = jwt_secret
+        self.audience = audience
+        self.local = local
+        self.jwks_refresh_seconds = jwks_refresh_seconds
+        self.token_cache_seconds = token_cache_seconds
+        self.leeway = leeway
+        self.clock = clock
+        self._keys: dict[str, jwt.PyJWK] = {}
+        self._refreshed_at: float | None = None
+        self._refresh_lock = asyncio.Lock()
+        self._tokens = MemoryLRUCache(max_entries=4096)
+
+    async def verify(self, token: str) -> AuthUser:
+        """
+        Verify an access token.
+
+        Args:
+            token: Bearer token.
+
+        Returns:
+            The token's user.
+
+        Raises:
+            jwt.PyJWTError: If the token is invalid, expired or signed by an
+                unknown key.
+            Exception: If the Supabase Auth fallback rejects the token.
+        """
+        metrics = get_metrics()
+        key = hashlib.blake2b(token.encode(), digest_size=16).hexdigest()
+        cached = await self._tokens.get(key)
+        if cached is not None:
+            metrics.increment("auth.token_cache_hits")
+            return cached  # type: ignore[return-value]
+
+        user, expires_at = await self._verify(token)
+        ttl = min(self.token_cache_seconds, expires_at - self.clock())
+        if ttl > 0:
+            await self._tokens.set(key, user, ttl)
+        return user
+
+    async def refresh_keys(self, min_interval: float = 0.0) -> None:
+        """
+        Fetch the project's JWKS. Failures keep the current keys.
+
+        Args:
+            min_interval: Skip if the last attempt was more recent than this.
+        """
+        async with self._refresh_lock:
+            now = self.clock()
+            last = self._refreshed_at
+            if last is not None and now - last < min_interval:
+                return
+            self._refreshed_at = now
+            try:
+                async with httpx.AsyncClient(timeout=JWKS_TIMEOUT) as client:
+                    response = await client.get(self.jwks_url)
+                    response.raise_for_status()
+                    jwks = response.json()
+            except Exception:
+                logger.warning("Supabase JWKS refresh failed", exc_info=True)
+                get_metrics().increment("auth.jwks_refresh_failures")
+                return
+
+            keys: dict[str, jwt.PyJWK] = {}
+            for jwk in jwks.get("keys", []):
+                try:
+                    parsed = jwt.PyJWK(jwk)
+                except jwt.PyJWTError:
+                    continue  # Unsupported key type; tokens using it fail
+                if parsed.key_id:
+                    keys[parsed.key_id] = parsed
+            if keys or not self._keys:
+                self._keys = keys
+            get_metrics().increment("auth.jwks_refreshes")
+
+    async def run(self) -> None:
+        """Refresh the signing keys on a schedule until cancelled."""
+        while True:
+            await self.refresh_keys()
+            await asyncio.sleep(self.jwks_refresh_seconds)
+
+    async def _verify(self, token: str) -> tuple[AuthUser, float]:
+        """Verify a token locally if possible; returns the user and expiry."""
+        if not self.local:
+            return await self._verify_remote(token)
+
+        header = jwt.get_unverified_header(token)
+        algorithm = header.get("alg")
+        if algorithm == "HS256":
+            if not self.jwt_secret:
+                return await self._verify_remote(token)
+            key: object = self.jwt_secret
+        elif algorithm in ASYMMETRIC_ALGORITHMS:
+            signing_key = await self._signing_key(header.get("kid"))
+            if signing_key is None:
+                return await self._verify_remote(token)
+            key = signing_key.key
+            # Trust the key's algorithm, not the token's claim about it
+            algorithm = signing_key.algorithm_name
+        else:
+            raise jwt.InvalidAlgorithmError(f"Unsupported algorithm: {algorithm}")
+
+        claims = jwt.decode(
+            token,
+            key,  # type: ignore[arg-type]
+            algorithms=[algorithm],
+            audience=self.audience,
+            issuer=self.issuer,
+            leeway=self.leeway,
+            options={"require": ["exp", "sub"]},
+        )
+        get_metrics().increment("auth.local_verifications")
+        user: AuthUser = {"id": str(claims["sub"]), "email": claims.get("email")}
+        return user, float(claims["exp"])
+
+    async def _signing_key(self, key_id: str | None) -> jwt.PyJWK | None:
+        """
+        The JWKS key with this id, or None if no keys could be fetched.
+
+        Raises:
+            jwt.InvalidKeyError: If the key id is unknown even after a refresh.
+        """
+        key = self._keys.get(key_id) if key_id else None
+        if key is None:
+            # Not fetched yet, or the keys rotated since the last refresh
+            await self.refresh_keys(min_interval=MIN_REFRESH_INTERVAL)
+            key = self._keys.get(key_id) if key_id else None
+        if key is None and self._keys:
+            raise jwt.InvalidKeyError(f"Unknown signing key: {key_id}")
+        return key
+
+    async def _verify_remote(self, token: str) -> tuple[AuthUser, float]:
+        """Ask Supabase Auth; the expiry is read from the (now trusted) token."""
+        user = await self.remote_verify(token)
+        get_metrics().increment("auth.remote_verifications")
+        try:
+            claims = jwt.decode(token, options={"verify_signature": False})
+            expires_at = float(claims.get("exp", 0))
+        except jwt.PyJWTError:
+            expires_at = 0.0  # Opaque token: don't cache it
+        return user, expires_at
+
+
+async def verify_with_supabase(token: str) -> AuthUser:
+    """
+    Verify a token with a Supabase Auth round trip.
+
+    Args:
+        token: Bearer token.
+
+    Returns:
+        The token's user.
+
+    Raises:
+        ValueError: If Supabase Auth returns no user.
+    """
+    from .client import get_public_supabase_client
+
+    client = get_public_supabase_client()
+    response = await asyncio.to_thread(client.auth.get_user, token)
+    if not response or not response.user:
+        raise ValueError("Invalid or expired token")
+    return {"id": str(response.user.id), "email": response.user.email}
+
+
+_verifier: TokenVerifier | None = None
+
+
+def get_token_verifier() -> TokenVerifier:
+    """
+    Get the shared token verifier configured from settings.
+
+    Returns:
+        TokenVerifier for the configured Supabase project.
+    """
+    global _verifier
+    if _verifier is None:
+        from app.config import settings
+
+        _verifier = TokenVerifier(
+            settings.supabase_url,
+            verify_with_supabase,
+            jwt_secret=settings.supabase_jwt_secret,
+            local=settings.auth_verification == "local",
+            jwks_refresh_seconds=settings.auth_jwks_refresh_seconds,
+            token_cache_seconds=settings.auth_token_cache_seconds,
+            leeway=settings.auth_jwt_leeway_seconds,
+        )
+    return _verifier
@@ -1,34 +1,45 @@
 """Execution database operations."""
 
-from datetime import datetime, timezone
+from datetime import datetime, timedelta, timezone
 from typing import Optional, Mapping, cast
 
 from supabase import Client
 
 from app.models.enums import ExecutionStatus
 
+# Statuses whose spend is not final yet
+IN_FLIGHT_STATUSES = tuple(
+    status.value
+    for status in (
+        ExecutionStatus.PENDING,
+        ExecutionStatus.RUNNING,
+        ExecutionStatus.PAUSED,
+    )
+)
+
 
-async def create_execution(client: Client, workflow_id: str) -> dict[str, object]:
+async def create_execution(
+    client: Client, workflow_id: str, estimated_cost: Optional[float] = None
+) -> dict[str, object]:
     """
     Create a new execution record.
 
     Args:
         client: Supabase client instance.
         workflow_id: UUID of the workflow.
+        estimated_cost: Optional pre-flight cost estimate (reserved budget).
 
     Returns:
         Created execution record.
     """
-    result = (
-        client.table("executions")
-        .insert(
-            {
-                "workflow_id": workflow_id,
-                "status": ExecutionStatus.RUNNING.value,
-            }
-        )
-        .execute()
-    )
+    payload: dict[str, str | float] = {
+        "workflow_id": workflow_id,
+        "status": ExecutionStatus.RUNNING.value,
+    }
+    if estimated_cost is not None:
+        payload["estimated_cost"] = estimated_cost
+
+    result = client.table("executions").insert(payload).execute()
     data = result.data
     if data and isinstance(data, list) and len(data) > 0:
         first_item = data[0]
@@ -146,3 +157,38 @@ async def get_execution_for_user(
         raise ValueError("Execution not found")
 
     return dict(exec_data)
+
+
+async def get_user_spend(client: Client, user_id: str, window_hours: float) -> float:
+    """
+    Sum a user's execution costs over a trailing window.
+
+    Running and paused executions without a recorded total count at
+    their estimated cost, so in-flight runs reserve budget. Finished ones
+    (completed, failed or cancelled) count at their recorded total.
+
+    Args:
+        client: Supabase client instance.
+        user_id: UUID of the user.
+        window_hours: Length of the window in hours.
+
+    Returns:
+        Spent and reserved cost in USD.
+    """
+    since = datetime.now(timezone.utc) - timedelta(hours=window_hours)
+    result = (
+        client.table("executions")
+        .select("status, total_cost, estimated_cost, workflows!inner(user_id)")
+        .eq("workflows.user_id", user_id)
+        .gte("started_at", since.isoformat())
+        .execute()
+    )
+    total = 0.0
+    for row in result.data or []:
+        if not isinstance(row, Mapping):
+            continue
+        cost = row.get("total_cost")
+        if cost is None and row.get("status") in IN_FLIGHT_STATUSES:
+            cost = row.get("estimated_cost")
+        total += float(cost or 0.0)
+    return total
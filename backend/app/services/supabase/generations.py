@@ -12,6 +12,7 @@ async def create_generation(
     image_urls: list[str],
     aspect_ratio: str,
     cost: float,
+    derivatives: list[dict[str, object]] | None = None,
 ) -> dict[str, object]:
     """
     Create a generation record.
@@ -25,6 +26,7 @@ async def create_generation(
         image_urls: List of generated image URLs.
         aspect_ratio: Image aspect ratio.
         cost: Generation cost.
+        derivatives: Per-image derivative URLs, aligned with image_urls.
 
     Returns:
         Created generation record.
@@ -40,6 +42,7 @@ async def create_generation(
                 "image_urls": image_urls,
                 "aspect_ratio": aspect_ratio,
                 "cost": cost,
+                "derivatives": derivatives or [],
             }
         )
         .execute()
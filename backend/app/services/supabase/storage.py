@@ -1,51 +1,56 @@
 """Supabase Storage service for uploading images."""
 
 import asyncio
+import logging
 import uuid
 import httpx
-from .client import get_supabase_client
-
-GENERATED_IMAGES_BUCKET = "generated-images"
 
+from app.services.media.derivatives import (
+    DERIVATIVE_CONTENT_TYPE,
+    render_derivatives,
+    resolve_duplicate_derivatives,
+)
+from app.utils.process_pool import run_in_process
+from .client import get_supabase_client
 
-async def upload_image_from_url(
-    user_id: str,
-    image_url: str,
-    content_type: str = "image/png",
-) -> str:
-    """
-    Download image from URL and upload to Supabase Storage.
+logger = logging.getLogger(__name__)
 
-    Args:
-        user_id: User ID for RLS (used as folder prefix).
-        image_url: Source URL to download image from.
-        content_type: MIME type of the image.
+GENERATED_IMAGES_BUCKET = "generated-images"
+SIGNED_URL_EXPIRY_SECONDS = 60 * 60 * 24 * 14
 
-    Returns:
-        Signed URL of the uploaded image (expires in 14 days).
 
-    Raises:
-        Exception: If download or upload fails.
-    """
-    # Download image from FAL
+async def _download_image(image_url: str, content_type: str) -> tuple[bytes, str]:
+    """Download image bytes, preferring the response content type."""
     async with httpx.AsyncClient(timeout=30.0) as http:
         response = await http.get(image_url)
         response.raise_for_status()
-        image_bytes = response.content
         # Get content type from response if available
         if response.headers.get("content-type"):
             content_type = response.headers["content-type"].split(";")[0]
+        return response.content, content_type
+
 
-    # Determine extension from content type
-    ext = "png"
+def _extension_for(content_type: str) -> str:
+    """Determine file extension from content type."""
     if "jpeg" in content_type or "jpg" in content_type:
-        ext = "jpg"
-    elif "webp" in content_type:
-        ext = "webp"
+        return "jpg"
+    if "webp" in content_type:
+        return "webp"
+    return "png"
 
-    # Build path: {user_id}/{uuid}.{ext}
-    file_path = f"{user_id}/{uuid.uuid4()}.{ext}"
 
+async def upload_image_bytes(file_path: str, data: bytes, content_type: str) -> str:
+    """
+    Upload bytes to the generated images bucket and sign the object.
+
+    Args:
+        file_path: Object path inside the bucket.
+        data: File contents.
+        content_type: MIME type of the file.
+
+    Returns:
+        Signed URL of the uploaded object (expires in 14 days).
+    """
     client = get_supabase_client()
     bucket = client.storage.from_(GENERATED_IMAGES_BUCKET)
 
@@ -53,7 +58,7 @@ async def upload_image_from_url(
     upload_result = await asyncio.to_thread(
         bucket.upload,
         file_path,
-        image_bytes,
+        data,
         {"content-type": content_type, "upsert": "true"},
     )
 
@@ -63,7 +68,7 @@ async def upload_image_from_url(
 
     # Create signed URL for private bucket (14 days expiry)
     signed_url_result = await asyncio.to_thread(
-        bucket.create_signed_url, file_path, 60 * 60 * 24 * 14
+        bucket.create_signed_url, file_path, SIGNED_URL_EXPIRY_SECONDS
     )
 
     if hasattr(signed_url_result, "error") and signed_url_result.error:
@@ -78,6 +83,34 @@ async def upload_image_from_url(
     return signed_url
 
 
+async def upload_image_from_url(
+    user_id: str,
+    image_url: str,
+    content_type: str = "image/png",
+) -> str:
+    """
+    Download image from URL and upload to Supabase Storage.
+
+    Args:
+        user_id: User ID for RLS (used as folder prefix).
+        image_url: Source URL to download image from.
+        content_type: MIME type of the image.
+
+    Returns:
+        Signed URL of the uploaded image (expires in 14 days).
+
+    Raises:
+        Exception: If download or upload fails.
+    """
+    image_bytes, content_type = await _download_image(image_url, content_type)
+    ext = _extension_for(content_type)
+
+    # Build path: {user_id}/{uuid}.{ext}
+    file_path = f"{user_id}/{uuid.uuid4()}.{ext}"
+
+    return await upload_image_bytes(file_path, image_bytes, content_type)
+
+
 async def upload_images_from_urls(
     user_id: str,
     image_urls: list[str],
@@ -101,3 +134,75 @@ async def upload_images_from_urls(
             # Fallback to original URL if upload fails
             uploaded_urls.append(url)
     return uploaded_urls
+
+
+async def upload_image_with_derivatives(
+    user_id: str,
+    image_url: str,
+) -> dict[str, object]:
+    """
+    Upload an image and its WebP derivatives to Supabase Storage.
+
+    Derivatives are stored next to the original as
+    `{user_id}/{uuid}_{name}.webp`. Encoding runs in the shared process
+    pool; if it fails, the original is still returned without derivatives.
+
+    Args:
+        user_id: User ID for RLS (used as folder prefix).
+        image_url: Source URL to download image from.
+
+    Returns:
+        Dictionary with the signed 'url' of the original and a
+        'derivatives' mapping of derivative name to signed URL.
+    """
+    image_bytes, content_type = await _download_image(image_url, "image/png")
+
+    stem = f"{user_id}/{uuid.uuid4()}"
+    original_url = await upload_image_bytes(
+        f"{stem}.{_extension_for(content_type)}", image_bytes, content_type
+    )
+
+    derivative_urls: dict[str, str] = {}
+    try:
+        rendered = await run_in_process(render_derivatives, image_bytes)
+        uploads = await asyncio.gather(
+            *(
+                upload_image_bytes(f"{stem}_{name}.webp", data, DERIVATIVE_CONTENT_TYPE)
+                for name, data in rendered.items()
+            )
+        )
+        derivative_urls = resolve_duplicate_derivatives(dict(zip(rendered, uploads)))
+    except Exception:
+        logger.warning("Derivative generation failed for %s", stem, exc_info=True)
+
+    return {"url": original_url, "derivatives": derivative_urls}
+
+
+async def upload_generated_images(
+    user_id: str,
+    image_urls: list[str],
+) -> list[dict[str, object]]:
+    """
+    Upload generated images with derivatives, preserving order.
+
+    Args:
+        user_id: User ID for RLS folder.
+        image_urls: List of source URLs.
+
+    Returns:
+        One entry per source URL with 'url' and 'derivatives'. Images that
+        fail to upload fall back to the source URL with no derivatives.
+    """
+    results = await asyncio.gather(
+        *(upload_image_with_derivatives(user_id, url) for url in image_urls),
+        return_exceptions=True,
+    )
+
+    uploaded: list[dict[str, object]] = []
+    for url, result in zip(image_urls, results):
+        if isinstance(result, BaseException):
+            logger.warning("Image upload failed, keeping source URL: %s", result)
+            uploaded.append({"url": url, "derivatives": {}})
+        else:
+            uploaded.append(result)
+    return uploaded
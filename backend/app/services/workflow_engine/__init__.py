@@ -1,5 +1,17 @@
 """Workflow execution engine."""
 
+from .cost_estimate import (
+    BudgetExceededError,
+    CostEstimate,
+    InvalidWorkflowError,
+    NodeCostEstimate,
+)
 from .engine import WorkflowEngine
 
-__all__ = ["WorkflowEngine"]
+__all__ = [
+    "WorkflowEngine",
+    "BudgetExceededError",
+    "InvalidWorkflowError",
+    "CostEstimate",
+    "NodeCostEstimate",
+]
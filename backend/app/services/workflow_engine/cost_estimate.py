@@ -0,0 +1,221 @@
+"""Pre-flight cost estimation and budget checks.
+
+Estimates what an execution will cost from the workflow graph, model
+prices and OUTPUT overrides, without calling FAL. Estimates are upper
+bounds: each node is priced at the dearer of its model and the breaker's
+fallback model, hedged nodes also pay for a duplicate request, and cache
+hits and coalesced requests can only make a run cheaper.
+"""
+
+from typing import TypedDict
+
+from app.models.enums import NodeType
+from app.services.fal.models import get_registry
+from app.services.fal.routing import AUTO_MODEL
+from app.utils.cost_calculator import calculate_cost
+from .helpers import get_output_config
+
+
+class NodeCostEstimate(TypedDict):
+    """Estimated cost of one IMAGE_MODEL node."""
+
+    node_id: str
+    model_id: str
+    num_images: int
+    price_per_image: float
+    cost: float
+    edit: bool
+    hedge: bool
+
+
+class CostEstimate(TypedDict):
+    """Estimated cost of a whole execution."""
+
+    total_cost: float
+    nodes: list[NodeCostEstimate]
+
+
+class InvalidWorkflowError(ValueError):
+    """Raised when a workflow's configuration can't be priced or run."""
+
+
+class BudgetExceededError(RuntimeError):
+    """Raised when an execution's estimated cost does not fit a budget."""
+
+    def __init__(self, scope: str, estimated_cost: float, remaining: float) -> None:
+        super().__init__(
+            f"Estimated cost ${estimated_cost:.4f} exceeds the remaining "
+            f"{scope} budget of ${max(remaining, 0.0):.4f}"
+        )
+        self.scope = scope
+        self.estimated_cost = estimated_cost
+        self.remaining = remaining
+
+
+def _has_image_input(node_id: str, nodes: list[dict], edges: list[dict]) -> bool:
+    """Check whether any upstream IMAGE_INPUT node supplies an image."""
+    node_map = {node["id"]: node for node in nodes}
+    sources: dict[str, list[str]] = {}
+    for edge in edges:
+        sources.setdefault(edge["target_node_id"], []).append(edge["source_node_id"])
+
+    seen: set[str] = set()
+    stack = list(sources.get(node_id, []))
+    while stack:
+        current = stack.pop()
+        if current in seen:
+            continue
+        seen.add(current)
+        node = node_map.get(current, {})
+        if node.get("type") == NodeType.IMAGE_INPUT.value and (
+            node.get("config") or {}
+        ).get("image_url"):
+            return True
+        stack.extend(sources.get(current, []))
+    return False
+
+
+def _worst_case_price(model_id: str) -> float:
+    """Per-image price of a model or its breaker fallback, whichever is dearer."""
+    model = get_registry().get(model_id)
+    fallback = model.config.get("fallback_model") if model else None
+    price = calculate_cost(model_id, 1)
+    return max(price, calculate_cost(str(fallback), 1)) if fallback else price
+
+
+def _auto_price(aspect_ratio: str, edit: bool) -> tuple[str, float]:
+    """Most expensive model the router could pick for this request."""
+    registry = get_registry()
+    best: tuple[str, float] | None = None
+    for base_model_id in registry.base_model_ids:
+        base = registry.get(base_model_id)
+        model_id = base.edit_model_id if base and edit else base_model_id
+        model = registry.get(model_id) if model_id else None
+        if model is None or aspect_ratio not in model.aspect_ratios:
+            continue
+        price = _worst_case_price(model.model_id)
+        if best is None or price > best[1]:
+            best = (model.model_id, price)
+    if best is None:
+        raise InvalidWorkflowError(f"No model supports aspect ratio {aspect_ratio}")
+    return best
+
+
+def estimate_node_cost(
+    node: dict, nodes: list[dict], edges: list[dict]
+) -> NodeCostEstimate:
+    """
+    Estimate the cost of an IMAGE_MODEL node.
+
+    Resolves num_images and aspect ratio the same way the executor does
+    (OUTPUT node overrides win), routes to the edit variant when an image
+    input is connected, and prices "auto" at the most expensive candidate.
+    Each image is priced at the dearer of the model and its fallback, and
+    `hedge: true` doubles the cost for the possible duplicate request.
+
+    Args:
+        node: IMAGE_MODEL node record.
+        nodes: All node records.
+        edges: All edge records.
+
+    Returns:
+        Node cost estimate.
+
+    Raises:
+        InvalidWorkflowError: If num_images is not a positive integer.
+    """
+    config = node.get("config") or {}
+    raw_params = config.get("parameters", {})
+    params = raw_params if isinstance(raw_params, dict) else {}
+    num_images = params.get("num_images", 1)
+    aspect_ratio = params.get("aspect_ratio", "1:1")
+
+    output_config = get_output_config(node["id"], nodes, edges)
+    if output_config:
+        if "num_images" in output_config:
+            num_images = output_config.get("num_images") or num_images
+        if "aspect_ratio" in output_config:
+            aspect_ratio = output_config.get("aspect_ratio") or aspect_ratio
+
+    try:
+        count = int(num_images)
+    except (TypeError, ValueError):
+        count = 0
+    if count < 1:
+        raise InvalidWorkflowError(
+            f"Invalid num_images for node {node['id']}: {num_images}"
+        )
+
+    edit = _has_image_input(node["id"], nodes, edges)
+    model_id = str(config.get("model", "fal-ai/flux/schnell"))
+    if model_id == AUTO_MODEL:
+        model_id, _ = _auto_price(str(aspect_ratio), edit)
+    elif edit:
+        model = get_registry().get(model_id)
+        if model and model.edit_model_id:
+            model_id = model.edit_model_id
+
+    price = _worst_case_price(model_id)
+    hedge = bool(params.get("hedge", False))
+    return {
+        "node_id": node["id"],
+        "model_id": model_id,
+        "num_images": count,
+        "price_per_image": price,
+        "cost": price * count * (2 if hedge else 1),
+        "edit": edit,
+        "hedge": hedge,
+    }
+
+
+def estimate_execution_cost(
+    nodes: list[dict], edges: list[dict], node_ids: list[str]
+) -> CostEstimate:
+    """
+    Estimate the cost of executing the given nodes. Makes no external calls.
+
+    Args:
+        nodes: All node records.
+        edges: All edge records.
+        node_ids: Nodes that will run (e.g. the topological order).
+
+    Returns:
+        Total and per-node estimates for IMAGE_MODEL nodes.
+
+    Raises:
+        InvalidWorkflowError: If a node's configuration cannot be priced.
+    """
+    node_map = {node["id"]: node for node in nodes}
+    estimates = [
+        estimate_node_cost(node_map[node_id], nodes, edges)
+        for node_id in node_ids
+        if node_map[node_id].get("type") == NodeType.IMAGE_MODEL.value
+    ]
+    return {
+        "total_cost": sum(estimate["cost"] for estimate in estimates),
+        "nodes": estimates,
+    }
+
+
+def check_budget(
+    estimated_cost: float,
+    execution_budget: float,
+    user_budget: float,
+    user_spent: float,
+) -> None:
+    """
+    Check an estimate against the per-execution and per-user budgets.
+
+    Args:
+        estimated_cost: Estimated execution cost in USD.
+        execution_budget: Maximum cost of one execution (0 disables).
+        user_budget: Maximum spend per user in the budget window (0 disables).
+        user_spent: What the user has already spent or reserved in the window.
+
+    Raises:
+        BudgetExceededError: If either budget would be exceeded.
+    """
+    if execution_budget > 0 and estimated_cost > execution_budget:
+        raise BudgetExceededError("execution", estimated_cost, execution_budget)
+    if user_budget > 0 and user_spent + estimated_cost > user_budget:
+        raise BudgetExceededError("user", estimated_cost, user_budget - user_spent)
@@ -1,9 +1,12 @@
 """Workflow execution engine - public API."""
 
+import asyncio
+import weakref
 from typing import cast
 
 from supabase import Client
 
+from app.config import settings
 from app.models.enums import ExecutionStatus
 from app.utils.topological_sort import topological_sort
 from app.services.supabase import (
@@ -14,9 +17,17 @@ from app.services.supabase import (
     update_execution_status,
     get_execution_for_user,
     get_node_executions,
+    get_user_spend,
 )
+from .cost_estimate import check_budget, estimate_execution_cost
 from .runner import ExecutionRunner
-from .helpers import find_paused_node_index
+from .helpers import find_paused_node_index, load_previous_outputs
+
+# Per-user admission locks: reading spend and reserving the estimate happen
+# under one lock, so one worker can't admit concurrent runs past the budget
+_admission_locks: "weakref.WeakValueDictionary[str, asyncio.Lock]" = (
+    weakref.WeakValueDictionary()
+)
 
 
 class WorkflowEngine:
@@ -37,6 +48,9 @@ class WorkflowEngine:
 
         Returns:
             Dictionary with execution_id and status.
+
+        Raises:
+            BudgetExceededError: If the estimated cost does not fit a budget.
         """
         data = await get_workflow_with_nodes_and_edges(
             self.client, workflow_id, user_id=user_id
@@ -45,8 +59,9 @@ class WorkflowEngine:
         edges = data["edges"]
 
         sorted_node_ids = topological_sort(nodes, edges)
-        execution = await create_execution(self.client, workflow_id)
-        execution_id = cast(str, execution["id"])
+        execution_id = await self._admit(
+            workflow_id, nodes, edges, sorted_node_ids, user_id
+        )
         # Pass sorted nodes to preserve node_type and node_name in execution history
         node_map = {node["id"]: node for node in nodes}
         sorted_nodes = [node_map[nid] for nid in sorted_node_ids]
@@ -72,6 +87,9 @@ class WorkflowEngine:
 
         Returns:
             Dictionary with execution_id, status, nodes, edges, and sorted_node_ids.
+
+        Raises:
+            BudgetExceededError: If the estimated cost does not fit a budget.
         """
         data = await get_workflow_with_nodes_and_edges(
             self.client, workflow_id, user_id=user_id
@@ -80,8 +98,9 @@ class WorkflowEngine:
         edges = data["edges"]
 
         sorted_node_ids = topological_sort(nodes, edges)
-        execution = await create_execution(self.client, workflow_id)
-        execution_id = cast(str, execution["id"])
+        execution_id = await self._admit(
+            workflow_id, nodes, edges, sorted_node_ids, user_id
+        )
         # Pass sorted nodes to preserve node_type and node_name in execution history
         node_map = {node["id"]: node for node in nodes}
         sorted_nodes = [node_map[nid] for nid in sorted_node_ids]
@@ -97,6 +116,79 @@ class WorkflowEngine:
             "user_id": user_id,
         }
 
+    async def estimate_workflow(self, workflow_id: str, user_id: str) -> dict:
+        """
+        Estimate a workflow's cost without running it or calling FAL.
+
+        Args:
+            workflow_id: UUID of the workflow to estimate.
+            user_id: UUID of the authenticated user.
+
+        Returns:
+            Dictionary with the cost estimate, budgets and remaining user budget.
+        """
+        data = await get_workflow_with_nodes_and_edges(
+            self.client, workflow_id, user_id=user_id
+        )
+        nodes = data["nodes"]
+        edges = data["edges"]
+
+        sorted_node_ids = topological_sort(nodes, edges)
+        estimate = estimate_execution_cost(nodes, edges, sorted_node_ids)
+        user_spent = await get_user_spend(
+            self.client, user_id, settings.user_budget_window_hours
+        )
+        return {
+            "workflow_id": workflow_id,
+            **estimate,
+            "execution_budget": settings.execution_budget_usd,
+            "user_budget": settings.user_budget_usd,
+            "user_spent": user_spent,
+        }
+
+    async def _admit(
+        self,
+        workflow_id: str,
+        nodes: list[dict],
+        edges: list[dict],
+        sorted_node_ids: list[str],
+        user_id: str,
+    ) -> str:
+        """
+        Estimate the execution cost and create the execution if in budget.
+
+        The spend check and the execution record (which reserves the
+        estimate) happen under a per-user lock. The lock is per worker:
+        with several workers, concurrent admissions for one user can still
+        overshoot the user budget by up to one execution budget each.
+
+        Returns:
+            The new execution's id.
+
+        Raises:
+            BudgetExceededError: If the estimated cost does not fit a budget.
+        """
+        estimate = estimate_execution_cost(nodes, edges, sorted_node_ids)
+        lock = _admission_locks.get(user_id)
+        if lock is None:
+            lock = _admission_locks[user_id] = asyncio.Lock()
+        async with lock:
+            user_spent = 0.0
+            if settings.user_budget_usd > 0 and estimate["total_cost"] > 0:
+                user_spent = await get_user_spend(
+                    self.client, user_id, settings.user_budget_window_hours
+                )
+            check_budget(
+                estimate["total_cost"],
+                execution_budget=settings.execution_budget_usd,
+                user_budget=settings.user_budget_usd,
+                user_spent=user_spent,
+            )
+            execution = await create_execution(
+                self.client, workflow_id, estimated_cost=estimate["total_cost"]
+            )
+        return cast(str, execution["id"])
+
     async def _run_execution_background(
         self,
         execution_id: str,
@@ -189,8 +281,11 @@ class WorkflowEngine:
             Dictionary with execution_id and cancelled status.
         """
         await get_execution_for_user(self.client, execution_id, user_id)
+        # Record the spend so far; a running loop updates it when it stops
+        node_executions = await get_node_executions(self.client, execution_id)
+        _, total_cost = load_previous_outputs(node_executions)
         await update_execution_status(
-            self.client, execution_id, ExecutionStatus.CANCELLED
+            self.client, execution_id, ExecutionStatus.CANCELLED, total_cost=total_cost
         )
         return {
             "execution_id": execution_id,
@@ -18,9 +18,20 @@ class ExecutionRunner:
     def __init__(self, client: Client) -> None:
         self.client = client
 
-    async def _maybe_cancel(self, execution_id: str) -> dict | None:
-        """Check if execution was cancelled and return result if so."""
+    async def _maybe_cancel(self, execution_id: str, total_cost: float) -> dict | None:
+        """
+        Check if execution was cancelled and return result if so.
+
+        A cancelled execution records what it spent so far, so it stops
+        counting against the budget at its estimated cost.
+        """
         if await is_execution_cancelled(self.client, execution_id):
+            await update_execution_status(
+                self.client,
+                execution_id,
+                ExecutionStatus.CANCELLED,
+                total_cost=total_cost,
+            )
             return {
                 "execution_id": execution_id,
                 "status": ExecutionStatus.CANCELLED,
@@ -46,7 +57,7 @@ class ExecutionRunner:
 
         try:
             for idx in range(start_index, len(sorted_node_ids)):
-                if cancelled := await self._maybe_cancel(execution_id):
+                if cancelled := await self._maybe_cancel(execution_id, total_cost):
                     return cancelled
 
                 node_id = sorted_node_ids[idx]
@@ -76,11 +87,11 @@ class ExecutionRunner:
                 if "cost" in output:
                     total_cost += output["cost"]
 
-                if cancelled := await self._maybe_cancel(execution_id):
+                if cancelled := await self._maybe_cancel(execution_id, total_cost):
                     return cancelled
 
             # All nodes completed
-            if cancelled := await self._maybe_cancel(execution_id):
+            if cancelled := await self._maybe_cancel(execution_id, total_cost):
                 return cancelled
 
             await update_execution_status(
@@ -96,7 +107,9 @@ class ExecutionRunner:
             }
 
         except Exception as e:
-            return await self._handle_failure(execution_id, current_node_id, str(e))
+            return await self._handle_failure(
+                execution_id, current_node_id, str(e), total_cost
+            )
 
     async def step_single_node(
         self,
@@ -116,7 +129,7 @@ class ExecutionRunner:
         node = node_map[node_id]
 
         try:
-            if cancelled := await self._maybe_cancel(execution_id):
+            if cancelled := await self._maybe_cancel(execution_id, total_cost):
                 return cancelled
 
             await update_execution_status(
@@ -131,13 +144,13 @@ class ExecutionRunner:
             if "cost" in output:
                 total_cost += output["cost"]
 
-            if cancelled := await self._maybe_cancel(execution_id):
+            if cancelled := await self._maybe_cancel(execution_id, total_cost):
                 return cancelled
 
             # Check if done
             next_index = start_index + 1
             if next_index >= len(sorted_node_ids):
-                if cancelled := await self._maybe_cancel(execution_id):
+                if cancelled := await self._maybe_cancel(execution_id, total_cost):
                     return cancelled
 
                 await update_execution_status(
@@ -168,12 +181,20 @@ class ExecutionRunner:
             }
 
         except Exception as e:
-            return await self._handle_failure(execution_id, node_id, str(e))
+            return await self._handle_failure(execution_id, node_id, str(e), total_cost)
 
     async def _handle_failure(
-        self, execution_id: str, node_id: str | None, error_msg: str
+        self,
+        execution_id: str,
+        node_id: str | None,
+        error_msg: str,
+        total_cost: float,
     ) -> dict:
-        """Handle execution failure - update status and return error result."""
+        """
+        Handle execution failure - update status and return error result.
+
+        The cost of the nodes that completed is recorded as the total.
+        """
         if node_id:
             await update_node_execution(
                 self.client,
@@ -187,6 +208,7 @@ class ExecutionRunner:
             execution_id,
             ExecutionStatus.FAILED,
             error_message=error_msg,
+            total_cost=total_cost,
         )
         return {
             "execution_id": execution_id,
@@ -0,0 +1,182 @@
+"""Pluggable async cache backends for JSON-serializable values."""
+
+import asyncio
+import json
+import sqlite3
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Iterator, Protocol
+
+
+class CacheBackend(Protocol):
+    """Async key-value cache interface."""
+
+    async def get(self, key: str) -> object | None:
+        """Return the cached value, or None if missing or expired."""
+        ...
+
+    async def set(self, key: str, value: object, ttl: float | None = None) -> None:
+        """Store a value, optionally expiring after `ttl` seconds."""
+        ...
+
+    async def delete(self, key: str) -> None:
+        """Remove a value if present."""
+        ...
+
+
+class MemoryLRUCache:
+    """In-process LRU cache with optional per-entry TTL."""
+
+    def __init__(self, max_entries: int = 1024) -> None:
+        self.max_entries = max_entries
+        self._entries: OrderedDict[str, tuple[object, float | None]] = OrderedDict()
+
+    async def get(self, key: str) -> object | None:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        value, expires_at = entry
+        if expires_at is not None and expires_at <= time.time():
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return value
+
+    async def set(self, key: str, value: object, ttl: float | None = None) -> None:
+        expires_at = time.time() + ttl if ttl is not None else None
+        self._entries[key] = (value, expires_at)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    async def delete(self, key: str) -> None:
+        self._entries.pop(key, None)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class SQLiteCache:
+    """
+    On-disk cache backed by a SQLite file.
+
+    Values are stored as JSON. The file can be shared by several worker
+    processes on the same host; queries run in a thread to keep the
+    event loop free.
+    """
+
+    def __init__(self, path: str | Path, table: str = "cache") -> None:
+        if not table.isidentifier():
+            raise ValueError(f"Invalid cache table name: {table}")
+        self.path = Path(path)
+        self.table = table
+        self._initialized = False
+
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        """Open a connection, commit on success and always close it."""
+        if not self._initialized:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+        conn = sqlite3.connect(self.path, timeout=5.0)
+        try:
+            if not self._initialized:
+                conn.execute("PRAGMA journal_mode=WAL")
+                conn.execute(
+                    f"CREATE TABLE IF NOT EXISTS {self.table} "
+                    "(key TEXT PRIMARY KEY, value TEXT NOT NULL, expires_at REAL)"
+                )
+                self._initialized = True
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    def _get_sync(self, key: str) -> object | None:
+        with self._connect() as conn:
+            row = conn.execute(
+                f"SELECT value, expires_at FROM {self.table} WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return None
+            value, expires_at = row
+            if expires_at is not None and expires_at <= time.time():
+                conn.execute(f"DELETE FROM {self.table} WHERE key = ?", (key,))
+                return None
+            return json.loads(value)
+
+    def _set_sync(self, key: str, value: object, ttl: float | None) -> None:
+        expires_at = time.time() + ttl if ttl is not None else None
+        with self._connect() as conn:
+            conn.execute(
+                f"INSERT OR REPLACE INTO {self.table} (key, value, expires_at) "
+                "VALUES (?, ?, ?)",
+                (key, json.dumps(value), expires_at),
+            )
+
+    def _delete_sync(self, key: str) -> None:
+        with self._connect() as conn:
+            conn.execute(f"DELETE FROM {self.table} WHERE key = ?", (key,))
+
+    async def get(self, key: str) -> object | None:
+        return await asyncio.to_thread(self._get_sync, key)
+
+    async def set(self, key: str, value: object, ttl: float | None = None) -> None:
+        await asyncio.to_thread(self._set_sync, key, value, ttl)
+
+    async def delete(self, key: str) -> None:
+        await asyncio.to_thread(self._delete_sync, key)
+
+
+class TieredCache:
+    """Memory LRU in front of a slower shared backend."""
+
+    def __init__(self, memory: MemoryLRUCache, backend: CacheBackend) -> None:
+        self.memory = memory
+        self.backend = backend
+
+    async def get(self, key: str) -> object | None:
+        value = await self.memory.get(key)
+        if value is not None:
+            return value
+        value = await self.backend.get(key)
+        if value is not None:
+            # Short memory TTL so backend expiry and deletes still apply
+            await self.memory.set(key, value, ttl=60.0)
+        return value
+
+    async def set(self, key: str, value: object, ttl: float | None = None) -> None:
+        await self.backend.set(key, value, ttl)
+        await self.memory.set(key, value, ttl=min(ttl, 60.0) if ttl else 60.0)
+
+    async def delete(self, key: str) -> None:
+        await self.memory.delete(key)
+        await self.backend.delete(key)
+
+
+def create_cache_backend(
+    kind: str, path: str | Path, table: str, max_entries: int = 1024
+) -> CacheBackend | None:
+    """
+    Build a cache backend from a settings value.
+
+    Args:
+        kind: "memory", "disk" (memory LRU in front of SQLite) or "none".
+        path: SQLite file path for the disk backend.
+        table: SQLite table name for the disk backend.
+        max_entries: Memory LRU capacity.
+
+    Returns:
+        Cache backend, or None when caching is disabled.
+
+    Raises:
+        ValueError: If the kind is unknown.
+    """
+    if kind == "none":
+        return None
+    if kind == "memory":
+        return MemoryLRUCache(max_entries)
+    if kind == "disk":
+        return TieredCache(MemoryLRUCache(max_entries), SQLiteCache(path, table))
+    raise ValueError(f"Unknown cache backend: {kind}")
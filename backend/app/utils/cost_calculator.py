@@ -1,6 +1,6 @@
 """Cost calculation utilities for FAL AI models."""
 
-from app.services.fal import get_model_price
+from app.services.fal.models import get_model_price
 
 DEFAULT_COST_PER_IMAGE = 0.01
 
@@ -0,0 +1,38 @@
+"""In-process counters for operational metrics."""
+
+from collections import defaultdict
+
+
+class Metrics:
+    """Named float counters and gauges, e.g. hedge counts and hit rates."""
+
+    def __init__(self) -> None:
+        self._counters: defaultdict[str, float] = defaultdict(float)
+
+    def increment(self, name: str, value: float = 1.0) -> None:
+        """Add `value` to a counter."""
+        self._counters[name] += value
+
+    def set(self, name: str, value: float) -> None:
+        """Set a gauge-style value, e.g. a hit rate."""
+        self._counters[name] = value
+
+    def get(self, name: str) -> float:
+        """Return a counter's current value (0 if never incremented)."""
+        return self._counters.get(name, 0.0)
+
+    def snapshot(self) -> dict[str, float]:
+        """Return a copy of all counters."""
+        return dict(self._counters)
+
+    def reset(self) -> None:
+        """Clear all counters."""
+        self._counters.clear()
+
+
+_metrics = Metrics()
+
+
+def get_metrics() -> Metrics:
+    """Get the process-wide metrics registry."""
+    return _metrics
@@ -0,0 +1,54 @@
+"""Shared process pool for CPU-bound work off the event loop."""
+
+import asyncio
+import functools
+import logging
+from concurrent.futures import ProcessPoolExecutor
+from typing import Callable, TypeVar
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+_executor: ProcessPoolExecutor | None = None
+
+
+def get_process_pool() -> ProcessPoolExecutor:
+    """
+    Get the shared process pool, creating it on first use.
+
+    Returns:
+        Process pool executor sized from settings.
+    """
+    global _executor
+    if _executor is None:
+        from app.config import settings
+
+        _executor = ProcessPoolExecutor(max_workers=settings.process_pool_workers)
+    return _executor
+
+
+async def run_in_process(func: Callable[..., T], *args: object) -> T:
+    """
+    Run a picklable, module-level function in the shared process pool.
+
+    Args:
+        func: Function to run. Must be importable by worker processes.
+        *args: Positional arguments (must be picklable).
+
+    Returns:
+        The function's return value.
+    """
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(
+        get_process_pool(), functools.partial(func, *args)
+    )
+
+
+def shutdown_process_pool() -> None:
+    """Shut down the shared process pool if it was started."""
+    global _executor
+    if _executor is not None:
+        logger.info("Shutting down process pool")
+        _executor.shutdown(wait=False, cancel_futures=True)
+        _executor = None
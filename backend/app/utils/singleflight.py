@@ -0,0 +1,77 @@
+"""In-flight request coalescing (singleflight) for async calls."""
+
+import asyncio
+from typing import Awaitable, Callable, Generic, TypeVar
+
+T = TypeVar("T")
+
+
+class _Call(Generic[T]):
+    """A shared upstream call and the number of callers awaiting it."""
+
+    __slots__ = ("task", "waiters")
+
+    def __init__(self, task: "asyncio.Task[T]") -> None:
+        self.task = task
+        self.waiters = 0
+
+
+class SingleFlight(Generic[T]):
+    """
+    Coalesce concurrent calls with the same key into one upstream call.
+
+    The first caller for a key starts the upstream task; later callers
+    await the same task, and every caller gets the upstream exception
+    itself (so `except` clauses match as usual). A cancelled caller only
+    stops waiting; the upstream task is cancelled once every waiter has
+    gone, unless the flight is `detached`.
+    """
+
+    def __init__(self, detached: bool = False) -> None:
+        """
+        Initialize the flight.
+
+        Args:
+            detached: Let upstream tasks run to completion after every
+                waiter has gone (e.g. to fill a cache); later callers for
+                the key join the running task.
+        """
+        self.detached = detached
+        self._calls: dict[str, _Call[T]] = {}
+
+    def __len__(self) -> int:
+        return len(self._calls)
+
+    async def do(self, key: str, fn: Callable[[], Awaitable[T]]) -> tuple[T, bool]:
+        """
+        Run `fn` once per key among concurrent callers.
+
+        Args:
+            key: Normalized request key.
+            fn: Zero-argument coroutine function performing the upstream call.
+
+        Returns:
+            Tuple of (result, coalesced). `coalesced` is True for callers
+            that joined a call started by someone else.
+        """
+        call = self._calls.get(key)
+        coalesced = call is not None
+        if call is None:
+            call = _Call(asyncio.ensure_future(fn()))
+            self._calls[key] = call
+            call.task.add_done_callback(lambda _: self._forget(key, call))
+
+        call.waiters += 1
+        try:
+            # shield: a cancelled caller stops waiting without killing upstream
+            return await asyncio.shield(call.task), coalesced
+        finally:
+            call.waiters -= 1
+            if call.waiters == 0 and not call.task.done() and not self.detached:
+                call.task.cancel()
+                self._forget(key, call)
+
+    def _forget(self, key: str, call: _Call[T]) -> None:
+        """Drop a finished or abandoned call so new callers start fresh."""
+        if self._calls.get(key) is call:
+            del self._calls[key]
@@ -0,0 +1,125 @@
+"""Key-value state stores with atomic read-modify-write.
+
+Used by rate limiters and circuit breakers. The SQLite store lets every
+worker process on a host share the same state.
+"""
+
+import asyncio
+import json
+import sqlite3
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Callable, Iterator, Protocol
+
+
+StateUpdate = Callable[[dict | None], tuple[dict, object]]
+
+
+class StateStore(Protocol):
+    """Key-value store with atomic read-modify-write of JSON states."""
+
+    async def get(self, key: str) -> dict | None:
+        """Return the current state, or None."""
+        ...
+
+    async def update(self, key: str, fn: StateUpdate) -> object:
+        """Atomically replace the state with `fn(state)[0]`, return `[1]`."""
+        ...
+
+
+class MemoryStateStore:
+    """Per-process store. Updates are atomic because `fn` never awaits."""
+
+    def __init__(self) -> None:
+        self._states: dict[str, dict] = {}
+
+    async def get(self, key: str) -> dict | None:
+        return self._states.get(key)
+
+    async def update(self, key: str, fn: StateUpdate) -> object:
+        state, result = fn(self._states.get(key))
+        self._states[key] = state
+        return result
+
+
+class SQLiteStateStore:
+    """
+    Store backed by a SQLite file, shared by worker processes on a host.
+
+    Updates run in an IMMEDIATE transaction so concurrent processes
+    serialize their read-modify-write cycles.
+    """
+
+    def __init__(self, path: str | Path) -> None:
+        self.path = Path(path)
+        self._initialized = False
+
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        """Open an autocommit connection and always close it."""
+        if not self._initialized:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+        conn = sqlite3.connect(self.path, timeout=5.0, isolation_level=None)
+        try:
+            if not self._initialized:
+                conn.execute("PRAGMA journal_mode=WAL")
+                conn.execute(
+                    "CREATE TABLE IF NOT EXISTS limiter_state "
+                    "(key TEXT PRIMARY KEY, value TEXT NOT NULL)"
+                )
+                self._initialized = True
+            yield conn
+        finally:
+            conn.close()
+
+    def _get_sync(self, key: str) -> dict | None:
+        with self._connect() as conn:
+            row = conn.execute(
+                "SELECT value FROM limiter_state WHERE key = ?", (key,)
+            ).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def _update_sync(self, key: str, fn: StateUpdate) -> object:
+        with self._connect() as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                row = conn.execute(
+                    "SELECT value FROM limiter_state WHERE key = ?", (key,)
+                ).fetchone()
+                state, result = fn(json.loads(row[0]) if row else None)
+                conn.execute(
+                    "INSERT OR REPLACE INTO limiter_state (key, value) VALUES (?, ?)",
+                    (key, json.dumps(state)),
+                )
+                conn.execute("COMMIT")
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+        return result
+
+    async def get(self, key: str) -> dict | None:
+        return await asyncio.to_thread(self._get_sync, key)
+
+    async def update(self, key: str, fn: StateUpdate) -> object:
+        return await asyncio.to_thread(self._update_sync, key, fn)
+
+
+def create_state_store(kind: str, path: str | Path) -> StateStore:
+    """
+    Build a state store from a settings value.
+
+    Args:
+        kind: "memory" (per process) or "disk" (SQLite, shared by workers).
+        path: SQLite file path for the disk store.
+
+    Returns:
+        State store.
+
+    Raises:
+        ValueError: If the kind is unknown.
+    """
+    if kind == "memory":
+        return MemoryStateStore()
+    if kind == "disk":
+        return SQLiteStateStore(path)
+    raise ValueError(f"Unknown limiter backend: {kind}")
@@ -0,0 +1,121 @@
+"""
+Auth Dependency Benchmark
+
+Compares per-request authentication latency under concurrency:
+
+- remote: the previous `get_current_user`, a blocking Supabase Auth
+  `get_user` round trip per request (simulated with `--remote-latency`,
+  since it blocks the event loop the way the sync client did)
+- local: `TokenVerifier` checking ES256 signatures against a cached JWKS
+- cached: the same tokens again, served from the verified-token cache
+
+Offline: the JWKS endpoint is mocked and tokens are signed locally.
+
+Usage:
+    cd backend
+    python scripts/bench_auth.py --requests 500 --concurrency 50
+"""
+
+import argparse
+import asyncio
+import json
+import statistics
+import sys
+import time
+from pathlib import Path
+from typing import Awaitable, Callable
+
+import jwt
+import respx
+from cryptography.hazmat.primitives.asymmetric import ec
+from httpx import Response
+
+# Add backend to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.services.supabase.auth import AuthUser, TokenVerifier  # noqa: E402
+
+SUPABASE_URL = "https://bench.supabase.co"
+ISSUER = f"{SUPABASE_URL}/auth/v1"
+
+
+def make_tokens(count: int) -> tuple[list[str], dict[str, str]]:
+    """Sign `count` tokens for distinct users; return them and the JWK."""
+    private_key = ec.generate_private_key(ec.SECP256R1())
+    jwk = json.loads(jwt.algorithms.ECAlgorithm.to_jwk(private_key.public_key()))
+    expires = int(time.time()) + 3600
+    tokens = [
+        jwt.encode(
+            {"sub": f"user-{i}", "aud": "authenticated", "iss": ISSUER, "exp": expires},
+            private_key,
+            algorithm="ES256",
+            headers={"kid": "bench"},
+        )
+        for i in range(count)
+    ]
+    return tokens, {**jwk, "kid": "bench", "alg": "ES256"}
+
+
+async def run(
+    verify: Callable[[str], Awaitable[AuthUser]], tokens: list[str], concurrency: int
+) -> dict[str, float]:
+    """Authenticate every token with `concurrency` requests in flight."""
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies: list[float] = []
+
+    async def request(token: str) -> None:
+        async with semaphore:
+            started = time.perf_counter()
+            await verify(token)
+            latencies.append(time.perf_counter() - started)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(request(token) for token in tokens))
+    elapsed = time.perf_counter() - started
+    latencies.sort()
+    return {
+        "rps": len(tokens) / elapsed,
+        "p50": statistics.median(latencies),
+        "p99": latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))],
+    }
+
+
+async def main() -> None:
+    """Parse flags, run each mode and print a report."""
+    parser = argparse.ArgumentParser(description="Auth dependency benchmark")
+    parser.add_argument("--requests", type=int, default=500)
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--remote-latency", type=float, default=0.05)
+    args = parser.parse_args()
+
+    tokens, jwk = make_tokens(args.requests)
+
+    async def remote(token: str) -> AuthUser:
+        time.sleep(args.remote_latency)  # Sync client call, as before
+        return {"id": "user", "email": None}
+
+    with respx.mock:
+        respx.get(f"{ISSUER}/.well-known/jwks.json").mock(
+            return_value=Response(200, json={"keys": [jwk]})
+        )
+        verifier = TokenVerifier(SUPABASE_URL, remote)
+        await verifier.refresh_keys()
+        results = {
+            "remote": await run(remote, tokens, args.concurrency),
+            "local": await run(verifier.verify, tokens, args.concurrency),
+            "cached": await run(verifier.verify, tokens, args.concurrency),
+        }
+
+    print(
+        f"requests={args.requests} concurrency={args.concurrency} "
+        f"remote_latency={args.remote_latency * 1000:.0f}ms"
+    )
+    for mode, result in results.items():
+        print(
+            f"{mode:>6}: {result['rps']:,.0f} req/s "
+            f"p50={result['p50'] * 1000:.2f}ms p99={result['p99'] * 1000:.2f}ms"
+        )
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,132 @@
+"""
+ImageModelExecutor Throughput Benchmark
+
+Runs many image model executions concurrently against the local FAL
+stand-in and reports throughput and latency percentiles. Runs are
+repeatable offline (fixed stand-in seed, no FAL costs).
+
+Usage:
+    cd backend
+    python scripts/bench_image_model.py --requests 200 --concurrency 50
+
+By default a stand-in is started in-process. Use --standin-url to target
+one started with scripts/fal_standin.py. Registry rate limits apply; raise
+them with MODEL_REGISTRY_PATH to measure raw engine throughput.
+"""
+
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import time
+from pathlib import Path
+
+# Add backend to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from dotenv import load_dotenv  # noqa: E402
+
+load_dotenv()
+
+
+def percentile(values: list[float], pct: float) -> float:
+    """Nearest-rank percentile of a non-empty list."""
+    ordered = sorted(values)
+    index = max(0, min(len(ordered) - 1, round(pct / 100 * len(ordered)) - 1))
+    return ordered[index]
+
+
+async def run_benchmark(args: argparse.Namespace) -> None:
+    """Start the stand-in if needed, run executions and print a report."""
+    import uvicorn
+
+    server = None
+    base_url = args.standin_url
+    if not base_url:
+        from app.services.fal.standin import create_standin_app
+
+        app = create_standin_app(
+            {
+                "latency_median": args.latency_median,
+                "latency_sigma": args.latency_sigma,
+                "failure_rate": args.failure_rate,
+                "seed": 42,
+            }
+        )
+        server = uvicorn.Server(
+            uvicorn.Config(app, host="127.0.0.1", port=args.port, log_level="warning")
+        )
+        serve_task = asyncio.create_task(server.serve())
+        while not server.started:
+            await asyncio.sleep(0.05)
+        base_url = f"http://127.0.0.1:{args.port}"
+
+    # Settings are read at import, so set the URLs before importing the app
+    os.environ["FAL_RUN_URL"] = f"{base_url}/run"
+    os.environ["FAL_QUEUE_URL"] = f"{base_url}/queue"
+    os.environ.setdefault("FAL_KEY", "standin")
+    from app.services.fal import close_fal_service
+    from app.services.node_executors.image_model import ImageModelExecutor
+
+    executor = ImageModelExecutor()
+    semaphore = asyncio.Semaphore(args.concurrency)
+    latencies: list[float] = []
+    failures = 0
+
+    async def execute_one(index: int) -> None:
+        nonlocal failures
+        async with semaphore:
+            started = time.perf_counter()
+            try:
+                await executor.execute(
+                    {"prompt-node": {"prompt": f"benchmark product shot {index}"}},
+                    {
+                        "model": args.model,
+                        "parameters": {"num_images": args.num_images},
+                    },
+                )
+                latencies.append(time.perf_counter() - started)
+            except Exception as e:
+                failures += 1
+                if failures == 1:
+                    print(f"first failure: {e}")
+
+    started = time.perf_counter()
+    await asyncio.gather(*(execute_one(i) for i in range(args.requests)))
+    elapsed = time.perf_counter() - started
+    await close_fal_service()
+
+    print(f"requests={args.requests} concurrency={args.concurrency} model={args.model}")
+    print(f"elapsed={elapsed:.2f}s throughput={args.requests / elapsed:.1f} req/s")
+    print(f"failures={failures}")
+    if latencies:
+        print(
+            f"latency mean={statistics.mean(latencies):.2f}s "
+            f"p50={percentile(latencies, 50):.2f}s "
+            f"p95={percentile(latencies, 95):.2f}s "
+            f"p99={percentile(latencies, 99):.2f}s"
+        )
+
+    if server:
+        server.should_exit = True
+        await serve_task
+
+
+def main() -> None:
+    """Parse flags and run the benchmark."""
+    parser = argparse.ArgumentParser(description="ImageModelExecutor benchmark")
+    parser.add_argument("--requests", type=int, default=100)
+    parser.add_argument("--concurrency", type=int, default=20)
+    parser.add_argument("--num-images", type=int, default=1)
+    parser.add_argument("--model", default="fal-ai/flux/schnell")
+    parser.add_argument("--standin-url", default="")
+    parser.add_argument("--port", type=int, default=8011)
+    parser.add_argument("--latency-median", type=float, default=0.5)
+    parser.add_argument("--latency-sigma", type=float, default=0.5)
+    parser.add_argument("--failure-rate", type=float, default=0.0)
+    asyncio.run(run_benchmark(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
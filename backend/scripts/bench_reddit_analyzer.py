@@ -0,0 +1,143 @@
+"""
+Reddit Analyzer Benchmark
+
+Times `extract_insights` on synthetic posts against the previous
+implementation (one `re.search` per noise pattern, `re.sub` per title,
+dict scores word by word, full sorts for the top post and keywords) and
+checks both produce the same insights. Offline and repeatable (seeded).
+
+Usage:
+    cd backend
+    python scripts/bench_reddit_analyzer.py --posts 20000 --repeat 5
+"""
+
+import argparse
+import random
+import re
+import statistics
+import sys
+import time
+from pathlib import Path
+
+# Add backend to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.services.reddit.analyzer import (  # noqa: E402
+    _analyze_community_vibe,
+    extract_insights,
+)
+from app.services.reddit.constants import (  # noqa: E402
+    FALLBACK_DATA,
+    NOISE_PATTERNS,
+    STOP_WORDS,
+)
+
+VOCABULARY = (
+    "espresso grinder burr latte milk shot dial beans roast pourover kettle "
+    "scale crema tamp portafilter upgrade setup finally first home cafe "
+    "light dark medium review recommendation budget machine pressure"
+).split()
+
+PREFIXES = ("", "", "", "", "[Discussion] ", "Daily question thread: ", "AMA ")
+
+
+def make_posts(count: int, seed: int) -> list[dict[str, object]]:
+    """Build `count` synthetic posts with a mix of noise and quality titles."""
+    rng = random.Random(seed)
+    return [
+        {
+            "title": rng.choice(PREFIXES)
+            + " ".join(rng.choices(VOCABULARY, k=rng.randint(4, 14)))
+            + rng.choice(("", "?", "!", " (2024)", " - thoughts?")),
+            "score": rng.choice((0, rng.randint(1, 5000))),
+            "url": f"https://reddit.com/r/espresso/{i}",
+            "num_comments": rng.randint(0, 400),
+        }
+        for i in range(count)
+    ]
+
+
+def baseline_insights(
+    posts: list[dict[str, object]], subreddit: str
+) -> dict[str, object]:
+    """The analyzer before the precompiled, single-pass rewrite."""
+
+    def safe_float(value: object, default: float = 0.0) -> float:
+        return float(value) if isinstance(value, (int, float)) else default
+
+    quality = []
+    for post in posts:
+        title = str(post.get("title", "")).lower()
+        is_noise = any(re.search(pattern, title, re.I) for pattern in NOISE_PATTERNS)
+        score = post.get("score", 0)
+        if not is_noise and isinstance(score, (int, float)) and score > 0:
+            quality.append(post)
+    sample = quality or posts
+
+    def quality_score(p: dict[str, object]) -> float:
+        score = safe_float(p.get("score", 0))
+        comments = safe_float(p.get("num_comments", 0))
+        if score < 50 and comments > 50:
+            return score * 0.5
+        return score + (comments * 0.3)
+
+    top_title = str(sorted(sample, key=quality_score, reverse=True)[0]["title"])
+    cleaned = re.sub(r"^\[.*?\]\s*", "", top_title)
+    cleaned = re.sub(r"\s+", " ", cleaned).strip()
+    top_post = cleaned or str(FALLBACK_DATA["top_post"])
+
+    word_scores: dict[str, float] = {}
+    for post in sample:
+        title = str(post.get("title", ""))
+        score = safe_float(post.get("score", 1), 1.0)
+        title = re.sub(r"^\[.*?\]\s*", "", title)
+        title = re.sub(r"[^\w\s-]", " ", title)
+        for word in title.lower().split():
+            word = word.strip("-")
+            if word and len(word) > 2 and word not in STOP_WORDS and not word.isdigit():
+                word_scores[word] = word_scores.get(word, 0) + (1 + score * 0.1)
+    ranked = sorted(word_scores.items(), key=lambda x: x[1], reverse=True)
+    keywords = [word for word, _ in ranked[:8]]
+
+    return {
+        "posts": posts,
+        "top_post": top_post,
+        "keywords": keywords,
+        "community_vibe": _analyze_community_vibe(keywords, subreddit),
+        "fallback": False,
+    }
+
+
+def time_runs(fn, posts: list[dict[str, object]], repeat: int) -> list[float]:
+    """Run `fn` over the posts `repeat` times and return each duration."""
+    durations = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn(posts, "espresso")
+        durations.append(time.perf_counter() - started)
+    return durations
+
+
+def main() -> None:
+    """Parse flags, run both analyzers and print a report."""
+    parser = argparse.ArgumentParser(description="Reddit analyzer benchmark")
+    parser.add_argument("--posts", type=int, default=10_000)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    posts = make_posts(args.posts, args.seed)
+    if baseline_insights(posts, "espresso") != extract_insights(posts, "espresso"):
+        sys.exit("analyzers disagree on the synthetic posts")
+
+    baseline = statistics.median(time_runs(baseline_insights, posts, args.repeat))
+    current = statistics.median(time_runs(extract_insights, posts, args.repeat))
+
+    print(f"posts={args.posts} repeat={args.repeat} (median of runs)")
+    print(f"baseline={baseline * 1000:.1f}ms ({args.posts / baseline:,.0f} posts/s)")
+    print(f"current={current * 1000:.1f}ms ({args.posts / current:,.0f} posts/s)")
+    print(f"speedup={baseline / current:.2f}x")
+
+
+if __name__ == "__main__":
+    main()
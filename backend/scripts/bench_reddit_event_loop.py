@@ -0,0 +1,96 @@
+"""
+Reddit Analysis Event Loop Benchmark
+
+Measures event loop lag while Reddit samples are analyzed, with analysis
+inline on the loop and offloaded to the process pool. A ticker sleeps
+for a few milliseconds in a loop and records how late it wakes up; that
+lateness is what every other request on the worker waits for. Offline
+and repeatable (seeded synthetic posts).
+
+Usage:
+    cd backend
+    python scripts/bench_reddit_event_loop.py --posts 1000 --jobs 20
+"""
+
+import argparse
+import asyncio
+import statistics
+import sys
+import time
+from pathlib import Path
+
+# Add backend to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.config import settings  # noqa: E402
+from app.services.reddit.analysis import accumulate_posts  # noqa: E402
+from app.utils.process_pool import get_process_pool, shutdown_process_pool  # noqa: E402
+
+from bench_reddit_analyzer import make_posts  # noqa: E402
+
+TICK = 0.005
+
+
+async def measure_lag(stop: asyncio.Event) -> list[float]:
+    """Sleep `TICK` repeatedly until stopped; return each wake-up delay."""
+    lags = []
+    while not stop.is_set():
+        started = time.perf_counter()
+        await asyncio.sleep(TICK)
+        lags.append(time.perf_counter() - started - TICK)
+    return lags
+
+
+async def run(backend: str, samples: list[list[dict[str, object]]]) -> dict:
+    """Analyze every sample with `backend` while measuring loop lag."""
+    settings.reddit_analysis_backend = backend
+    stop = asyncio.Event()
+    ticker = asyncio.create_task(measure_lag(stop))
+    await asyncio.sleep(TICK * 2)
+
+    started = time.perf_counter()
+    for sample in samples:
+        # Requests arrive one after another, as on a busy worker
+        await accumulate_posts(sample)
+        await asyncio.sleep(0)
+    elapsed = time.perf_counter() - started
+
+    stop.set()
+    lags = sorted(await ticker)
+    return {
+        "elapsed": elapsed,
+        "p50": statistics.median(lags),
+        "p99": lags[min(len(lags) - 1, int(len(lags) * 0.99))],
+        "max": lags[-1],
+    }
+
+
+async def main() -> None:
+    """Parse flags, run both backends and print a report."""
+    parser = argparse.ArgumentParser(description="Reddit analysis loop lag")
+    parser.add_argument("--posts", type=int, default=1000)
+    parser.add_argument("--jobs", type=int, default=20)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    samples = [make_posts(args.posts, args.seed + i) for i in range(args.jobs)]
+    settings.reddit_analysis_process_min_posts = 0
+    # Start the workers up front so process start-up isn't measured
+    get_process_pool().submit(int).result()
+
+    print(f"posts={args.posts} jobs={args.jobs} tick={TICK * 1000:.0f}ms")
+    try:
+        for backend in ("inline", "process"):
+            result = await run(backend, samples)
+            print(
+                f"{backend:>7}: total={result['elapsed'] * 1000:.0f}ms "
+                f"lag p50={result['p50'] * 1000:.1f}ms "
+                f"p99={result['p99'] * 1000:.1f}ms "
+                f"max={result['max'] * 1000:.1f}ms"
+            )
+    finally:
+        shutdown_process_pool()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
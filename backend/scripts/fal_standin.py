@@ -0,0 +1,87 @@
+"""
+FAL Stand-in Server
+
+Serves a local FAL-compatible API with configurable latency, failures and
+image payload sizes, so the engine can be load-tested without FAL costs.
+
+Usage:
+    cd backend
+    python scripts/fal_standin.py --port 8001 --latency-median 2 --failure-rate 0.02
+
+Then start the backend against it:
+    FAL_RUN_URL=http://127.0.0.1:8001/run \\
+    FAL_QUEUE_URL=http://127.0.0.1:8001/queue \\
+    uvicorn app.main:app
+"""
+
+import argparse
+import sys
+from pathlib import Path
+
+# Add backend to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import uvicorn  # noqa: E402
+
+from app.services.fal.standin import (  # noqa: E402
+    DEFAULT_CONFIG,
+    StandInConfig,
+    create_standin_app,
+)
+
+
+def parse_config(argv: list[str] | None = None) -> tuple[StandInConfig, str, int]:
+    """Parse CLI flags into a stand-in config, host and port."""
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8001)
+    parser.add_argument(
+        "--latency-distribution",
+        choices=["fixed", "lognormal", "exponential"],
+        default=DEFAULT_CONFIG["latency_distribution"],
+    )
+    parser.add_argument(
+        "--latency-median", type=float, default=DEFAULT_CONFIG["latency_median"]
+    )
+    parser.add_argument(
+        "--latency-sigma", type=float, default=DEFAULT_CONFIG["latency_sigma"]
+    )
+    parser.add_argument(
+        "--queue-fraction", type=float, default=DEFAULT_CONFIG["queue_fraction"]
+    )
+    parser.add_argument(
+        "--failure-rate", type=float, default=DEFAULT_CONFIG["failure_rate"]
+    )
+    parser.add_argument(
+        "--throttle-rate", type=float, default=DEFAULT_CONFIG["throttle_rate"]
+    )
+    parser.add_argument(
+        "--error-rate", type=float, default=DEFAULT_CONFIG["error_rate"]
+    )
+    parser.add_argument("--image-kb", type=int, default=DEFAULT_CONFIG["image_kb"])
+    parser.add_argument("--seed", type=int, default=None)
+    args = parser.parse_args(argv)
+
+    config: StandInConfig = {
+        "latency_distribution": args.latency_distribution,
+        "latency_median": args.latency_median,
+        "latency_sigma": args.latency_sigma,
+        "queue_fraction": args.queue_fraction,
+        "failure_rate": args.failure_rate,
+        "throttle_rate": args.throttle_rate,
+        "error_rate": args.error_rate,
+        "image_kb": args.image_kb,
+        "seed": args.seed,
+    }
+    return config, args.host, args.port
+
+
+def main() -> None:
+    """Run the stand-in server."""
+    config, host, port = parse_config()
+    print(f"FAL stand-in on http://{host}:{port} with {config}")
+    uvicorn.run(create_standin_app(config), host=host, port=port, log_level="warning")
+
+
+if __name__ == "__main__":
+    main()
@@ -80,6 +80,7 @@ create table executions (
   workflow_id uuid references workflows(id) on delete cascade not null,
   status execution_status default 'PENDING',
   total_cost decimal(10,6),
+  estimated_cost decimal(10,6),  -- Pre-flight estimate, reserves user budget
   error_message text,
   started_at timestamptz default now(),
   finished_at timestamptz
@@ -109,9 +110,18 @@ create table generations (
   image_urls text[] not null,
   aspect_ratio text not null,
   cost decimal(10,6),
+  derivatives jsonb default '[]',  -- Per-image WebP derivative URLs, aligned with image_urls
   created_at timestamptz default now()
 );
 
+-- Extra FAL models merged over the built-in registry (MODEL_REGISTRY_TABLE)
+create table model_registry (
+  model_id text primary key,
+  config jsonb not null,  -- ModelConfig keys: name, price, aspect_format, ...
+  enabled boolean default true not null,
+  updated_at timestamptz default now()
+);
+
 -- ROW LEVEL SECURITY
 alter table users enable row level security;
 alter table workflows enable row level security;
@@ -120,6 +130,7 @@ alter table edges enable row level security;
 alter table executions enable row level security;
 alter table node_executions enable row level security;
 alter table generations enable row level security;
+alter table model_registry enable row level security;  -- Service role only
 
 -- POLICIES
 create policy "Users can view own profile" on users
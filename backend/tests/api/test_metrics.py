@@ -0,0 +1,33 @@
+"""
+Metrics Endpoint Tests
+
+Tests that the operational counters require authentication.
+Run with: pytest tests/api/test_metrics.py -v
+"""
+
+import httpx
+import pytest
+
+from app.api.deps import get_current_user
+from app.main import app
+from app.utils.metrics import get_metrics
+
+
+@pytest.mark.asyncio
+async def test_metrics_require_authentication() -> None:
+    """Test anonymous requests are refused and users see the counters."""
+    get_metrics().reset()
+    get_metrics().increment("fal.hedge_cost_overhead_usd", 0.5)
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://api") as c:
+        anonymous = await c.get("/metrics")
+        assert anonymous.status_code in (401, 403)
+
+        app.dependency_overrides[get_current_user] = lambda: {"id": "user-1"}
+        try:
+            response = await c.get("/metrics")
+        finally:
+            app.dependency_overrides.clear()
+
+    assert response.status_code == 200
+    assert response.json()["fal.hedge_cost_overhead_usd"] == 0.5
@@ -0,0 +1,103 @@
+"""
+Social API Route Tests
+
+Tests ETag/Last-Modified handling, 304 responses and compact bodies.
+Run with: pytest tests/api/test_social.py -v
+"""
+
+import time
+from typing import AsyncIterator
+
+import httpx
+import pytest
+from pytest_mock import MockerFixture
+
+from app.api.deps import get_current_user
+from app.api.routes import social
+from app.main import app
+
+
+@pytest.fixture
+async def client(mocker: MockerFixture) -> AsyncIterator[httpx.AsyncClient]:
+    """Authenticated client with Reddit fetching stubbed out."""
+    fetched_at = time.time() - 100
+    result = {
+        "posts": [
+            {"title": "Dialed in", "score": 12.0, "url": "u/1", "num_comments": 3}
+        ],
+        "keywords": ["espresso", "grinder"],
+        "top_post": "Dialed in",
+        "fallback": False,
+        "fetched_at": fetched_at,
+    }
+    fetch = mocker.patch.object(
+        social, "fetch_subreddit_posts", mocker.AsyncMock(return_value=result)
+    )
+    mocker.patch.object(social, "get_trend_warmer").return_value.record = (
+        mocker.AsyncMock()
+    )
+    app.dependency_overrides[get_current_user] = lambda: {"id": "user-1"}
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://api") as c:
+        c.fetch = fetch  # type: ignore[attr-defined]
+        yield c
+    app.dependency_overrides.clear()
+
+
+@pytest.mark.asyncio
+async def test_unchanged_data_returns_304(client: httpx.AsyncClient) -> None:
+    """Test a matching ETag or Last-Modified revalidates without a body."""
+    params = {"subreddit": "espresso", "limit": 5}
+    first = await client.get("/api/social/reddit", params=params)
+
+    assert first.status_code == 200
+    assert first.json()["posts"][0]["score"] == 12
+    cache_control, max_age = first.headers["cache-control"].split("=")
+    assert cache_control == "private, max-age"
+    assert 195 <= int(max_age) <= 200  # 300s TTL, fetched 100s ago
+    etag = first.headers["etag"]
+
+    again = await client.get(
+        "/api/social/reddit", params=params, headers={"If-None-Match": etag}
+    )
+    assert again.status_code == 304
+    assert again.content == b""
+    assert again.headers["etag"] == etag
+
+    since = await client.get(
+        "/api/social/reddit",
+        params=params,
+        headers={"If-Modified-Since": first.headers["last-modified"]},
+    )
+    assert since.status_code == 304
+
+    client.fetch.return_value = {  # type: ignore[attr-defined]
+        **client.fetch.return_value,  # type: ignore[attr-defined]
+        "fetched_at": time.time(),
+    }
+    changed = await client.get(
+        "/api/social/reddit", params=params, headers={"If-None-Match": etag}
+    )
+    assert changed.status_code == 200
+    assert changed.headers["etag"] != etag
+
+
+@pytest.mark.asyncio
+async def test_compact_and_post_responses(client: httpx.AsyncClient) -> None:
+    """Test compact bodies omit posts and POST keeps working unconditionally."""
+    compact = await client.get(
+        "/api/social/reddit", params={"subreddit": "espresso", "compact": True}
+    )
+    assert compact.json() == {
+        "keywords": ["espresso", "grinder"],
+        "top_post": "Dialed in",
+    }
+
+    posted = await client.post(
+        "/api/social/reddit",
+        json={"subreddit": "espresso"},
+        headers={"If-None-Match": compact.headers["etag"]},
+    )
+    assert posted.status_code == 200
+    assert len(posted.json()["posts"]) == 1
+    assert posted.headers["etag"] != compact.headers["etag"]
@@ -0,0 +1,267 @@
+"""
+Cost Estimate Unit Tests
+
+Tests pre-flight cost estimation and budget admission.
+Run with: pytest tests/services/test_cost_estimate.py -v
+"""
+
+import asyncio
+
+import pytest
+
+from app.config import settings
+from app.models.enums import ExecutionStatus
+from app.services.fal.models import get_edit_model_id, get_model_price
+from app.services.workflow_engine import BudgetExceededError, WorkflowEngine
+from app.services.supabase import executions as executions_module
+from app.services.workflow_engine import engine as engine_module
+from app.services.workflow_engine import runner as runner_module
+from app.services.workflow_engine.cost_estimate import (
+    InvalidWorkflowError,
+    check_budget,
+    estimate_execution_cost,
+)
+
+
+def make_graph(
+    model: str = "fal-ai/flux/schnell",
+    num_images: int = 2,
+    output_config: dict | None = None,
+    image_url: str | None = None,
+    hedge: bool = False,
+) -> tuple[list[dict], list[dict]]:
+    """Build prompt -> image model -> output, with an optional image input."""
+    nodes = [
+        {"id": "prompt", "type": "PROMPT", "config": {"template": "a mug"}},
+        {
+            "id": "image",
+            "type": "IMAGE_MODEL",
+            "config": {
+                "model": model,
+                "parameters": {
+                    "num_images": num_images,
+                    "aspect_ratio": "1:1",
+                    **({"hedge": True} if hedge else {}),
+                },
+            },
+        },
+        {"id": "output", "type": "OUTPUT", "config": output_config or {}},
+    ]
+    edges = [
+        {"source_node_id": "prompt", "target_node_id": "image"},
+        {"source_node_id": "image", "target_node_id": "output"},
+    ]
+    if image_url is not None:
+        nodes.append(
+            {"id": "input", "type": "IMAGE_INPUT", "config": {"image_url": image_url}}
+        )
+        edges.append({"source_node_id": "input", "target_node_id": "prompt"})
+    return nodes, edges
+
+
+def test_estimate_uses_model_price_and_output_override() -> None:
+    """Test the OUTPUT node's num_images wins over the model node's."""
+    nodes, edges = make_graph(num_images=2, output_config={"num_images": 6})
+
+    estimate = estimate_execution_cost(nodes, edges, ["prompt", "image", "output"])
+
+    price = get_model_price("fal-ai/flux/schnell")
+    assert estimate["total_cost"] == pytest.approx(price * 6)
+    assert estimate["nodes"] == [
+        {
+            "node_id": "image",
+            "model_id": "fal-ai/flux/schnell",
+            "num_images": 6,
+            "price_per_image": pytest.approx(price),
+            "cost": pytest.approx(price * 6),
+            "edit": False,
+            "hedge": False,
+        }
+    ]
+
+
+def test_estimate_covers_fallback_models_and_hedges() -> None:
+    """Test a dearer breaker fallback sets the price and hedges double it."""
+    fallback_price = get_model_price("fal-ai/flux/schnell")
+    assert fallback_price > get_model_price("fal-ai/fast-lightning-sdxl")
+
+    nodes, edges = make_graph(model="fal-ai/fast-lightning-sdxl", num_images=2)
+    node = estimate_execution_cost(nodes, edges, ["image"])["nodes"][0]
+    assert node["model_id"] == "fal-ai/fast-lightning-sdxl"
+    assert node["price_per_image"] == pytest.approx(fallback_price)
+    assert node["cost"] == pytest.approx(fallback_price * 2)
+
+    nodes, edges = make_graph(
+        model="fal-ai/fast-lightning-sdxl", num_images=2, hedge=True
+    )
+    node = estimate_execution_cost(nodes, edges, ["image"])["nodes"][0]
+    assert node["hedge"] is True
+    assert node["cost"] == pytest.approx(fallback_price * 4)
+
+
+def test_estimate_prices_the_edit_variant_for_image_inputs() -> None:
+    """Test an upstream image input routes pricing to the edit model."""
+    nodes, edges = make_graph(image_url="https://example.com/ref.png")
+    edit_model = get_edit_model_id("fal-ai/flux/schnell")
+    assert edit_model
+
+    estimate = estimate_execution_cost(nodes, edges, ["input", "prompt", "image"])
+
+    node = estimate["nodes"][0]
+    assert node["edit"] is True
+    assert node["model_id"] == edit_model
+    assert node["cost"] == pytest.approx(get_model_price(edit_model) * 2)
+
+
+def test_estimate_prices_auto_at_the_most_expensive_candidate() -> None:
+    """Test "auto" is priced as an upper bound over eligible models."""
+    nodes, edges = make_graph(model="auto", num_images=1)
+
+    estimate = estimate_execution_cost(nodes, edges, ["prompt", "image"])
+
+    assert estimate["nodes"][0]["price_per_image"] > get_model_price(
+        "fal-ai/fast-lightning-sdxl"
+    )
+
+
+def test_estimate_rejects_invalid_num_images() -> None:
+    """Test a non-positive image count is a configuration error."""
+    nodes, edges = make_graph(num_images=-1)
+
+    with pytest.raises(InvalidWorkflowError, match="num_images"):
+        estimate_execution_cost(nodes, edges, ["image"])
+
+
+def test_check_budget() -> None:
+    """Test per-execution and per-user budgets, with 0 disabling a check."""
+    check_budget(1.0, execution_budget=2.0, user_budget=10.0, user_spent=8.5)
+    check_budget(50.0, execution_budget=0.0, user_budget=0.0, user_spent=100.0)
+
+    with pytest.raises(BudgetExceededError, match="execution") as exc:
+        check_budget(3.0, execution_budget=2.0, user_budget=0.0, user_spent=0.0)
+    assert exc.value.scope == "execution"
+
+    with pytest.raises(BudgetExceededError) as exc:
+        check_budget(1.0, execution_budget=2.0, user_budget=10.0, user_spent=9.5)
+    assert exc.value.scope == "user"
+    assert exc.value.remaining == pytest.approx(0.5)
+
+
+@pytest.mark.asyncio
+async def test_prepare_execution_rejects_over_budget_before_creating_it(
+    mocker,
+) -> None:
+    """Test admission runs before the execution record is created."""
+    nodes, edges = make_graph(num_images=4)
+    mocker.patch.object(engine_module, "get_supabase_client")
+    mocker.patch.object(
+        engine_module,
+        "get_workflow_with_nodes_and_edges",
+        return_value={"nodes": nodes, "edges": edges},
+    )
+    mocker.patch.object(engine_module, "get_user_spend", return_value=0.0)
+    create = mocker.patch.object(engine_module, "create_execution")
+    mocker.patch.object(settings, "execution_budget_usd", 0.001)
+
+    with pytest.raises(BudgetExceededError):
+        await WorkflowEngine().prepare_execution("wf-1", "user-1")
+
+    create.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_prepare_execution_reserves_the_estimate(mocker) -> None:
+    """Test an admitted execution is created with its estimated cost."""
+    nodes, edges = make_graph(num_images=4)
+    mocker.patch.object(engine_module, "get_supabase_client")
+    mocker.patch.object(
+        engine_module,
+        "get_workflow_with_nodes_and_edges",
+        return_value={"nodes": nodes, "edges": edges},
+    )
+    spend = mocker.patch.object(engine_module, "get_user_spend", return_value=1.0)
+    create = mocker.patch.object(
+        engine_module, "create_execution", return_value={"id": "exec-1"}
+    )
+    mocker.patch.object(engine_module, "create_node_executions")
+
+    prepared = await WorkflowEngine().prepare_execution("wf-1", "user-1")
+
+    assert prepared["execution_id"] == "exec-1"
+    spend.assert_awaited_once()
+    assert create.call_args.kwargs["estimated_cost"] == pytest.approx(
+        get_model_price("fal-ai/flux/schnell") * 4
+    )
+
+
+@pytest.mark.asyncio
+async def test_concurrent_admissions_share_the_user_budget(mocker) -> None:
+    """Test two concurrent runs can't both pass the same remaining budget."""
+    nodes, edges = make_graph(num_images=4)
+    cost = get_model_price("fal-ai/flux/schnell") * 4
+    reserved: list[float] = []
+
+    async def spend(*args: object) -> float:
+        await asyncio.sleep(0.01)  # Let the other admission interleave
+        return sum(reserved)
+
+    async def create(*args: object, estimated_cost: float) -> dict:
+        reserved.append(estimated_cost)
+        return {"id": f"exec-{len(reserved)}"}
+
+    mocker.patch.object(engine_module, "get_supabase_client")
+    mocker.patch.object(
+        engine_module,
+        "get_workflow_with_nodes_and_edges",
+        return_value={"nodes": nodes, "edges": edges},
+    )
+    mocker.patch.object(engine_module, "get_user_spend", side_effect=spend)
+    mocker.patch.object(engine_module, "create_execution", side_effect=create)
+    mocker.patch.object(engine_module, "create_node_executions")
+    mocker.patch.object(settings, "user_budget_usd", cost * 1.5)
+
+    results = await asyncio.gather(
+        WorkflowEngine().prepare_execution("wf-1", "user-1"),
+        WorkflowEngine().prepare_execution("wf-1", "user-1"),
+        return_exceptions=True,
+    )
+
+    assert sum(isinstance(r, BudgetExceededError) for r in results) == 1
+    assert reserved == [pytest.approx(cost)]
+
+
+@pytest.mark.asyncio
+async def test_failed_execution_counts_at_what_it_spent(mocker) -> None:
+    """Test a failed run records its spend and isn't charged its estimate."""
+    nodes, edges = make_graph(num_images=4)
+    mocker.patch.object(runner_module, "get_node_executions", return_value=[])
+    mocker.patch.object(runner_module, "is_execution_cancelled", return_value=False)
+    mocker.patch.object(
+        runner_module,
+        "run_single_node",
+        side_effect=[{"cost": 0.01}, RuntimeError("FAL unavailable")],
+    )
+    mocker.patch.object(runner_module, "update_node_execution")
+    update = mocker.patch.object(runner_module, "update_execution_status")
+
+    result = await runner_module.ExecutionRunner(mocker.MagicMock()).run(
+        "exec-1", nodes, edges, ["prompt", "image", "output"], "user-1"
+    )
+
+    assert result["status"] == ExecutionStatus.FAILED
+    assert update.call_args.args[2] == ExecutionStatus.FAILED
+    assert update.call_args.kwargs["total_cost"] == pytest.approx(0.01)
+
+    rows = [
+        {"status": "FAILED", "total_cost": 0.01, "estimated_cost": 1.0},
+        {"status": "CANCELLED", "total_cost": None, "estimated_cost": 1.0},
+        {"status": "RUNNING", "total_cost": None, "estimated_cost": 0.5},
+        {"status": "COMPLETED", "total_cost": 0.25, "estimated_cost": 0.3},
+    ]
+    client = mocker.MagicMock()
+    query = client.table.return_value.select.return_value.eq.return_value
+    query.gte.return_value.execute.return_value.data = rows
+
+    spent = await executions_module.get_user_spend(client, "user-1", 24)
+
+    assert spent == pytest.approx(0.01 + 0.5 + 0.25)
@@ -0,0 +1,74 @@
+"""
+FAL Hedging Unit Tests
+
+Tests hedged requests, loser cancellation and the hedge budget.
+Run with: pytest tests/services/test_fal_hedging.py -v
+"""
+
+import asyncio
+
+import pytest
+
+from app.services.fal.hedging import HedgeBudget, run_hedged
+from app.services.fal.routing import MIN_SAMPLES, get_model_stats
+from app.utils.metrics import get_metrics
+
+MODEL = "test/hedged-model"
+
+
+@pytest.fixture(autouse=True)
+def fast_p90() -> None:
+    """Give the test model a 10ms p90 and reset metrics."""
+    stats = get_model_stats()
+    stats.clear()
+    for _ in range(MIN_SAMPLES):
+        stats.record(MODEL, 0.01, ok=True)
+    get_metrics().reset()
+
+
+@pytest.mark.asyncio
+async def test_slow_call_is_hedged_and_loser_cancelled() -> None:
+    """Test that a duplicate wins over a stuck primary, which is cancelled."""
+    calls: list[asyncio.Event] = []
+    cancelled: list[int] = []
+
+    async def call() -> str:
+        index = len(calls)
+        calls.append(asyncio.Event())
+        try:
+            if index == 0:
+                await asyncio.sleep(10)
+            return f"call-{index}"
+        except asyncio.CancelledError:
+            cancelled.append(index)
+            raise
+
+    result = await run_hedged(MODEL, call, 0.01, HedgeBudget(1.0, 1.0))
+    await asyncio.sleep(0)
+
+    assert result == "call-1"
+    assert cancelled == [0]
+    metrics = get_metrics()
+    assert metrics.get("fal.hedges_issued") == 1
+    assert metrics.get("fal.hedges_won") == 1
+    assert metrics.get("fal.hedge_cost_overhead_usd") == pytest.approx(0.01)
+
+
+@pytest.mark.asyncio
+async def test_budget_limits_hedges() -> None:
+    """Test that hedges stop once the hourly spend cap is reached."""
+    count = 0
+
+    async def call() -> int:
+        nonlocal count
+        count += 1
+        await asyncio.sleep(0.03)
+        return count
+
+    budget = HedgeBudget(max_ratio=1.0, max_spend_per_hour=0.015)
+    await run_hedged(MODEL, call, 0.01, budget)
+    await run_hedged(MODEL, call, 0.01, budget)
+
+    assert count == 3
+    assert get_metrics().get("fal.hedges_issued") == 1
+    assert get_metrics().get("fal.hedges_skipped_budget") == 1
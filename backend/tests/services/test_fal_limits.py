@@ -0,0 +1,112 @@
+"""
+FAL Limits Unit Tests
+
+Tests per-model token buckets, circuit breakers and model fallback.
+Run with: pytest tests/services/test_fal_limits.py -v
+"""
+
+from pathlib import Path
+
+import pytest
+
+from app.services.fal.limits import ModelLimiter, ModelUnavailableError
+from app.services.fal.service import FalRequestError
+from app.utils.state_store import MemoryStateStore, SQLiteStateStore
+
+MODEL = "fal-ai/flux/schnell"
+
+
+class FakeClock:
+    """Manually advanced clock."""
+
+    def __init__(self) -> None:
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+async def fail(limiter: ModelLimiter, status_code: int = 503) -> None:
+    """Run one call through the limiter that fails upstream."""
+    with pytest.raises(FalRequestError):
+        async with limiter.acquire(MODEL):
+            raise FalRequestError("upstream", status_code=status_code)
+
+
+@pytest.mark.asyncio
+async def test_breaker_opens_fails_fast_and_half_opens() -> None:
+    """Test the closed -> open -> half-open -> closed cycle."""
+    clock = FakeClock()
+    limiter = ModelLimiter(
+        MemoryStateStore(), failure_threshold=2, cooldown_seconds=30, clock=clock
+    )
+
+    await fail(limiter, status_code=422)  # Client errors do not count
+    await fail(limiter)
+    await fail(limiter)
+
+    with pytest.raises(ModelUnavailableError):
+        async with limiter.acquire(MODEL):
+            pass
+    assert await limiter.select_model(MODEL) == "fal-ai/fast-lightning-sdxl"
+
+    clock.now += 31
+    async with limiter.acquire(MODEL):
+        pass
+    assert await limiter.is_available(MODEL)
+    assert await limiter.select_model(MODEL) == MODEL
+
+
+@pytest.mark.asyncio
+async def test_failed_half_open_trial_reopens() -> None:
+    """Test that a failing trial call reopens the breaker immediately."""
+    clock = FakeClock()
+    limiter = ModelLimiter(
+        MemoryStateStore(), failure_threshold=1, cooldown_seconds=30, clock=clock
+    )
+    await fail(limiter)
+    clock.now += 31
+    await fail(limiter)
+
+    assert not await limiter.is_available(MODEL)
+
+
+@pytest.mark.asyncio
+async def test_client_errors_are_neutral() -> None:
+    """Test 422s neither reset the failure count nor close a half-open breaker."""
+    clock = FakeClock()
+    limiter = ModelLimiter(
+        MemoryStateStore(), failure_threshold=2, cooldown_seconds=30, clock=clock
+    )
+
+    await fail(limiter)
+    await fail(limiter, status_code=422)
+    await fail(limiter)
+    assert not await limiter.is_available(MODEL)  # 5xx/422 mix still trips
+
+    clock.now += 31
+    await fail(limiter, status_code=422)  # Trial told us nothing
+    state = await limiter.store.get(f"breaker:{MODEL}")
+    assert state is not None and state["status"] == "open"
+    # ...but its slot is free: the next call is admitted as a new trial
+    async with limiter.acquire(MODEL):
+        pass
+    state = await limiter.store.get(f"breaker:{MODEL}")
+    assert state is not None and state["status"] == "closed"
+
+
+@pytest.mark.asyncio
+async def test_token_bucket_shared_through_sqlite(tmp_path: Path) -> None:
+    """Test that two limiters on one SQLite file share a token bucket."""
+    clock = FakeClock()
+    path = tmp_path / "limits.sqlite3"
+    first = ModelLimiter(SQLiteStateStore(path), clock=clock)
+    second = ModelLimiter(SQLiteStateStore(path), clock=clock)
+
+    take = lambda state: first._take(state, 2.0, 2)  # noqa: E731
+    assert await first.store.update(f"bucket:{MODEL}", take) == 0.0
+    assert await second.store.update(f"bucket:{MODEL}", take) == 0.0
+    assert await first.store.update(f"bucket:{MODEL}", take) == pytest.approx(0.5)
+
+    clock.now += 0.5
+    assert await second.store.update(f"bucket:{MODEL}", take) == 0.0
@@ -0,0 +1,81 @@
+"""
+FAL Routing Unit Tests
+
+Tests auto model selection from rolling latency statistics and price.
+Run with: pytest tests/services/test_fal_routing.py -v
+"""
+
+import pytest
+from pytest_mock import MockerFixture
+
+from app.services.fal.routing import MIN_SAMPLES, ModelStats, choose_model
+from app.services.node_executors import image_model
+
+
+def fill(stats: ModelStats, model_id: str, latency: float, ok: bool = True) -> None:
+    """Record enough identical calls for a model to count as measured."""
+    for _ in range(MIN_SAMPLES):
+        stats.record(model_id, latency, ok)
+
+
+def test_snapshot_reports_p90_and_error_rate() -> None:
+    """Test rolling p90 over successes and error rate over all calls."""
+    stats = ModelStats(window=10)
+    for latency in range(1, 10):
+        stats.record("m", float(latency), ok=True)
+    stats.record("m", 99.0, ok=False)
+
+    snapshot = stats.snapshot("m")
+    assert snapshot["samples"] == 10
+    assert snapshot["p90_latency"] == 9.0
+    assert snapshot["error_rate"] == pytest.approx(0.1)
+
+
+@pytest.mark.asyncio
+async def test_picks_cheapest_model_within_slo() -> None:
+    """Test that the cheapest model wins unless it misses the SLO."""
+    stats = ModelStats()
+    fill(stats, "fal-ai/fast-lightning-sdxl", 30.0)
+    fill(stats, "fal-ai/flux/schnell", 4.0)
+    fill(stats, "fal-ai/nano-banana", 6.0)
+
+    decision = await choose_model("1:1", False, 10.0, stats=stats)
+
+    assert decision["model_id"] == "fal-ai/flux/schnell"
+    rejected = {c["model_id"]: c["rejected"] for c in decision["candidates"]}
+    assert rejected["fal-ai/fast-lightning-sdxl"] == "p90 latency above SLO"
+
+
+@pytest.mark.asyncio
+async def test_respects_aspect_ratio_and_edit_variants() -> None:
+    """Test that 4:5 edits skip models that only approximate the ratio."""
+    decision = await choose_model("4:5", True, 10.0, stats=ModelStats())
+
+    assert decision["model_id"] == "fal-ai/nano-banana/edit"
+    rejected = {c["model_id"]: c["rejected"] for c in decision["candidates"]}
+    assert rejected["fal-ai/flux/schnell/redux"] == "aspect ratio not supported"
+    assert rejected["fal-ai/fast-lightning-sdxl/image-to-image"] == (
+        "aspect ratio not supported"
+    )
+
+
+@pytest.mark.asyncio
+async def test_latency_slo_never_reaches_fal(mocker: MockerFixture) -> None:
+    """Test the SLO is dropped from a concrete model's FAL parameters."""
+    generate = mocker.patch.object(
+        image_model,
+        "generate_images",
+        mocker.AsyncMock(return_value={"image_urls": [], "cost": 0.0}),
+    )
+
+    await image_model.ImageModelExecutor().execute(
+        {"prompt-node": {"prompt": "mug"}},
+        {
+            "model": "fal-ai/flux/schnell",
+            "parameters": {"latency_slo_seconds": 5, "seed": 1},
+        },
+    )
+
+    parameters = generate.call_args.kwargs["parameters"]
+    assert "latency_slo_seconds" not in parameters
+    assert parameters["seed"] == 1
@@ -0,0 +1,94 @@
+"""
+FAL Service Unit Tests
+
+Tests queue-based submit/poll execution using mocked HTTP responses.
+Run with: pytest tests/services/test_fal_service.py -v
+"""
+
+import asyncio
+
+import pytest
+import respx
+from httpx import Response
+
+from app.services.fal.service import FalRequestError, FalService
+
+QUEUE_URL = "https://queue.fal.run"
+APP = "fal-ai/flux/schnell"
+REQUEST_BASE = f"{QUEUE_URL}/{APP}/requests/req-1"
+
+
+@pytest.fixture
+async def service():
+    """FalService with an explicit test key."""
+    fal = FalService(api_key="test-key")
+    yield fal
+    await fal.aclose()
+
+
+def _mock_submit() -> respx.Route:
+    return respx.post(f"{QUEUE_URL}/{APP}").mock(
+        return_value=Response(
+            200,
+            json={
+                "request_id": "req-1",
+                "status_url": f"{REQUEST_BASE}/status",
+                "response_url": REQUEST_BASE,
+                "cancel_url": f"{REQUEST_BASE}/cancel",
+            },
+        )
+    )
+
+
+@pytest.mark.asyncio
+@respx.mock
+async def test_subscribe_polls_and_reports_progress(service: FalService) -> None:
+    """Test submit, status polling, progress events and result fetch."""
+    submit = _mock_submit()
+    respx.get(f"{REQUEST_BASE}/status").mock(
+        side_effect=[
+            Response(200, json={"status": "IN_QUEUE", "queue_position": 2}),
+            Response(200, json={"status": "IN_PROGRESS"}),
+            Response(200, json={"status": "COMPLETED"}),
+        ]
+    )
+    respx.get(REQUEST_BASE).mock(
+        return_value=Response(200, json={"images": [{"url": "https://img/1.png"}]})
+    )
+
+    events: list[dict] = []
+    result = await service.subscribe(APP, {"prompt": "x"}, on_progress=events.append)
+
+    assert result["images"] == [{"url": "https://img/1.png"}]
+    assert submit.calls[0].request.headers["Authorization"] == "Key test-key"
+    assert [e["status"] for e in events] == ["IN_QUEUE", "IN_PROGRESS", "COMPLETED"]
+    assert events[0]["queue_position"] == 2
+
+
+@pytest.mark.asyncio
+@respx.mock
+async def test_subscribe_timeout_cancels_upstream(service: FalService) -> None:
+    """Test that a timed-out request is cancelled on FAL."""
+    _mock_submit()
+    respx.get(f"{REQUEST_BASE}/status").mock(
+        return_value=Response(200, json={"status": "IN_PROGRESS"})
+    )
+    cancel = respx.put(f"{REQUEST_BASE}/cancel").mock(return_value=Response(202))
+
+    with pytest.raises(TimeoutError):
+        await service.subscribe(APP, {"prompt": "x"}, timeout=0.1)
+
+    await asyncio.sleep(0)
+    assert cancel.called
+
+
+@pytest.mark.asyncio
+@respx.mock
+async def test_submit_error_raises_with_status(service: FalService) -> None:
+    """Test that HTTP errors surface as FalRequestError with a status code."""
+    respx.post(f"{QUEUE_URL}/{APP}").mock(return_value=Response(429, text="slow down"))
+
+    with pytest.raises(FalRequestError) as exc_info:
+        await service.subscribe(APP, {"prompt": "x"})
+
+    assert exc_info.value.status_code == 429
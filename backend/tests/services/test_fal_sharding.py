@@ -0,0 +1,75 @@
+"""
+FAL Sharding Unit Tests
+
+Tests splitting large num_images requests into parallel sub-requests.
+Run with: pytest tests/services/test_fal_sharding.py -v
+"""
+
+import pytest
+from pytest_mock import MockerFixture
+
+from app.services.fal import client
+from app.services.fal.cache import GenerationCache
+from app.services.fal.models import plan_shards
+from app.utils.cache import MemoryLRUCache
+
+
+def test_plan_shards_uses_registry_sizes() -> None:
+    """Test that requests are split by the model's preferred shard size."""
+    assert plan_shards("fal-ai/flux/schnell", 1) == [1]
+    assert plan_shards("fal-ai/flux/schnell", 2) == [2]
+    assert plan_shards("fal-ai/flux/schnell", 5) == [2, 2, 1]
+    assert plan_shards("fal-ai/fast-lightning-sdxl", 8) == [4, 4]
+    assert plan_shards("unknown/model", 8) == [8]
+
+
+@pytest.mark.asyncio
+async def test_sharded_generation_tolerates_partial_failure(
+    mocker: MockerFixture,
+) -> None:
+    """Test that failed shards are skipped and the partial result not cached."""
+
+    async def subscribe(
+        model_id: str, params: dict[str, object], on_progress: object = None
+    ) -> dict[str, object]:
+        seed = params["seed"]
+        if seed == 11:
+            raise RuntimeError("shard failed")
+        return {
+            "images": [
+                {"url": f"https://fal.media/{seed}-{i}.png"}
+                for i in range(params["num_images"])  # type: ignore[call-overload]
+            ],
+            "has_nsfw_concepts": [False] * params["num_images"],  # type: ignore
+        }
+
+    service = mocker.MagicMock()
+    service.subscribe = mocker.AsyncMock(side_effect=subscribe)
+    mocker.patch.object(client, "get_fal_service", return_value=service)
+    cache = GenerationCache(MemoryLRUCache(), ttl=60)
+    mocker.patch.object(client, "get_generation_cache", return_value=cache)
+
+    result = await client.generate_images(
+        "fal-ai/flux/schnell", "mug", 5, {"seed": 10}
+    )
+
+    seeds = [call.args[1]["seed"] for call in service.subscribe.await_args_list]
+    assert sorted(seeds) == [10, 11, 12]
+    assert result["image_urls"] == [
+        "https://fal.media/10-0.png",
+        "https://fal.media/10-1.png",
+        "https://fal.media/12-0.png",
+    ]
+    assert result["has_nsfw_concepts"] == [False, False, False]
+    assert result["seeds"] == [10, 12]
+    assert result["failed_shards"] == 1
+    price = client.get_model_price("fal-ai/flux/schnell")
+    assert result["cost"] == pytest.approx(3 * price)  # type: ignore[operator]
+
+
+    # A repeat runs again instead of serving the short result from cache
+    again = await client.generate_images(
+        "fal-ai/flux/schnell", "mug", 5, {"seed": 10}
+    )
+    assert again["cache_hit"] is False
+    assert service.subscribe.await_count == 6
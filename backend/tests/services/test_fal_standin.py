@@ -0,0 +1,67 @@
+"""
+FAL Stand-in Unit Tests
+
+Tests FalService against the local stand-in server over ASGI.
+Run with: pytest tests/services/test_fal_standin.py -v
+"""
+
+import httpx
+import pytest
+
+from app.services.fal.service import FalRequestError, FalService
+from app.services.fal.standin import StandInConfig, create_standin_app
+
+
+def make_service(config: StandInConfig) -> FalService:
+    """FalService routed to an in-process stand-in."""
+    transport = httpx.ASGITransport(app=create_standin_app(config))
+    return FalService(
+        api_key="test",
+        run_url="http://standin/run",
+        queue_url="http://standin/queue",
+        transport=transport,
+    )
+
+
+@pytest.mark.asyncio
+async def test_queue_roundtrip_returns_images() -> None:
+    """Test submit, status polling and result through the stand-in."""
+    service = make_service({"latency_distribution": "fixed", "latency_median": 0.0})
+    events: list[str] = []
+
+    result = await service.subscribe(
+        "fal-ai/flux/schnell",
+        {"prompt": "mug", "num_images": 2, "seed": 7},
+        on_progress=lambda event: events.append(event["status"]),
+    )
+    await service.aclose()
+
+    assert len(result["images"]) == 2  # type: ignore[arg-type]
+    assert result["seed"] == 7
+    assert events[-1] == "COMPLETED"
+
+
+@pytest.mark.asyncio
+async def test_injected_failures_and_throttling() -> None:
+    """Test that failure and throttle rates surface as FAL errors."""
+    failing = make_service({"latency_median": 0.0, "failure_rate": 1.0})
+    with pytest.raises(FalRequestError, match="stand-in failure"):
+        await failing.subscribe("fal-ai/flux/schnell", {"prompt": "mug"})
+    await failing.aclose()
+
+    throttled = make_service({"throttle_rate": 1.0})
+    with pytest.raises(FalRequestError) as exc_info:
+        await throttled.run("openrouter/router", {"prompt": "mug"})
+    await throttled.aclose()
+    assert exc_info.value.status_code == 429
+
+
+@pytest.mark.asyncio
+async def test_run_serves_llm_output() -> None:
+    """Test the synchronous endpoint used for prompt optimization."""
+    service = make_service({"latency_distribution": "fixed", "latency_median": 0.0})
+
+    result = await service.run("openrouter/router", {"prompt": "mug"})
+    await service.aclose()
+
+    assert result["output"] == "Optimized: mug"
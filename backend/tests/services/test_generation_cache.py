@@ -0,0 +1,72 @@
+"""
+Generation Cache Unit Tests
+
+Tests cache backends and seed-pinned generation caching.
+Run with: pytest tests/services/test_generation_cache.py -v
+"""
+
+from pathlib import Path
+
+import pytest
+from pytest_mock import MockerFixture
+
+from app.services.fal import client
+from app.services.fal.cache import GenerationCache, make_generation_key
+from app.utils.cache import MemoryLRUCache, SQLiteCache
+
+FAL_RESULT = {"images": [{"url": "https://fal.media/1.png"}], "seed": 42}
+
+
+@pytest.mark.asyncio
+async def test_memory_lru_evicts_oldest() -> None:
+    """Test that the LRU drops the least recently used entry."""
+    cache = MemoryLRUCache(max_entries=2)
+    await cache.set("a", 1)
+    await cache.set("b", 2)
+    await cache.get("a")
+    await cache.set("c", 3)
+
+    assert await cache.get("b") is None
+    assert await cache.get("a") == 1
+
+
+@pytest.mark.asyncio
+async def test_sqlite_cache_roundtrip_and_expiry(tmp_path: Path) -> None:
+    """Test that the SQLite backend stores JSON values and honors TTL."""
+    cache = SQLiteCache(tmp_path / "cache.sqlite3")
+    await cache.set("key", {"image_urls": ["x"]}, ttl=60)
+    await cache.set("expired", {"image_urls": ["y"]}, ttl=-1)
+
+    assert await cache.get("key") == {"image_urls": ["x"]}
+    assert await cache.get("expired") is None
+
+
+def test_key_requires_seed_and_opt_in() -> None:
+    """Test that only seeded requests on cacheable models get a key."""
+    params = {"prompt": "mug", "num_images": 1}
+
+    assert make_generation_key("fal-ai/flux/schnell", params) is None
+    assert make_generation_key("fal-ai/flux/schnell", {**params, "seed": 1})
+    assert make_generation_key("fal-ai/nano-banana", {**params, "seed": 1}) is None
+
+
+@pytest.mark.asyncio
+async def test_seeded_generation_served_from_cache(mocker: MockerFixture) -> None:
+    """Test that a repeated seeded request skips FAL and costs nothing."""
+    service = mocker.MagicMock()
+    service.subscribe = mocker.AsyncMock(return_value=FAL_RESULT)
+    mocker.patch.object(client, "get_fal_service", return_value=service)
+    mocker.patch.object(
+        client,
+        "get_generation_cache",
+        return_value=GenerationCache(MemoryLRUCache(), ttl=60),
+    )
+
+    params = {"seed": 42, "aspect_ratio": "1:1"}
+    first = await client.generate_images("fal-ai/flux/schnell", "mug", 1, params)
+    second = await client.generate_images("fal-ai/flux/schnell", "mug", 1, params)
+
+    assert service.subscribe.await_count == 1
+    assert first["cache_hit"] is False and first["cost"] > 0
+    assert second["cache_hit"] is True and second["cost"] == 0.0
+    assert second["image_urls"] == first["image_urls"]
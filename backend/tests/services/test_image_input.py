@@ -0,0 +1,133 @@
+"""
+Image Input Unit Tests
+
+Tests IMAGE_INPUT validation, downscaling, local caching and the
+public-host check on fetches.
+Run with: pytest tests/services/test_image_input.py -v
+"""
+
+import io
+from pathlib import Path
+
+import pytest
+import respx
+from httpx import Response
+from PIL import Image
+from pytest_mock import MockerFixture
+
+from app.services.media import ImageInputCache, normalize_input_image
+from app.services.media import inputs
+
+IMAGE_URL = "https://cdn.example.com/product.png"
+
+
+@pytest.fixture(autouse=True)
+def public_dns(mocker: MockerFixture) -> None:
+    """Resolve test hosts to a public address without real DNS."""
+    mocker.patch.object(
+        inputs, "_resolve", mocker.AsyncMock(return_value=["93.184.216.34"])
+    )
+
+
+def _png_bytes(width: int, height: int) -> bytes:
+    """Encode a solid-color PNG of the given size."""
+    buffer = io.BytesIO()
+    Image.new("RGB", (width, height), (10, 20, 30)).save(buffer, format="PNG")
+    return buffer.getvalue()
+
+
+def test_oversize_image_is_downscaled() -> None:
+    """Test that images above the max dimension are resized."""
+    data, content_type, width, height = normalize_input_image(
+        _png_bytes(4000, 2000), 2048
+    )
+
+    assert (width, height) == (2048, 1024)
+    assert content_type == "image/jpeg"
+    with Image.open(io.BytesIO(data)) as image:
+        assert image.size == (2048, 1024)
+
+
+def test_invalid_images_rejected() -> None:
+    """Test that unreadable and tiny images raise ValueError."""
+    with pytest.raises(ValueError):
+        normalize_input_image(b"not an image", 2048)
+    with pytest.raises(ValueError):
+        normalize_input_image(_png_bytes(16, 16), 2048)
+
+
+def test_decompression_bombs_rejected(mocker: MockerFixture) -> None:
+    """Test that Pillow's decompression bomb warning and error are ValueErrors."""
+    mocker.patch.object(Image, "MAX_IMAGE_PIXELS", 100 * 100)
+
+    with pytest.raises(ValueError, match="too many pixels"):
+        normalize_input_image(_png_bytes(120, 120), 2048)  # Warning range
+    with pytest.raises(ValueError, match="too many pixels"):
+        normalize_input_image(_png_bytes(300, 300), 2048)  # Error range
+
+
+@pytest.mark.asyncio
+@respx.mock
+async def test_repeated_input_hits_cache(
+    tmp_path: Path, mocker: MockerFixture
+) -> None:
+    """Test that the second prepare call is served from the local cache."""
+    respx.head(IMAGE_URL).mock(
+        return_value=Response(200, headers={"content-type": "image/png"})
+    )
+    get_route = respx.get(IMAGE_URL).mock(
+        return_value=Response(
+            200, content=_png_bytes(512, 512), headers={"content-type": "image/png"}
+        )
+    )
+    mocker.patch.object(inputs, "_cache", ImageInputCache(tmp_path))
+    mocker.patch.object(
+        inputs, "run_in_process", mocker.AsyncMock(side_effect=lambda f, *a: f(*a))
+    )
+    rehost = mocker.patch.object(
+        inputs, "_rehost", mocker.AsyncMock(return_value="https://storage/x.png")
+    )
+
+    first = await inputs.prepare_image_input(IMAGE_URL, "user-1")
+    second = await inputs.prepare_image_input(IMAGE_URL, "user-1")
+
+    assert first["cache_hit"] is False
+    assert second["cache_hit"] is True
+    assert second["image_url"] == "https://storage/x.png"
+    assert get_route.call_count == 1
+    assert rehost.await_count == 1
+
+
+@pytest.mark.asyncio
+@respx.mock
+async def test_non_image_url_rejected(tmp_path: Path, mocker: MockerFixture) -> None:
+    """Test that a non-image content type fails before any paid call."""
+    respx.head(IMAGE_URL).mock(
+        return_value=Response(200, headers={"content-type": "text/html"})
+    )
+    mocker.patch.object(inputs, "_cache", ImageInputCache(tmp_path))
+
+    with pytest.raises(ValueError, match="not an image"):
+        await inputs.prepare_image_input(IMAGE_URL, "user-1")
+
+
+@pytest.mark.asyncio
+@respx.mock
+async def test_internal_hosts_rejected(tmp_path: Path, mocker: MockerFixture) -> None:
+    """Test that internal addresses are refused, including after a redirect."""
+    mocker.patch.object(inputs, "_cache", ImageInputCache(tmp_path))
+    metadata = respx.get("http://169.254.169.254/latest/meta-data")
+    respx.head(IMAGE_URL).mock(
+        return_value=Response(
+            302, headers={"location": "http://169.254.169.254/latest/meta-data"}
+        )
+    )
+
+    for url in ("http://127.0.0.1/x.png", "http://[::1]/x.png", IMAGE_URL):
+        with pytest.raises(ValueError, match="not a public address"):
+            await inputs.prepare_image_input(url, "user-1")
+
+    inputs._resolve.return_value = ["10.0.0.5"]  # type: ignore[attr-defined]
+    with pytest.raises(ValueError, match="not a public address"):
+        await inputs.prepare_image_input("https://intranet.example.com/a.png")
+    assert not metadata.called
@@ -0,0 +1,45 @@
+"""
+Media Derivative Unit Tests
+
+Tests WebP derivative rendering used for gallery thumbnails and previews.
+Run with: pytest tests/services/test_media_derivatives.py -v
+"""
+
+import io
+
+from PIL import Image
+
+from app.services.media import render_derivatives, resolve_duplicate_derivatives
+
+
+def _png_bytes(width: int, height: int) -> bytes:
+    """Encode a solid-color PNG of the given size."""
+    buffer = io.BytesIO()
+    Image.new("RGB", (width, height), (200, 120, 40)).save(buffer, format="PNG")
+    return buffer.getvalue()
+
+
+def test_derivatives_fit_inside_boxes() -> None:
+    """Test that derivatives are WebP and fit within their spec box."""
+    rendered = render_derivatives(_png_bytes(1024, 1792))
+
+    with Image.open(io.BytesIO(rendered["thumbnail"])) as thumb:
+        assert thumb.format == "WEBP"
+        assert max(thumb.size) == 320
+
+    with Image.open(io.BytesIO(rendered["story"])) as story:
+        assert story.size[1] <= 1920 and story.size[0] <= 1080
+
+
+def test_duplicate_sizes_are_skipped_and_resolved() -> None:
+    """Test that a small source only renders once and reuses the URL."""
+    rendered = render_derivatives(_png_bytes(300, 300))
+
+    assert list(rendered) == ["thumbnail"]
+
+    resolved = resolve_duplicate_derivatives({"thumbnail": "thumb-url"})
+    assert resolved == {
+        "thumbnail": "thumb-url",
+        "feed": "thumb-url",
+        "story": "thumb-url",
+    }
@@ -0,0 +1,92 @@
+"""
+Model Registry Unit Tests
+
+Tests compiled model descriptors, extra model files and atomic swaps.
+Run with: pytest tests/services/test_model_registry.py -v
+"""
+
+import json
+from pathlib import Path
+
+import pytest
+
+from app.services.fal import models
+from app.services.fal.models import (
+    MODELS,
+    compile_registry,
+    get_model_price,
+    normalize_params,
+)
+from app.services.fal.registry import reload_registry
+
+
+@pytest.fixture
+def restore_registry() -> object:
+    """Put the built-in registry back after the test."""
+    original = models.get_registry()
+    yield original
+    models.swap_registry(original)
+
+
+def test_descriptor_normalizes_like_the_registry() -> None:
+    """Test precomputed aspect mapping and unsupported param removal."""
+    params = {"prompt": "mug", "aspect_ratio": "9:16", "guidance_scale": 3.5}
+
+    assert normalize_params("fal-ai/flux/schnell", params) == {
+        "prompt": "mug",
+        "image_size": "portrait_16_9",
+        "guidance_scale": 3.5,
+    }
+    assert normalize_params("fal-ai/fast-lightning-sdxl", params) == {
+        "prompt": "mug",
+        "image_size": "portrait_16_9",
+    }
+
+
+def test_descriptors_are_immutable() -> None:
+    """Test that descriptors and their config views reject writes."""
+    model = models.get_registry().get("fal-ai/flux/schnell")
+    assert model is not None
+    assert model.edit_model_id == "fal-ai/flux/schnell/redux"
+
+    with pytest.raises(AttributeError):
+        model.price = 0.0  # type: ignore[misc]
+    with pytest.raises(TypeError):
+        model.config["price"] = 0.0  # type: ignore[index]
+
+
+def test_compile_rejects_unknown_links() -> None:
+    """Test that a fallback to an unknown model fails compilation."""
+    configs = {"a": {"name": "A", "price": 0.01, "fallback_model": "missing"}}
+
+    with pytest.raises(ValueError, match="unknown model"):
+        compile_registry(configs)  # type: ignore[arg-type]
+
+
+@pytest.mark.asyncio
+async def test_reload_merges_file_and_swaps(
+    tmp_path: Path, restore_registry: object
+) -> None:
+    """Test that a model file adds models and overrides built-in prices."""
+    path = tmp_path / "models.json"
+    path.write_text(
+        json.dumps(
+            {
+                "models": {
+                    "fal-ai/flux/schnell": {"price": 0.004},
+                    "fal-ai/new-model": {"name": "New", "price": 0.05},
+                }
+            }
+        )
+    )
+
+    await reload_registry(str(path))
+
+    assert get_model_price("fal-ai/flux/schnell") == 0.004
+    assert get_model_price("fal-ai/new-model") == 0.05
+    assert MODELS["fal-ai/flux/schnell"]["price"] == 0.003
+
+    path.write_text(json.dumps({"bad": {"price": 1}}))
+    with pytest.raises(ValueError):
+        await reload_registry(str(path))
+    assert get_model_price("fal-ai/new-model") == 0.05
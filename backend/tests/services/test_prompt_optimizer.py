@@ -0,0 +1,91 @@
+"""
+Prompt Optimizer Unit Tests
+
+Tests cached, time-bounded prompt optimization and batch mode.
+Run with: pytest tests/services/test_prompt_optimizer.py -v
+"""
+
+import asyncio
+
+import pytest
+from pytest_mock import MockerFixture
+
+from app.services.fal import prompts
+from app.services.fal.prompts import PromptOptimizer, make_prompt_key
+from app.utils.cache import MemoryLRUCache
+from app.utils.metrics import get_metrics
+
+
+@pytest.fixture
+def service(mocker: MockerFixture) -> object:
+    """FAL service whose LLM call echoes the prompt in upper case."""
+
+    async def run(app: str, arguments: dict, timeout: float) -> dict:
+        await asyncio.sleep(0.01)
+        return {"output": f" {arguments['prompt'].upper()} "}
+
+    fal = mocker.MagicMock()
+    fal.run = mocker.AsyncMock(side_effect=run)
+    mocker.patch.object(prompts, "get_fal_service", return_value=fal)
+    get_metrics().reset()
+    return fal
+
+
+def test_key_ignores_whitespace_and_tracks_version() -> None:
+    """Test that the key normalizes whitespace but not the system prompt."""
+    assert make_prompt_key("red  mug\n") == make_prompt_key("red mug")
+    assert make_prompt_key("red mug", "v2") != make_prompt_key("red mug")
+
+
+@pytest.mark.asyncio
+async def test_repeated_prompt_served_from_cache(service: object) -> None:
+    """Test that a second optimization skips the LLM and records a hit."""
+    optimizer = PromptOptimizer(MemoryLRUCache(), 60, timeout=1, upstream_timeout=5)
+
+    assert await optimizer.optimize("red mug") == "RED MUG"
+    assert await optimizer.optimize("red   mug") == "RED MUG"
+
+    assert service.run.await_count == 1  # type: ignore[attr-defined]
+    metrics = get_metrics()
+    assert metrics.get("prompt_optimizer.hit_rate") == 0.5
+    assert metrics.get("prompt_optimizer.latency_saved_seconds") > 0
+
+
+@pytest.mark.asyncio
+async def test_timeout_falls_back_and_warms_cache(service: object) -> None:
+    """Test that a slow LLM call returns the raw prompt, then fills the cache."""
+    optimizer = PromptOptimizer(
+        MemoryLRUCache(), 60, timeout=0.001, upstream_timeout=5
+    )
+
+    assert await optimizer.optimize("red mug") == "red mug"
+    assert get_metrics().get("prompt_optimizer.timeouts") == 1
+
+    await asyncio.sleep(0.05)
+    assert await optimizer.optimize("red mug") == "RED MUG"
+    assert get_metrics().get("prompt_optimizer.cache_hits") == 1
+    assert service.run.await_count == 1  # type: ignore[attr-defined]
+
+
+@pytest.mark.asyncio
+async def test_concurrent_prompts_share_one_call(service: object) -> None:
+    """Test that concurrent optimizations of one prompt make one LLM call."""
+    optimizer = PromptOptimizer(None, 60, timeout=1, upstream_timeout=5)
+
+    results = await asyncio.gather(
+        optimizer.optimize("red mug"), optimizer.optimize("red  mug")
+    )
+
+    assert results == ["RED MUG", "RED MUG"]
+    assert service.run.await_count == 1  # type: ignore[attr-defined]
+
+
+@pytest.mark.asyncio
+async def test_batch_keeps_order_and_dedupes(service: object) -> None:
+    """Test that batch mode keeps input order and calls once per prompt."""
+    optimizer = PromptOptimizer(None, 60, timeout=1, upstream_timeout=5)
+
+    result = await optimizer.optimize_many(["a", "b", "a"])
+
+    assert result == ["A", "B", "A"]
+    assert service.run.await_count == 2  # type: ignore[attr-defined]
@@ -0,0 +1,108 @@
+"""
+Reddit Analyzer Unit Tests
+
+Tests noise filtering, keyword extraction, incremental accumulation and
+process pool offloading.
+Run with: pytest tests/services/test_reddit_analyzer.py -v
+"""
+
+import pickle
+from concurrent.futures.process import BrokenProcessPool
+
+import pytest
+from pytest_mock import MockerFixture
+
+from app.config import settings
+from app.services.reddit import analysis
+from app.services.reddit.analyzer import InsightAccumulator, extract_insights
+from app.services.reddit.constants import FALLBACK_DATA
+
+
+def test_noise_posts_are_ignored_when_quality_posts_exist() -> None:
+    """Test any noise pattern excludes a post from top post and keywords."""
+    posts: list[dict[str, object]] = [
+        {"title": "[MOD] Weekly megathread rules", "score": 5000},
+        {"title": "Daily question thread: grinders", "score": 4000},
+        {"title": "Ask anything about kettles", "score": 3000},
+        {"title": "Finally   dialed my espresso-machine in!", "score": 40},
+        {"title": "Espresso beans from a local roaster", "score": 10},
+    ]
+
+    insights = extract_insights(posts, "espresso")
+
+    assert insights["top_post"] == "Finally dialed my espresso-machine in!"
+    keywords: list = insights["keywords"]  # type: ignore[assignment]
+    assert keywords[:2] == ["finally", "dialed"]
+    assert "espresso-machine" in keywords
+    assert not {"megathread", "grinders", "kettles"} & set(keywords)
+
+
+def test_only_noise_posts_still_produce_insights() -> None:
+    """Test noise is used when no post passes the quality filter."""
+    insights = extract_insights(
+        [{"title": "Weekly thread: burr grinders", "score": 0}], "espresso"
+    )
+
+    assert insights["fallback"] is False
+    assert insights["keywords"] == ["burr", "grinders"]
+
+
+def test_pages_match_a_single_pass() -> None:
+    """Test adding posts page by page gives the same insights, capped."""
+    posts: list[dict[str, object]] = [
+        {"title": f"Latte art attempt {i} with oat milk", "score": i % 9}
+        for i in range(30)
+    ]
+    accumulator = InsightAccumulator(max_posts=25)
+    for start in range(0, len(posts), 7):
+        accumulator.add(posts[start : start + 7])
+
+    assert accumulator.insights("espresso") == extract_insights(
+        posts[:25], "espresso"
+    )
+    assert InsightAccumulator().insights("espresso") == FALLBACK_DATA
+
+
+def pickled_call(func, *args):  # type: ignore[no-untyped-def]
+    """Run a process pool job in-process, through a pickle round trip."""
+    return pickle.loads(pickle.dumps(func(*pickle.loads(pickle.dumps(args)))))
+
+
+@pytest.mark.asyncio
+async def test_large_samples_are_analyzed_in_the_process_pool(
+    mocker: MockerFixture,
+) -> None:
+    """Test big samples go to the pool with the same insights; small stay inline."""
+    mocker.patch.object(settings, "reddit_analysis_process_min_posts", 20)
+    pool = mocker.patch.object(
+        analysis, "run_in_process", mocker.AsyncMock(side_effect=pickled_call)
+    )
+    posts: list[dict[str, object]] = [
+        {"title": f"Pulled shot {i} on a flat burr grinder", "score": i, "url": "u"}
+        for i in range(30)
+    ]
+
+    small = await analysis.accumulate_posts(posts[:10])
+    assert pool.await_count == 0
+    assert small.insights("espresso") == extract_insights(posts[:10], "espresso")
+
+    large = await analysis.accumulate_posts(posts, max_posts=25)
+    assert pool.await_count == 1
+    sent = pool.await_args.args[1]
+    assert len(sent) == 25 and "url" not in sent[0]
+    assert large.posts == posts[:25]
+    assert large.insights("espresso") == extract_insights(posts[:25], "espresso")
+
+
+@pytest.mark.asyncio
+async def test_pool_failure_falls_back_to_inline(mocker: MockerFixture) -> None:
+    """Test a broken process pool still produces insights."""
+    mocker.patch.object(settings, "reddit_analysis_process_min_posts", 1)
+    mocker.patch.object(
+        analysis, "run_in_process", mocker.AsyncMock(side_effect=BrokenProcessPool)
+    )
+    posts: list[dict[str, object]] = [{"title": "Latte art progress", "score": 3}]
+
+    accumulator = await analysis.accumulate_posts(posts)
+
+    assert accumulator.insights("espresso") == extract_insights(posts, "espresso")
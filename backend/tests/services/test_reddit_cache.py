@@ -0,0 +1,172 @@
+"""
+Reddit Cache Unit Tests
+
+Tests TTL caching, stale-while-revalidate and fallback handling.
+Run with: pytest tests/services/test_reddit_cache.py -v
+"""
+
+import asyncio
+
+import pytest
+
+from app.services.reddit.cache import RedditCache, limit_bucket, make_posts_key
+from app.utils.cache import MemoryLRUCache
+
+
+class Clock:
+    """Settable wall clock."""
+
+    def __init__(self) -> None:
+        self.now = 1_000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class Fetcher:
+    """Upstream stand-in returning queued results and counting calls."""
+
+    def __init__(self, *results: list[dict[str, object]]) -> None:
+        self.results = list(results)
+        self.calls: list[tuple[str, str, int]] = []
+        self.release = asyncio.Event()
+        self.release.set()
+
+    async def __call__(
+        self, subreddit: str, sort: str, limit: int
+    ) -> list[dict[str, object]]:
+        self.calls.append((subreddit, sort, limit))
+        await self.release.wait()
+        return self.results.pop(0) if self.results else []
+
+
+def make_posts(count: int, tag: str = "post") -> list[dict[str, object]]:
+    """Build `count` distinct posts."""
+    return [{"title": f"{tag} {i}", "score": i} for i in range(count)]
+
+
+def make_cache(clock: Clock) -> RedditCache:
+    """Cache with a 60s TTL, 600s stale window and 10s negative TTL."""
+    return RedditCache(
+        MemoryLRUCache(), ttl=60, stale_ttl=600, negative_ttl=10, clock=clock
+    )
+
+
+def test_limits_share_buckets() -> None:
+    """Test nearby limits map to the same key and bucketed fetch size."""
+    assert limit_bucket(5) == limit_bucket(10) == 10
+    assert limit_bucket(11) == 25
+    assert limit_bucket(101) == 250
+    assert limit_bucket(5000) == 1000
+    assert make_posts_key("Espresso", "hot", 5) == make_posts_key("espresso", "hot", 8)
+    assert make_posts_key("espresso", "hot", 5) != make_posts_key("espresso", "new", 5)
+
+
+@pytest.mark.asyncio
+async def test_fresh_entries_are_served_from_cache() -> None:
+    """Test one upstream fetch of a full bucket serves smaller limits."""
+    clock = Clock()
+    cache = make_cache(clock)
+    fetch = Fetcher(make_posts(10))
+
+    first = await cache.get_posts("espresso", "hot", 5, fetch)
+    clock.now += 30
+    second = await cache.get_posts("espresso", "hot", 8, fetch)
+
+    assert len(first) == 5
+    assert len(second) == 8
+    assert fetch.calls == [("espresso", "hot", 10)]
+
+
+@pytest.mark.asyncio
+async def test_stale_entry_is_served_while_refreshing() -> None:
+    """Test a stale hit returns immediately and refreshes in the background."""
+    clock = Clock()
+    cache = make_cache(clock)
+    fetch = Fetcher(make_posts(10, "old"), make_posts(10, "new"))
+    await cache.get_posts("espresso", "hot", 10, fetch)
+
+    clock.now += 120
+    fetch.release.clear()
+    stale = await cache.get_posts("espresso", "hot", 10, fetch)
+    again = await cache.get_posts("espresso", "hot", 10, fetch)
+
+    assert stale[0]["title"] == "old 0"
+    assert again[0]["title"] == "old 0"
+
+    fetch.release.set()
+    await asyncio.gather(*cache._refreshes)
+    fresh = await cache.get_posts("espresso", "hot", 10, fetch)
+
+    assert fresh[0]["title"] == "new 0"
+    assert len(fetch.calls) == 2  # Both stale hits shared one refresh
+
+
+@pytest.mark.asyncio
+async def test_background_refresh_uses_refresh_fetcher() -> None:
+    """Test a stale hit refreshes with `refresh_fetch`, not the request's."""
+    clock = Clock()
+    cache = make_cache(clock)
+    fetch = Fetcher(make_posts(10, "old"))
+    refresh_fetch = Fetcher(make_posts(10, "new"))
+    await cache.get_listing("espresso", "hot", 10, fetch, refresh_fetch)
+
+    clock.now += 120
+    await cache.get_listing("espresso", "hot", 10, fetch, refresh_fetch)
+    await asyncio.gather(*cache._refreshes)
+
+    assert len(fetch.calls) == 1
+    assert refresh_fetch.calls == [("espresso", "hot", 10)]
+
+
+@pytest.mark.asyncio
+async def test_concurrent_misses_share_one_fetch() -> None:
+    """Test concurrent cold requests collapse into one upstream call."""
+    cache = make_cache(Clock())
+    fetch = Fetcher(make_posts(10))
+    fetch.release.clear()
+
+    waiting = [
+        asyncio.ensure_future(cache.get_posts("espresso", "hot", 10, fetch))
+        for _ in range(5)
+    ]
+    await asyncio.sleep(0)
+    fetch.release.set()
+    results = await asyncio.gather(*waiting)
+
+    assert len(fetch.calls) == 1
+    assert all(len(posts) == 10 for posts in results)
+
+
+@pytest.mark.asyncio
+async def test_failed_refresh_keeps_real_posts() -> None:
+    """Test an empty (fallback) refresh does not mask cached real posts."""
+    clock = Clock()
+    cache = make_cache(clock)
+    fetch = Fetcher(make_posts(10), [])
+    await cache.get_posts("espresso", "hot", 10, fetch)
+
+    clock.now += 120
+    await cache.get_posts("espresso", "hot", 10, fetch)
+    await asyncio.gather(*cache._refreshes)
+
+    posts = await cache.get_posts("espresso", "hot", 10, fetch)
+    assert len(posts) == 10
+
+
+@pytest.mark.asyncio
+async def test_fallback_results_expire_quickly() -> None:
+    """Test an empty result is cached only for the negative TTL."""
+    clock = Clock()
+    cache = make_cache(clock)
+    fetch = Fetcher([], make_posts(10))
+
+    assert await cache.get_posts("espresso", "hot", 10, fetch) == []
+    assert await cache.get_posts("espresso", "hot", 10, fetch) == []
+    assert len(fetch.calls) == 1
+
+    clock.now += 11
+    posts = await cache.get_posts("espresso", "hot", 10, fetch)
+
+    assert len(posts) == 10
+    assert len(fetch.calls) == 2
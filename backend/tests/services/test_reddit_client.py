@@ -5,11 +5,22 @@ Tests the Reddit client's fallback logic using mocked HTTP responses.
 Run with: pytest tests/services/test_reddit_client.py -v
 """
 
+import asyncio
+from typing import AsyncIterator
+
 import pytest
 import respx
-from httpx import Response
+from httpx import Request, Response
 from pytest_mock import MockerFixture
 
+from app.services.reddit import apify as reddit_apify
+from app.services.reddit import cache as reddit_cache
+from app.services.reddit import client as reddit_client
+from app.services.reddit import http as reddit_http
+from app.services.reddit import keywords as reddit_keywords
+from app.services.reddit.analyzer import extract_insights
+from app.services.reddit.cache import RedditCache
+from app.services.reddit.hedging import get_source_stats
 from app.services.reddit.client import (
     fetch_subreddit_posts,
     REDDIT_BASE_URL,
@@ -17,6 +28,26 @@ from app.services.reddit.client import (
 from app.services.reddit.constants import FALLBACK_DATA
 
 
+@pytest.fixture(autouse=True)
+def no_reddit_cache(mocker: MockerFixture) -> None:
+    """Disable the posts cache so every test reaches the mocked sources."""
+    mocker.patch.object(
+        reddit_cache, "_cache", RedditCache(None, ttl=0, stale_ttl=0, negative_ttl=0)
+    )
+
+
+@pytest.fixture(autouse=True)
+async def fresh_reddit_http() -> None:
+    """Give each test its own client, limiter, source stats and corpus."""
+    reddit_http._limiter = None
+    reddit_keywords._corpus = reddit_keywords.KeywordCorpus(None)
+    reddit_apify._semaphore = None
+    get_source_stats().clear()
+    yield
+    await reddit_http.close_reddit_http_client()
+    reddit_http._limiter = None
+
+
 @pytest.fixture
 def mock_reddit_response() -> dict:
     """Sample Reddit API response."""
@@ -105,14 +136,22 @@ async def test_reddit_blocked_apify_fallback_succeeds(
         return_value=Response(403, text="Forbidden")
     )
 
-    # Mock the Apify client
+    # Mock the async Apify client
+    async def iterate_items() -> AsyncIterator[dict]:
+        for item in mock_apify_posts:
+            yield item
+
     mock_client = mocker.MagicMock()
-    mock_run = {"defaultDatasetId": "test-dataset-id"}
-    mock_client.actor.return_value.call.return_value = mock_run
-    mock_client.dataset.return_value.iterate_items.return_value = iter(mock_apify_posts)
+    mock_client.actor.return_value.start = mocker.AsyncMock(
+        return_value={"id": "test-run-id"}
+    )
+    mock_client.run.return_value.wait_for_finish = mocker.AsyncMock(
+        return_value={"status": "SUCCEEDED", "defaultDatasetId": "test-dataset-id"}
+    )
+    mock_client.dataset.return_value.iterate_items = iterate_items
 
     mocker.patch("app.services.reddit.client.settings.apify_api_key", "test-key")
-    mocker.patch("apify_client.ApifyClient", return_value=mock_client)
+    mocker.patch.object(reddit_apify, "_client", mock_client)
 
     result = await fetch_subreddit_posts("espresso", sort="hot", limit=5)
 
@@ -133,7 +172,11 @@ async def test_both_reddit_and_apify_fail_uses_static(
 
     # Mock Apify to raise an exception
     mocker.patch("app.services.reddit.client.settings.apify_api_key", "test-key")
-    mocker.patch("apify_client.ApifyClient", side_effect=Exception("Apify failed"))
+    mock_client = mocker.MagicMock()
+    mock_client.actor.return_value.start = mocker.AsyncMock(
+        side_effect=Exception("Apify failed")
+    )
+    mocker.patch.object(reddit_apify, "_client", mock_client)
 
     result = await fetch_subreddit_posts("espresso", sort="hot", limit=5)
 
@@ -166,3 +209,160 @@ async def test_keywords_extracted(mock_reddit_response: dict) -> None:
     assert any(
         word in keywords for word in ["espresso", "grinder", "shot", "recommendations"]
     )
+
+
+@pytest.mark.asyncio
+@respx.mock
+async def test_pooled_client_is_reused_and_rate_limit_recorded(
+    mock_reddit_response: dict,
+) -> None:
+    """Test requests share one client and Reddit's limit headers are kept."""
+    route = respx.get(f"{REDDIT_BASE_URL}/r/espresso/hot.json").mock(
+        return_value=Response(
+            200,
+            json=mock_reddit_response,
+            headers={"x-ratelimit-remaining": "42", "x-ratelimit-reset": "300"},
+        )
+    )
+
+    client = reddit_http.get_reddit_http_client()
+    await fetch_subreddit_posts("espresso", sort="hot", limit=5)
+    await fetch_subreddit_posts("espresso", sort="hot", limit=5)
+
+    assert reddit_http.get_reddit_http_client() is client
+    assert route.call_count == 2
+    assert route.calls[0].request.headers["user-agent"].startswith("web:")
+    state = await reddit_http.get_reddit_limiter().store.get("reddit:ratelimit")
+    assert state is not None
+    # The second request's reservation is kept over the response's count
+    assert state["remaining"] == 41
+
+
+@pytest.mark.asyncio
+async def test_apify_stops_streaming_at_limit_and_aborts_on_timeout(
+    mocker: MockerFixture,
+) -> None:
+    """Test dataset streaming stops at limit and timed-out runs are aborted."""
+    read: list[int] = []
+
+    async def iterate_items() -> AsyncIterator[dict]:
+        for i in range(50):
+            read.append(i)
+            yield {"kind": "post", "title": f"post {i}", "score": i}
+
+    mock_client = mocker.MagicMock()
+    mock_client.actor.return_value.start = mocker.AsyncMock(
+        return_value={"id": "run-1"}
+    )
+    mock_client.run.return_value.wait_for_finish = mocker.AsyncMock(
+        return_value={"status": "SUCCEEDED", "defaultDatasetId": "dataset-1"}
+    )
+    mock_client.run.return_value.abort = mocker.AsyncMock()
+    mock_client.dataset.return_value.iterate_items = iterate_items
+    mocker.patch.object(reddit_apify, "_client", mock_client)
+
+    posts = await reddit_apify.fetch_from_apify("espresso", "hot", 5)
+
+    assert len(posts) == 5
+    assert len(read) == 5
+
+    async def never_finishes() -> dict:
+        await asyncio.sleep(10)
+        return {}
+
+    mock_client.run.return_value.wait_for_finish = never_finishes
+    mocker.patch(
+        "app.services.reddit.client.settings.apify_run_timeout_seconds", 0.01
+    )
+
+    assert await reddit_apify.fetch_from_apify("espresso", "hot", 5) == []
+    await asyncio.gather(*reddit_apify._aborts)
+    mock_client.run.return_value.abort.assert_awaited_once()
+
+
+def make_listing(start: int, count: int, after: str | None) -> dict:
+    """Build a listing page of `count` posts numbered from `start`."""
+    return {
+        "data": {
+            "after": after,
+            "children": [
+                {
+                    "data": {
+                        "title": f"Espresso grinder review {i}",
+                        "score": 1000 - i,
+                        "url": f"https://reddit.com/r/espresso/{i}",
+                        "num_comments": i % 7,
+                    }
+                }
+                for i in range(start, start + count)
+            ],
+        }
+    }
+
+
+@pytest.mark.asyncio
+@respx.mock
+async def test_large_limits_paginate_until_limit() -> None:
+    """Test limits above one page follow `after` and stop at the limit."""
+
+    def listing(request: Request) -> Response:
+        after = request.url.params.get("after")
+        start = int(after[3:]) if after else 0
+        size = int(request.url.params["limit"])
+        return Response(200, json=make_listing(start, size, f"t3_{start + size}"))
+
+    route = respx.get(f"{REDDIT_BASE_URL}/r/espresso/hot.json").mock(
+        side_effect=listing
+    )
+
+    result = await fetch_subreddit_posts("espresso", sort="hot", limit=250)
+
+    assert len(result["posts"]) == 250  # type: ignore[arg-type]
+    assert [call.request.url.params["limit"] for call in route.calls] == [
+        "100",
+        "100",
+        "50",
+    ]
+    assert route.calls[1].request.url.params["after"] == "t3_100"
+    assert route.calls[1].request.url.params["count"] == "100"
+    # Insights built page by page match a single pass over the same posts
+    posts: list = result["posts"]  # type: ignore[assignment]
+    corpus = reddit_keywords.get_keyword_corpus()
+    assert isinstance(result.pop("fetched_at"), float)
+    assert result == extract_insights(posts, "espresso", corpus)
+
+
+@pytest.mark.asyncio
+@respx.mock
+async def test_pagination_stops_at_end_page_cap_and_errors(
+    mocker: MockerFixture,
+) -> None:
+    """Test the listing end, the page cap and a failed later page."""
+    route = respx.get(f"{REDDIT_BASE_URL}/r/espresso/hot.json").mock(
+        side_effect=[
+            Response(200, json=make_listing(0, 100, "t3_100")),
+            Response(200, json=make_listing(100, 30, None)),
+        ]
+    )
+    posts = await reddit_client.fetch_from_reddit("espresso", "hot", 500)
+    assert len(posts) == 130
+    assert route.call_count == 2
+
+    mocker.patch("app.services.reddit.client.settings.reddit_max_pages", 2)
+    route.side_effect = lambda request: Response(
+        200, json=make_listing(0, 100, "t3_more")
+    )
+    posts = await reddit_client.fetch_from_reddit("espresso", "hot", 500)
+    assert len(posts) == 200
+    assert route.call_count == 4
+
+    route.side_effect = [
+        Response(200, json=make_listing(0, 100, "t3_100")),
+        Response(500, text="Server Error"),
+    ]
+    pages: list[int] = []
+    posts = await reddit_client.fetch_from_reddit(
+        "espresso", "hot", 500, on_page=lambda page: pages.append(len(page))
+    )
+    assert len(posts) == 100
+    assert pages == [100]
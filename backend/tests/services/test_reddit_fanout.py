@@ -0,0 +1,110 @@
+"""
+Reddit Fan-out Unit Tests
+
+Tests concurrent multi-subreddit fetching, merging and weighting.
+Run with: pytest tests/services/test_reddit_fanout.py -v
+"""
+
+import asyncio
+
+import pytest
+from pytest_mock import MockerFixture
+
+from app.services.node_executors import SocialMediaExecutor
+from app.services.reddit import fanout
+from app.services.reddit.analyzer import extract_insights
+from app.services.reddit.constants import FALLBACK_DATA
+
+POSTS = {
+    "espresso": [
+        {"title": "Espresso grinder upgrade", "score": 5000, "url": "u/1"},
+        {"title": "Latte art practice", "score": 2500, "url": "u/2"},
+    ],
+    "pourover": [
+        {"title": "Pourover kettle review", "score": 40, "url": "u/3"},
+        {"title": "Espresso grinder upgrade", "score": 10, "url": "u/1"},
+    ],
+}
+
+
+def fake_fetch(active: list[int] | None = None):
+    """Build a fetch_subreddit_posts stand-in tracking concurrency."""
+    running = [0]
+
+    async def fetch(subreddit: str, sort: str, limit: int) -> dict[str, object]:
+        running[0] += 1
+        if active is not None:
+            active.append(running[0])
+        await asyncio.sleep(0.01)
+        running[0] -= 1
+        posts = POSTS.get(subreddit.lower())
+        return extract_insights(posts, subreddit) if posts else dict(FALLBACK_DATA)
+
+    return fetch
+
+
+def test_merge_normalizes_scores_per_subreddit() -> None:
+    """Test dedupe by URL and that niche posts aren't drowned out."""
+    merged, analysis = fanout.merge_posts(POSTS, weights={})
+
+    assert [post["url"] for post in merged] == ["u/1", "u/3", "u/2"]
+    assert merged[0]["subreddit"] == "espresso"
+    assert merged[0]["score"] == 5000  # Original score kept for display
+    assert analysis[1]["score"] == pytest.approx(100.0)  # Pourover's top post
+
+
+def test_weights_scale_sources() -> None:
+    """Test a per-subreddit weight reorders the merged posts."""
+    merged, _ = fanout.merge_posts(POSTS, weights={"espresso": 0.1})
+
+    assert merged[0]["url"] == "u/3"
+
+
+@pytest.mark.asyncio
+async def test_fetch_multiple_subreddits(mocker: MockerFixture) -> None:
+    """Test concurrent fetches, merged and per-subreddit insights."""
+    active: list[int] = []
+    mocker.patch.object(fanout, "fetch_subreddit_posts", fake_fetch(active))
+
+    result = await fanout.fetch_multiple_subreddits(
+        ["espresso", "Pourover", "pourover", "blocked"], concurrency=2
+    )
+
+    assert max(active) == 2
+    assert result["fallback"] is False
+    assert len(result["posts"]) == 3  # type: ignore[arg-type]
+    by_subreddit: dict = result["by_subreddit"]  # type: ignore[assignment]
+    assert list(by_subreddit) == ["espresso", "Pourover", "blocked"]
+    assert by_subreddit["blocked"]["fallback"] is True
+    assert by_subreddit["espresso"]["post_count"] == 2
+
+
+@pytest.mark.asyncio
+async def test_all_failed_returns_fallback(mocker: MockerFixture) -> None:
+    """Test the static fallback when no subreddit returns posts."""
+    mocker.patch.object(fanout, "fetch_subreddit_posts", fake_fetch())
+
+    result = await fanout.fetch_multiple_subreddits(["blocked", "offline"])
+
+    assert result["fallback"] is True
+    assert result["keywords"] == FALLBACK_DATA["keywords"]
+
+
+@pytest.mark.asyncio
+async def test_executor_fans_out_subreddit_lists(mocker: MockerFixture) -> None:
+    """Test the SOCIAL_MEDIA node uses fan-out for several subreddits."""
+    mocker.patch.object(fanout, "fetch_subreddit_posts", fake_fetch())
+
+    result = await SocialMediaExecutor().execute(
+        {},
+        {
+            "subreddit": "espresso, pourover",
+            "subreddits": ["espresso", "pourover"],
+            "subreddit_weights": {"pourover": 2},
+        },
+    )
+
+    by_subreddit: dict = result["by_subreddit"]  # type: ignore[assignment]
+    posts: list = result["posts"]  # type: ignore[assignment]
+    assert set(by_subreddit) == {"espresso", "pourover"}
+    assert posts[0]["url"] == "u/3"
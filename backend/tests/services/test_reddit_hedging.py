@@ -0,0 +1,130 @@
+"""
+Reddit Hedging Unit Tests
+
+Tests hedged Reddit/Apify fetching and the adaptive hedge delay.
+Run with: pytest tests/services/test_reddit_hedging.py -v
+"""
+
+import asyncio
+
+import pytest
+
+from app.services.reddit.hedging import SourceStats, fetch_hedged, hedge_delay
+
+POSTS = [{"title": "post", "score": 1}]
+
+
+def source(result: list, delay: float = 0.0, started: list | None = None):
+    """Build a fetch that returns `result` after `delay` seconds."""
+
+    async def fetch() -> list:
+        if started is not None:
+            started.append(True)
+        await asyncio.sleep(delay)
+        return result
+
+    return fetch
+
+
+@pytest.mark.asyncio
+async def test_fast_primary_never_starts_backup() -> None:
+    """Test the backup is not started when the primary answers in time."""
+    started: list = []
+    posts = await fetch_hedged(
+        ("reddit", source(POSTS)),
+        ("apify", source([{"title": "apify"}], started=started)),
+        delay=0.5,
+        stats=SourceStats(),
+    )
+
+    assert posts == POSTS
+    assert started == []
+
+
+@pytest.mark.asyncio
+async def test_slow_primary_is_hedged_and_cancelled() -> None:
+    """Test the backup wins over a slow primary, which is cancelled."""
+    stats = SourceStats()
+    apify_posts = [{"title": "apify"}]
+
+    posts = await asyncio.wait_for(
+        fetch_hedged(
+            ("reddit", source(POSTS, delay=10)),
+            ("apify", source(apify_posts, delay=0.01)),
+            delay=0.01,
+            stats=stats,
+        ),
+        timeout=1,
+    )
+
+    assert posts == apify_posts
+    assert stats.snapshot("apify")["samples"] == 1
+    assert stats.snapshot("reddit")["samples"] == 0  # Cancelled, not recorded
+
+
+@pytest.mark.asyncio
+async def test_early_failure_starts_backup_immediately() -> None:
+    """Test an empty primary result starts the backup without the delay."""
+    stats = SourceStats()
+    posts = await asyncio.wait_for(
+        fetch_hedged(
+            ("reddit", source([])),
+            ("apify", source(POSTS)),
+            delay=10,
+            stats=stats,
+        ),
+        timeout=1,
+    )
+
+    assert posts == POSTS
+    assert stats.snapshot("reddit")["success_rate"] == 0.0
+
+
+@pytest.mark.asyncio
+async def test_slow_backup_loses_to_late_primary() -> None:
+    """Test a hedged primary that finishes first still wins."""
+    posts = await fetch_hedged(
+        ("reddit", source(POSTS, delay=0.05)),
+        ("apify", source([{"title": "apify"}], delay=10)),
+        delay=0.01,
+        stats=SourceStats(),
+    )
+
+    assert posts == POSTS
+
+
+def test_hedge_delay_adapts_to_observed_latency() -> None:
+    """Test default, p90-based and failing-source delays."""
+    stats = SourceStats()
+    assert hedge_delay(stats, "reddit", default=2.0, max_delay=5.0) == 2.0
+
+    for latency in (0.4, 0.5, 0.6, 0.7, 0.8, 0.9, 1.0, 1.1, 1.2, 1.3):
+        stats.record("reddit", latency, ok=True)
+    assert hedge_delay(stats, "reddit", default=2.0, max_delay=5.0) == 1.2
+
+    for _ in range(15):
+        stats.record("reddit", 0.1, ok=False)
+    assert hedge_delay(stats, "reddit", default=2.0, max_delay=5.0) == 0.0
+
+
+@pytest.mark.asyncio
+async def test_paginated_fetches_are_timed_and_hedged_per_page() -> None:
+    """Test a 10-page fetch waits for 10 pages and records per-page latency."""
+    stats = SourceStats()
+    assert hedge_delay(stats, "reddit", default=2.0, max_delay=5.0, pages=10) == 20.0
+
+    for _ in range(5):
+        await fetch_hedged(
+            ("reddit", source(POSTS, delay=0.05)),
+            None,
+            delay=0,
+            stats=stats,
+            primary_pages=10,
+        )
+
+    p90 = stats.snapshot("reddit")["p90_latency"]
+    assert p90 is not None and p90 < 0.05
+    # Per-page p90 (floored at MIN_HEDGE_DELAY_SECONDS) times the pages
+    assert hedge_delay(stats, "reddit", default=2.0, max_delay=5.0, pages=10) == (
+        pytest.approx(max(p90, 0.25) * 10)
+    )
@@ -0,0 +1,114 @@
+"""
+Reddit Keyword Corpus Unit Tests
+
+Tests TF-IDF ranking, bigrams and incremental, persisted corpus updates.
+Run with: pytest tests/services/test_reddit_keywords.py -v
+"""
+
+from pathlib import Path
+
+import pytest
+
+from app.services.reddit.analyzer import InsightAccumulator, extract_insights
+from app.services.reddit.keywords import KeywordCorpus
+from app.utils.state_store import SQLiteStateStore
+
+
+def sample(*titles: str) -> InsightAccumulator:
+    """Accumulate posts with the given titles (equal scores)."""
+    accumulator = InsightAccumulator()
+    accumulator.add([{"title": title, "score": 10} for title in titles])
+    return accumulator
+
+
+ESPRESSO = sample(
+    "Finally upgraded my espresso grinder",
+    "Espresso grinder upgrade advice",
+    "Finally pulled a decent shot",
+    "Finally got my crema right",
+)
+KEYBOARDS = sample(
+    "Finally finished my keyboard build",
+    "Finally lubed the switches",
+    "Upgraded keycaps on my keyboard",
+)
+SKINCARE = sample("Finally found a sunscreen", "Finally fixed my routine")
+
+
+@pytest.mark.asyncio
+async def test_common_words_rank_below_distinctive_ones() -> None:
+    """Test words every subreddit uses lose to the subreddit's own terms."""
+    corpus = KeywordCorpus(None)
+    without = extract_insights(ESPRESSO.posts, "espresso")
+    assert without["keywords"][0] == "finally"  # type: ignore[index]
+
+    for name, accumulator in (
+        ("espresso", ESPRESSO),
+        ("keyboards", KEYBOARDS),
+        ("skincare", SKINCARE),
+    ):
+        await corpus.add_document(name, accumulator.term_weights())
+    insights = ESPRESSO.insights("espresso", corpus)
+    keywords: list = insights["keywords"]  # type: ignore[assignment]
+
+    # "finally" (in every subreddit) drops below the distinctive bigram
+    assert keywords[:2] == ["espresso grinder", "finally"]
+    # Words mostly used in a ranked bigram are not repeated on their own
+    assert "espresso" not in keywords and "grinder" not in keywords
+
+
+@pytest.mark.asyncio
+async def test_refetch_replaces_a_document() -> None:
+    """Test re-adding a subreddit swaps its terms instead of counting twice."""
+    corpus = KeywordCorpus(None, max_documents=2)
+    await corpus.add_document("espresso", ESPRESSO.term_weights())
+    await corpus.add_document("Espresso", ESPRESSO.term_weights())
+    await corpus.add_document("keyboards", KEYBOARDS.term_weights())
+
+    assert corpus.document_count == 2
+    assert corpus._df["finally"] == 2
+
+    await corpus.add_document("skincare", SKINCARE.term_weights())
+
+    assert corpus.document_count == 2  # espresso was evicted
+    assert corpus._df["espresso"] == 0
+    assert corpus._df["finally"] == 2
+
+
+@pytest.mark.asyncio
+async def test_documents_are_persisted_and_reloaded(tmp_path: Path) -> None:
+    """Test a new corpus on the same store rebuilds the frequencies."""
+    store = SQLiteStateStore(tmp_path / "keywords.sqlite3")
+    corpus = KeywordCorpus(store)
+    await corpus.load()
+    await corpus.add_document("espresso", ESPRESSO.term_weights())
+    await corpus.add_document("keyboards", KEYBOARDS.term_weights())
+
+    reloaded = KeywordCorpus(store)
+    await reloaded.load()
+
+    assert reloaded.document_count == 2
+    assert reloaded._df == corpus._df
+    state = await store.get("reddit:keyword_corpus")
+    assert state is not None
+    assert "espresso grinder" in state["documents"]["espresso"]
+
+
+@pytest.mark.asyncio
+async def test_workers_pick_up_each_others_documents(tmp_path: Path) -> None:
+    """Test a corpus re-reads the shared store once the reload interval passes."""
+    store = SQLiteStateStore(tmp_path / "keywords.sqlite3")
+    now = [0.0]
+    first = KeywordCorpus(store, reload_seconds=60, clock=lambda: now[0])
+    second = KeywordCorpus(store, reload_seconds=60, clock=lambda: now[0])
+    await first.load()
+    await second.load()
+
+    await second.add_document("keyboards", KEYBOARDS.term_weights())
+    await first.load()
+    assert first.document_count == 0
+
+    now[0] += 60
+    await first.load()
+    assert first.document_count == 1
+    assert first._df == second._df
@@ -0,0 +1,92 @@
+"""
+Reddit Rate Limiter Unit Tests
+
+Tests the x-ratelimit header driven request budget.
+Run with: pytest tests/services/test_reddit_ratelimit.py -v
+"""
+
+import pytest
+
+from app.services.reddit.http import (
+    RedditRateLimitedError,
+    RedditRateLimiter,
+    parse_rate_limit,
+)
+from app.utils.state_store import MemoryStateStore
+
+
+class Clock:
+    """Settable wall clock."""
+
+    def __init__(self) -> None:
+        self.now = 1_000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_parse_rate_limit_headers() -> None:
+    """Test remaining/reset headers, 429s and responses without headers."""
+    headers = {"x-ratelimit-remaining": "57.0", "x-ratelimit-reset": "120"}
+
+    assert parse_rate_limit(headers, 200, now=10.0) == {
+        "remaining": 57.0,
+        "reset_at": 130.0,
+    }
+    assert parse_rate_limit({"retry-after": "30"}, 429, now=10.0) == {
+        "remaining": 0.0,
+        "reset_at": 40.0,
+    }
+    assert parse_rate_limit({}, 200, now=10.0) is None
+
+
+@pytest.mark.asyncio
+async def test_limiter_spends_the_window_then_waits_for_reset(mocker) -> None:
+    """Test the limiter keeps a reserve and sleeps until the window resets."""
+    clock = Clock()
+    limiter = RedditRateLimiter(
+        MemoryStateStore(), max_wait_seconds=30, reserve=1, clock=clock
+    )
+    await limiter.record(
+        {"x-ratelimit-remaining": "3", "x-ratelimit-reset": "20"}, 200
+    )
+
+    await limiter.acquire()
+    await limiter.acquire()
+
+    async def advance(seconds: float) -> None:
+        clock.now += seconds
+
+    sleep = mocker.patch("app.services.reddit.http.asyncio.sleep", side_effect=advance)
+    await limiter.acquire()
+
+    sleep.assert_awaited_once_with(20.0)
+
+
+@pytest.mark.asyncio
+async def test_limiter_gives_up_when_reset_is_too_far() -> None:
+    """Test a 429 with a long reset makes callers fail fast."""
+    limiter = RedditRateLimiter(MemoryStateStore(), max_wait_seconds=5, clock=Clock())
+    await limiter.record({"x-ratelimit-reset": "300"}, 429)
+
+    with pytest.raises(RedditRateLimitedError):
+        await limiter.acquire()
+
+
+@pytest.mark.asyncio
+async def test_out_of_order_responses_keep_the_lower_count() -> None:
+    """Test a late response from the same window can't raise the budget."""
+    clock = Clock()
+    store = MemoryStateStore()
+    limiter = RedditRateLimiter(store, clock=clock)
+
+    first = {"x-ratelimit-remaining": "10", "x-ratelimit-reset": "60"}
+    late = {"x-ratelimit-remaining": "12", "x-ratelimit-reset": "59"}
+
+    await limiter.record(first, 200)
+    clock.now += 1
+    await limiter.record(late, 200)
+
+    state = await store.get(limiter.key)
+    assert state is not None
+    assert state["remaining"] == 10
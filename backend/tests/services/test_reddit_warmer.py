@@ -0,0 +1,161 @@
+"""
+Reddit Trend Warmer Unit Tests
+
+Tests usage decay, budgeted warming, the cycle lease and limiter yielding.
+Run with: pytest tests/services/test_reddit_warmer.py -v
+"""
+
+import pytest
+
+from app.config import settings
+from app.services.reddit.cache import RedditCache
+from app.services.reddit.http import RedditRateLimiter
+from app.services.reddit.warmer import TrendWarmer
+from app.utils.cache import MemoryLRUCache
+from app.utils.state_store import MemoryStateStore
+
+
+class Clock:
+    """Settable wall clock."""
+
+    def __init__(self) -> None:
+        self.now = 1_000_000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class Fetcher:
+    """Upstream stand-in recording calls."""
+
+    def __init__(self) -> None:
+        self.calls: list[tuple[str, str, int]] = []
+
+    async def __call__(
+        self, subreddit: str, sort: str, limit: int
+    ) -> list[dict[str, object]]:
+        self.calls.append((subreddit, sort, limit))
+        return [{"title": f"{subreddit} post", "score": 1}]
+
+
+def make_warmer(
+    clock: Clock, store: MemoryStateStore | None = None, **kwargs: object
+) -> tuple[TrendWarmer, RedditCache, Fetcher]:
+    """Warmer with a 60s cycle over a 300s-TTL cache."""
+    cache = RedditCache(
+        MemoryLRUCache(), ttl=300, stale_ttl=3600, negative_ttl=60, clock=clock
+    )
+    fetch = Fetcher()
+    warmer = TrendWarmer(
+        cache,
+        store or MemoryStateStore(),
+        fetch,
+        interval=60,
+        half_life=3600,
+        clock=clock,
+        **kwargs,  # type: ignore[arg-type]
+    )
+    return warmer, cache, fetch
+
+
+@pytest.mark.asyncio
+async def test_usage_decays_and_ranks_listings() -> None:
+    """Test recent and frequent listings rank first and old ones fade out."""
+    clock = Clock()
+    warmer, _, _ = make_warmer(clock)
+    await warmer.record("SkincareAddiction", "hot", 5)
+    clock.now += 2 * 3600
+    await warmer.record("espresso", "hot", 10)
+    await warmer.record("espresso", "hot", 8)
+    await warmer.record("espresso", "hot", 40)
+    await warmer.record("!!invalid@@", "hot", 10)
+
+    hottest = await warmer.hottest()
+
+    assert [(t["subreddit"], t["limit"]) for t in hottest] == [
+        ("espresso", 10),
+        ("espresso", 50),
+        ("skincareaddiction", 10),
+    ]
+    assert hottest[0]["score"] == pytest.approx(2.0)
+    assert hottest[2]["score"] == pytest.approx(0.25)  # Two half-lives
+
+    clock.now += 3600
+    hottest = await warmer.hottest()
+    assert "skincareaddiction" not in {t["subreddit"] for t in hottest}
+
+
+@pytest.mark.asyncio
+async def test_warms_hottest_stale_listings_within_budget() -> None:
+    """Test only listings about to go stale are refreshed, hottest first."""
+    clock = Clock()
+    # 180 requests/hour with a 60s cycle: 3 requests per cycle
+    warmer, cache, fetch = make_warmer(clock)
+    for _ in range(3):
+        await warmer.record("espresso", "hot", 10)
+    await warmer.record("coffee", "top", 250)  # 3 pages
+    await warmer.record("tea", "hot", 10)
+
+    # coffee's 3 pages don't fit after espresso; tea still does
+    assert await warmer.warm_once() == 2
+    assert fetch.calls == [("espresso", "hot", 10), ("tea", "hot", 10)]
+    assert not await cache.expires_within("espresso", "hot", 10, 72)
+
+    # Next cycle: the warm listings are still fresh, coffee now fits
+    clock.now += 61
+    assert await warmer.warm_once() == 3
+    assert fetch.calls[2:] == [("coffee", "top", 250)]
+
+    # About to go stale: refreshed ahead of time
+    clock.now += 200
+    assert await warmer.warm_once() == 2
+    assert fetch.calls[3:] == [("espresso", "hot", 10), ("tea", "hot", 10)]
+
+
+@pytest.mark.asyncio
+async def test_one_worker_warms_per_cycle() -> None:
+    """Test workers sharing a store take turns through the cycle lease."""
+    clock = Clock()
+    store = MemoryStateStore()
+    first, _, first_fetch = make_warmer(clock, store)
+    second, _, second_fetch = make_warmer(clock, store)
+    await first.record("espresso", "hot", 10)
+
+    assert await first.warm_once() == 1
+    assert await second.warm_once() == 0
+    assert second_fetch.calls == []
+
+    clock.now += 60
+    assert await second.warm_once() == 1
+    assert len(first_fetch.calls) == 1
+
+
+@pytest.mark.asyncio
+async def test_yields_when_reddit_window_is_nearly_spent() -> None:
+    """Test warming pauses while few requests are left in the window."""
+    clock = Clock()
+    limiter = RedditRateLimiter(MemoryStateStore(), clock=clock)
+    warmer, _, fetch = make_warmer(clock, limiter=limiter)
+    await warmer.record("espresso", "hot", 10)
+    await limiter.record(
+        {"x-ratelimit-remaining": "3", "x-ratelimit-reset": "120"}, 200
+    )
+
+    assert await warmer.warm_once() == 0
+    assert fetch.calls == []
+
+    clock.now += 121
+    assert await warmer.warm_once() == 1
+
+
+@pytest.mark.asyncio
+async def test_page_cost_is_capped_by_max_pages(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """Test large buckets are charged the pages actually fetched."""
+    monkeypatch.setattr(settings, "reddit_max_pages", 2)
+    warmer, _, fetch = make_warmer(Clock())
+    await warmer.record("coffee", "top", 1000)
+
+    assert await warmer.warm_once() == 2
+    assert fetch.calls == [("coffee", "top", 1000)]
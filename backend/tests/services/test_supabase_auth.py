@@ -0,0 +1,135 @@
+"""
+Supabase Token Verifier Unit Tests
+
+Tests local JWT verification, JWKS rotation, the verified-token cache and
+the Supabase Auth fallback.
+Run with: pytest tests/services/test_supabase_auth.py -v
+"""
+
+import json
+import time
+
+import jwt
+import pytest
+import respx
+from cryptography.hazmat.primitives.asymmetric import ec
+from httpx import Response
+
+from app.services.supabase.auth import AuthUser, TokenVerifier
+
+SUPABASE_URL = "https://project.supabase.co"
+SECRET = "legacy-jwt-secret-with-at-least-32-bytes"
+JWKS_URL = f"{SUPABASE_URL}/auth/v1/.well-known/jwks.json"
+ISSUER = f"{SUPABASE_URL}/auth/v1"
+
+
+def make_key(kid: str) -> tuple[ec.EllipticCurvePrivateKey, dict[str, str]]:
+    """An ES256 signing key and its public JWK."""
+    private_key = ec.generate_private_key(ec.SECP256R1())
+    jwk = json.loads(jwt.algorithms.ECAlgorithm.to_jwk(private_key.public_key()))
+    return private_key, {**jwk, "kid": kid, "alg": "ES256", "use": "sig"}
+
+
+def make_token(key: object, kid: str | None = None, **claims: object) -> str:
+    """A Supabase-style access token (ES256 unless the key is a secret)."""
+    payload = {
+        "sub": "user-1",
+        "email": "ada@example.com",
+        "aud": "authenticated",
+        "iss": ISSUER,
+        "exp": int(time.time()) + 3600,
+        **claims,
+    }
+    algorithm = "HS256" if isinstance(key, str) else "ES256"
+    headers = {"kid": kid} if kid else None
+    return jwt.encode(
+        payload, key, algorithm=algorithm, headers=headers  # type: ignore[arg-type]
+    )
+
+
+class RemoteAuth:
+    """Supabase Auth stand-in recording calls."""
+
+    def __init__(self) -> None:
+        self.calls = 0
+
+    async def __call__(self, token: str) -> AuthUser:
+        self.calls += 1
+        return {"id": "remote-user", "email": None}
+
+
+@pytest.mark.asyncio
+@respx.mock
+async def test_verifies_locally_and_caches_tokens() -> None:
+    """Test a valid token needs one JWKS fetch and no Supabase Auth call."""
+    private_key, jwk = make_key("key-1")
+    jwks = respx.get(JWKS_URL).mock(return_value=Response(200, json={"keys": [jwk]}))
+    remote = RemoteAuth()
+    verifier = TokenVerifier(SUPABASE_URL, remote)
+    token = make_token(private_key, "key-1")
+
+    first = await verifier.verify(token)
+    second = await verifier.verify(token)
+
+    assert first == second == {"id": "user-1", "email": "ada@example.com"}
+    assert jwks.call_count == 1
+    assert remote.calls == 0
+
+    for bad in (
+        make_token(private_key, "key-1", aud="anon"),
+        make_token(private_key, "key-1", exp=int(time.time()) - 120),
+        make_token(private_key, "key-1", iss="https://other.supabase.co/auth/v1"),
+        make_token(make_key("key-1")[0], "key-1"),  # Forged signature
+    ):
+        with pytest.raises(jwt.PyJWTError):
+            await verifier.verify(bad)
+
+
+@pytest.mark.asyncio
+@respx.mock
+async def test_unknown_key_id_refreshes_once() -> None:
+    """Test rotated keys are picked up, and unknown ones rejected."""
+    old_key, old_jwk = make_key("old")
+    new_key, new_jwk = make_key("new")
+    jwks = respx.get(JWKS_URL).mock(
+        side_effect=[
+            Response(200, json={"keys": [old_jwk]}),
+            Response(200, json={"keys": [old_jwk, new_jwk]}),
+        ]
+    )
+    clock_now = [1_000_000.0]
+    verifier = TokenVerifier(SUPABASE_URL, RemoteAuth(), clock=lambda: clock_now[0])
+
+    await verifier.verify(make_token(old_key, "old"))
+    clock_now[0] += 60
+    user = await verifier.verify(make_token(new_key, "new"))
+
+    assert user["id"] == "user-1"
+    assert jwks.call_count == 2
+
+    # Refreshes for unknown ids are rate limited
+    with pytest.raises(jwt.InvalidKeyError):
+        await verifier.verify(make_token(make_key("x")[0], "unknown"))
+    assert jwks.call_count == 2
+
+
+@pytest.mark.asyncio
+@respx.mock
+async def test_falls_back_to_supabase_auth() -> None:
+    """Test HS256 uses the secret when set, else Supabase Auth, as do failures."""
+    respx.get(JWKS_URL).mock(return_value=Response(503))
+    remote = RemoteAuth()
+    token = make_token(SECRET)
+
+    with_secret = TokenVerifier(SUPABASE_URL, remote, jwt_secret=SECRET)
+    assert (await with_secret.verify(token))["id"] == "user-1"
+    with pytest.raises(jwt.InvalidSignatureError):
+        await with_secret.verify(make_token(SECRET.upper()))
+    assert remote.calls == 0
+
+    without_secret = TokenVerifier(SUPABASE_URL, remote)
+    assert (await without_secret.verify(token))["id"] == "remote-user"
+    # JWKS unreachable: asymmetric tokens are checked remotely too
+    user = await without_secret.verify(make_token(make_key("key-1")[0], "key-1"))
+    assert user["id"] == "remote-user"
+    assert remote.calls == 2
@@ -0,0 +1,121 @@
+"""
+SingleFlight Unit Tests
+
+Tests in-flight coalescing, error propagation and cancellation.
+Run with: pytest tests/utils/test_singleflight.py -v
+"""
+
+import asyncio
+
+import httpx
+import pytest
+
+from app.utils.singleflight import SingleFlight
+
+
+@pytest.mark.asyncio
+async def test_concurrent_calls_share_one_upstream() -> None:
+    """Test that identical concurrent calls run the upstream once."""
+    flight: SingleFlight[int] = SingleFlight()
+    calls = 0
+
+    async def upstream() -> int:
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.01)
+        return 7
+
+    results = await asyncio.gather(*(flight.do("k", upstream) for _ in range(5)))
+
+    assert calls == 1
+    assert [value for value, _ in results] == [7] * 5
+    assert [coalesced for _, coalesced in results].count(False) == 1
+    assert len(flight) == 0
+
+
+@pytest.mark.asyncio
+async def test_errors_propagate_to_every_caller() -> None:
+    """Test that every waiter receives the upstream error itself."""
+    flight: SingleFlight[int] = SingleFlight()
+    request = httpx.Request("GET", "https://fal.run/model")
+    error = httpx.HTTPStatusError(
+        "Server error", request=request, response=httpx.Response(503, request=request)
+    )
+
+    async def upstream() -> int:
+        await asyncio.sleep(0.01)
+        # Keyword-only init arguments: the error can't be rebuilt from args
+        raise error
+
+    results = await asyncio.gather(
+        flight.do("k", upstream), flight.do("k", upstream), return_exceptions=True
+    )
+
+    assert results == [error, error]
+
+
+@pytest.mark.asyncio
+async def test_upstream_cancelled_only_when_all_waiters_leave() -> None:
+    """Test that one cancelled waiter does not abort the shared call."""
+    flight: SingleFlight[str] = SingleFlight()
+    started = asyncio.Event()
+    release = asyncio.Event()
+    upstream_cancelled = False
+
+    async def upstream() -> str:
+        nonlocal upstream_cancelled
+        started.set()
+        try:
+            await release.wait()
+        except asyncio.CancelledError:
+            upstream_cancelled = True
+            raise
+        return "done"
+
+    first = asyncio.create_task(flight.do("k", upstream))
+    second = asyncio.create_task(flight.do("k", upstream))
+    await started.wait()
+
+    first.cancel()
+    await asyncio.sleep(0)
+    assert not upstream_cancelled
+
+    release.set()
+    assert await second == ("done", True)
+
+    release.clear()
+    third = asyncio.create_task(flight.do("k2", upstream))
+    await asyncio.sleep(0)
+    third.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await third
+    await asyncio.sleep(0)
+    assert upstream_cancelled
+
+
+@pytest.mark.asyncio
+async def test_detached_upstream_outlives_its_waiters() -> None:
+    """Test that a detached call keeps running and later callers join it."""
+    flight: SingleFlight[str] = SingleFlight(detached=True)
+    release = asyncio.Event()
+    calls = 0
+
+    async def upstream() -> str:
+        nonlocal calls
+        calls += 1
+        await release.wait()
+        return "done"
+
+    waiter = asyncio.create_task(flight.do("k", upstream))
+    await asyncio.sleep(0)
+    waiter.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await waiter
+    assert len(flight) == 1
+
+    joiner = asyncio.create_task(flight.do("k", upstream))
+    await asyncio.sleep(0)
+    release.set()
+    assert await joiner == ("done", True)
+    assert calls == 1
+    assert len(flight) == 0
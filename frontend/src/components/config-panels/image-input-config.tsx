@@ -1,5 +1,6 @@
 import { Input } from '@/components/ui/input';
 import { Label } from '@/components/ui/label';
+import { Switch } from '@/components/ui/switch';
 import { useCanvasStore } from '@/stores/canvas-store';
 import { Image as ImageIcon, Upload, X } from 'lucide-react';
 import { Button } from '@/components/ui/button';
@@ -128,6 +129,19 @@ export const ImageInputConfig = ({ nodeId, config }: NodeConfigProps<ImageInputC
           />
         </Squircle>
       </div>
+
+      <div className="flex items-center justify-between gap-4 px-0.5">
+        <div className="space-y-1">
+          <Label htmlFor="validate-image" className="text-[11px] font-bold uppercase tracking-widest text-foreground/80">Validate &amp; Cache</Label>
+          <p className="text-[10px] font-medium text-muted-foreground/70 leading-tight">Checks and re-hosts the image before generation</p>
+        </div>
+        <Switch
+          id="validate-image"
+          checked={config.validate ?? false}
+          onCheckedChange={(checked) => updateNode(nodeId, { config: { ...config, validate: checked } })}
+          className="shrink-0 transition-transform active:scale-95"
+        />
+      </div>
     </div>
   );
 };
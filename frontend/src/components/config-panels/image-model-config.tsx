@@ -1,5 +1,6 @@
 import { Label } from '@/components/ui/label';
 import { Input } from '@/components/ui/input';
+import { Switch } from '@/components/ui/switch';
 import { useCanvasStore } from '@/stores/canvas-store';
 import { Cpu, Settings, ChevronDown } from 'lucide-react';
 import { Squircle } from '@squircle-js/react';
@@ -30,6 +31,12 @@ const MODEL_CONFIGS = {
     supportsGuidance: false,
     supportsSteps: false,
   },
+  // Backend picks the cheapest model meeting the latency SLO
+  auto: {
+    name: 'Auto (cheapest within SLO)',
+    supportsGuidance: false,
+    supportsSteps: false,
+  },
 } as const;
 
 type ModelId = keyof typeof MODEL_CONFIGS;
@@ -89,6 +96,26 @@ export const ImageModelConfig = ({ nodeId, config }: NodeConfigProps<ImageModelC
         </div>
       </div>
 
+      {selectedModel === 'auto' && (
+        <div className="space-y-2">
+          <Label className="text-[10px] uppercase font-bold tracking-wider text-muted-foreground/80 pl-1">Latency SLO (seconds)</Label>
+          <Squircle cornerRadius={14} cornerSmoothing={1} className="overflow-hidden shadow-sm shadow-black/5">
+            <Input
+              type="number"
+              min={1}
+              placeholder="20"
+              className="bg-muted/30 dark:bg-white/5 border-none focus-visible:ring-1 focus-visible:ring-offset-0 transition-all h-11 px-4 text-sm font-medium w-full outline-none"
+              style={{ '--tw-ring-color': `${themeColor}66` } as CSSProperties}
+              value={parameters.latency_slo_seconds ?? ''}
+              onChange={(e) => {
+                const v = parseFloat(e.target.value);
+                handleParamChange('latency_slo_seconds', isNaN(v) ? undefined : v);
+              }}
+            />
+          </Squircle>
+        </div>
+      )}
+
       {/* Model Parameters - Always show section, conditionally show each param */}
       <div className="space-y-4 pt-6 border-t border-border/40">
         <div className="flex items-center gap-2 px-0.5 mb-2">
@@ -209,6 +236,19 @@ export const ImageModelConfig = ({ nodeId, config }: NodeConfigProps<ImageModelC
           </div>
         )}
       </div>
+
+      <div className="flex items-center justify-between gap-4 pt-6 border-t border-border/40">
+        <div className="space-y-1">
+          <Label htmlFor="hedge-requests" className="text-[10px] uppercase font-bold tracking-wider text-muted-foreground/80">Hedge Slow Requests</Label>
+          <p className="text-[10px] font-medium text-muted-foreground/70 leading-tight">Sends a duplicate when a request runs past the usual latency</p>
+        </div>
+        <Switch
+          id="hedge-requests"
+          checked={parameters.hedge ?? false}
+          onCheckedChange={(checked) => updateNode(nodeId, { config: { ...config, parameters: { ...parameters, hedge: checked } } })}
+          className="shrink-0 transition-transform active:scale-95"
+        />
+      </div>
     </div>
   );
 };
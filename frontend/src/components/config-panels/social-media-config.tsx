@@ -11,6 +11,11 @@ export const SocialMediaConfig = ({ nodeId, config }: NodeConfigProps<SocialMedi
   const updateNode = useCanvasStore((state) => state.updateNode);
   const themeColor = NODE_CONFIGS.SOCIAL_MEDIA.color;
 
+  const updateSubreddits = (value: string) => {
+    const subreddits = value.split(',').map((name) => name.trim()).filter(Boolean);
+    updateNode(nodeId, { config: { ...config, subreddit: value, subreddits } });
+  };
+
   const sortOptions = [
     { id: 'hot', name: 'Hot' },
     { id: 'new', name: 'New' },
@@ -23,14 +28,14 @@ export const SocialMediaConfig = ({ nodeId, config }: NodeConfigProps<SocialMedi
       <div className="space-y-3">
         <div className="flex items-center gap-2 px-0.5">
           <Hash className="h-3.5 w-3.5" style={{ color: themeColor }} />
-          <Label htmlFor="subreddit" className="text-[11px] font-bold uppercase tracking-widest text-foreground/80">Subreddit</Label>
+          <Label htmlFor="subreddit" className="text-[11px] font-bold uppercase tracking-widest text-foreground/80">Subreddits</Label>
         </div>
         <Squircle cornerRadius={14} cornerSmoothing={1} className="overflow-hidden shadow-sm shadow-black/5">
           <Input
             id="subreddit"
             value={config.subreddit || 'technology'}
-            onChange={(e) => updateNode(nodeId, { config: { ...config, subreddit: e.target.value } })}
-            placeholder="e.g. technology"
+            onChange={(e) => updateSubreddits(e.target.value)}
+            placeholder="e.g. technology, gadgets"
             className="border-none h-11 px-4 bg-muted/30 dark:bg-white/5 focus-visible:ring-1 focus-visible:ring-offset-0 font-medium transition-all w-full outline-none"
             style={{ '--tw-ring-color': `${themeColor}66` } as CSSProperties}
           />
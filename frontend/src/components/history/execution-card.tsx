@@ -32,6 +32,9 @@ const extractWorkflowInputs = (execution: ExecutionWithRelations) => {
 
 export const ExecutionCard = ({ execution }: { execution: ExecutionWithRelations }) => {
     const imageUrls = execution.generations?.flatMap(g => g.image_urls ?? []) ?? [];
+    const thumbnailUrls = execution.generations?.flatMap(g =>
+        (g.image_urls ?? []).map((url, i) => g.derivatives?.[i]?.thumbnail ?? url)
+    ) ?? [];
     const gen = execution.generations?.[0];
     const inputs = extractWorkflowInputs(execution);
 
@@ -81,7 +84,7 @@ export const ExecutionCard = ({ execution }: { execution: ExecutionWithRelations
             </div>
 
             <CardContent className="p-4 pt-0">
-                <ExecutionGallery imageUrls={imageUrls} />
+                <ExecutionGallery imageUrls={imageUrls} thumbnailUrls={thumbnailUrls} />
             </CardContent>
         </Card>
     );
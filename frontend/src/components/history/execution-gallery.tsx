@@ -2,9 +2,10 @@ import { ExternalLink, Image as ImageIcon } from 'lucide-react';
 
 interface ExecutionGalleryProps {
     imageUrls: string[];
+    thumbnailUrls?: string[];
 }
 
-export const ExecutionGallery = ({ imageUrls }: ExecutionGalleryProps) => {
+export const ExecutionGallery = ({ imageUrls, thumbnailUrls }: ExecutionGalleryProps) => {
     if (!imageUrls || imageUrls.length === 0) {
         return (
             <div className="flex items-center gap-2 text-[10px] text-muted-foreground font-medium bg-muted/10 p-2 rounded-lg border border-dashed border-border/40 w-fit">
@@ -19,10 +20,11 @@ export const ExecutionGallery = ({ imageUrls }: ExecutionGalleryProps) => {
             {imageUrls.map((url, i) => (
                 <div key={i} className="group relative aspect-square rounded-xl overflow-hidden border border-border/50 bg-muted/40 hover:border-primary/20 transition-all">
                     <img
-                        src={url}
+                        src={thumbnailUrls?.[i] ?? url}
                         alt={`Generation ${i}`}
                         className="h-full w-full object-cover transition-transform duration-700 group-hover:scale-110"
                         referrerPolicy="no-referrer"
+                        loading="lazy"
                     />
                     <a
                         href={url}
@@ -4,6 +4,7 @@ import type {
   ExecuteWorkflowResponse,
   StepExecutionResponse,
   CancelExecutionResponse,
+  WorkflowEstimateResponse,
   RedditRequest,
   RedditResponse,
 } from '@/types/api';
@@ -23,6 +24,10 @@ api.interceptors.request.use(async (config) => {
 });
 
 export const workflowApi = {
+  estimate: async (workflowId: string): Promise<WorkflowEstimateResponse> => {
+    const { data } = await api.post(`/api/workflows/${workflowId}/estimate`);
+    return data;
+  },
   execute: async (workflowId: string): Promise<ExecuteWorkflowResponse> => {
     const { data } = await api.post(`/api/workflows/${workflowId}/execute`);
     return data;
@@ -39,7 +44,7 @@ export const workflowApi = {
 
 export const socialApi = {
   getReddit: async (params: RedditRequest): Promise<RedditResponse> => {
-    const { data } = await api.post('/api/social/reddit', params);
+    const { data } = await api.get('/api/social/reddit', { params });
     return data;
   },
 };
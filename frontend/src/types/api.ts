@@ -18,10 +18,30 @@ export interface CancelExecutionResponse {
   status: ExecutionStatus;
 }
 
+export interface NodeCostEstimate {
+  node_id: string;
+  model_id: string;
+  num_images: number;
+  price_per_image: number;
+  cost: number;
+  edit: boolean;
+  hedge: boolean;
+}
+
+export interface WorkflowEstimateResponse {
+  workflow_id: string;
+  total_cost: number;
+  nodes: NodeCostEstimate[];
+  execution_budget: number;
+  user_budget: number;
+  user_spent: number;
+}
+
 export interface RedditRequest {
   subreddit: string;
   sort: 'hot' | 'new' | 'top' | 'rising';
   limit: number;
+  compact?: boolean;
 }
 
 export interface RedditPost {
@@ -32,6 +52,7 @@ export interface RedditPost {
 }
 
 export interface RedditResponse {
-  posts: RedditPost[];
+  posts?: RedditPost[];
   keywords: string[];
+  top_post: string;
 }
@@ -97,5 +97,6 @@ export interface Generation {
   image_urls: string[];
   aspect_ratio: string;
   cost: number | null;
+  derivatives?: Record<string, string>[];
   created_at: string;
 }
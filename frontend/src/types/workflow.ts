@@ -9,10 +9,13 @@ export interface TextInputConfigData {
 
 export interface ImageInputConfigData {
     image_url?: string;
+    validate?: boolean;
 }
 
 export interface SocialMediaConfigData {
-    subreddit?: string;
+    subreddit?: string; // Raw input; may be a comma-separated list
+    subreddits?: string[]; // Parsed from subreddit; several are fetched concurrently
+    subreddit_weights?: Record<string, number>;
     limit?: number;
     sort?: 'hot' | 'new' | 'top' | 'rising';
 }
@@ -26,6 +29,8 @@ export interface ImageModelParameters {
     guidance_scale?: number;
     num_inference_steps?: number;
     seed?: number;
+    latency_slo_seconds?: number; // Only used with model 'auto'
+    hedge?: boolean;
 }
 
 export interface ImageModelConfigData {